@@ -0,0 +1 @@
+# 파이썬 패키지임을 나타내는 파일
@@ -0,0 +1,92 @@
+# 이벤트 루프 지연 측정
+# 느린 쿼리를 실행하는 핸들러 N개를 동시에 돌리면서, 일정 간격으로 깨어나는 ticker 태스크가
+# 예정보다 얼마나 늦게 깨어났는지(p50 / p99 / max)를 동기 세션과 비동기 세션 각각으로 측정한다.
+#
+# 실행: python -m benchmarks.event_loop_lag [--handlers 20] [--query-seconds 0.2] [--interval-ms 10]
+import argparse
+import asyncio
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from config import SQL_URL
+from db import SessionLocal, AsyncSessionLocal, engine, async_engine
+
+IS_SQLITE = SQL_URL.startswith("sqlite")
+
+
+def slow_query(seconds: float):
+    """DB에서 대략 seconds 초 걸리는 쿼리"""
+    if IS_SQLITE:
+        # sqlite에는 SLEEP이 없으므로 재귀 CTE로 CPU 시간을 소모
+        rows = int(seconds * 5_000_000)
+        return text(
+            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < :n) "
+            "SELECT COUNT(*) FROM c"
+        ).bindparams(n=rows)
+    return text("SELECT SLEEP(:s)").bindparams(s=seconds)
+
+
+async def sync_handler(seconds: float):
+    # 기존 방식: async 핸들러 안에서 동기 세션 사용 -> 쿼리 동안 이벤트 루프가 멈춤
+    db = SessionLocal()
+    try:
+        db.execute(slow_query(seconds)).scalar()
+    finally:
+        db.close()
+
+
+async def async_handler(seconds: float):
+    async with AsyncSessionLocal() as db:
+        await db.scalar(slow_query(seconds))
+
+
+async def ticker(interval: float, lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run(handler, handlers: int, seconds: float, interval: float) -> dict:
+    lags = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(interval, lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(seconds) for _ in range(handlers)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+
+    values = np.array(lags or [0.0]) * 1000
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "ticks": len(lags),
+        "lag_p50_ms": round(float(np.percentile(values, 50)), 2),
+        "lag_p99_ms": round(float(np.percentile(values, 99)), 2),
+        "lag_max_ms": round(float(values.max()), 2),
+    }
+
+
+async def main(args):
+    interval = args.interval_ms / 1000
+    # 커넥션 풀 워밍업
+    await sync_handler(0)
+    await async_handler(0)
+
+    print(f"DB: {'sqlite' if IS_SQLITE else 'mysql'}, 핸들러 {args.handlers}개, 쿼리 {args.query_seconds}s")
+    for name, handler in (("sync", sync_handler), ("async", async_handler)):
+        result = await run(handler, args.handlers, args.query_seconds, interval)
+        print(f"[{name:5}] " + ", ".join(f"{k}={v}" for k, v in result.items()))
+
+    engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동기 / 비동기 DB 세션의 이벤트 루프 지연 비교")
+    parser.add_argument("--handlers", type=int, default=20, help="동시에 실행할 핸들러 수")
+    parser.add_argument("--query-seconds", type=float, default=0.2, help="쿼리 하나가 걸리는 시간")
+    parser.add_argument("--interval-ms", type=float, default=10, help="ticker 간격")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,107 @@
+# PDF 텍스트 추출 벤치마크
+# 페이지 수가 다른 PDF들에 대해 (1) 한 프로세스에서 순서대로 추출, (2) 프로세스 풀에서 페이지 단위 병렬 추출,
+# (3) 같은 파일 재업로드 시 SHA-256 캐시 조회 시간을 비교한다.
+# PDF를 지정하지 않으면 페이지마다 텍스트가 들어 있는 테스트용 PDF를 만들어서 사용한다.
+#
+# 실행: python -m benchmarks.pdf_extract [--pages 1 5 20 50] [--repeat 3] [파일.pdf ...]
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from utils.pdf_extract import PDFExtractor, extract_text, file_sha256, page_count
+from utils.resume_artifacts import ResumeArtifactStore, ArtifactTextCache
+
+
+def make_pdf(path: str, pages: int, lines_per_page: int = 40):
+    """텍스트가 들어 있는 단순한 PDF 생성 (Helvetica, 페이지마다 lines_per_page줄)"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        lines = [f"Page {page + 1} line {line + 1}: experience with Python, SQL and distributed systems."
+                 for line in range(lines_per_page)]
+        stream = "BT /F1 10 Tf 50 800 Td 12 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        stream = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+async def timed_async(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        files = list(args.files)
+        for pages in args.pages if not files else []:
+            path = os.path.join(tmp, f"resume_{pages}p.pdf")
+            make_pdf(path, pages)
+            files.append(path)
+
+        # 병렬 추출 시간만 재기 위해 캐시 없는 추출기와 캐시 조회용 추출기를 따로 사용
+        parallel = PDFExtractor(workers=args.workers, pages_per_task=args.pages_per_task, timeout=600)
+        cached = PDFExtractor(workers=args.workers, pages_per_task=args.pages_per_task, timeout=600,
+                              cache=ArtifactTextCache(ResumeArtifactStore(os.path.join(tmp, "cache"))))
+        await parallel.extract(files[0])  # 작업자 프로세스 워밍업
+
+        print(f"작업자 {args.workers}개, 작업 당 {args.pages_per_task}페이지, 반복 {args.repeat}회 (중앙값)")
+        print(f"{'파일':<24}{'페이지':>6}{'순차(ms)':>12}{'병렬(ms)':>12}{'캐시(ms)':>12}{'배속':>8}")
+        for path in files:
+            sequential_text = extract_text(path)
+            parallel_text = await parallel.extract(path)
+            assert parallel_text == sequential_text, f"추출 결과가 다릅니다: {path}"
+
+            digest = file_sha256(path)
+            await cached.extract(path, digest)  # 첫 업로드 -> 캐시에 저장
+
+            seq = timed(lambda: extract_text(path), args.repeat)
+            par = await timed_async(lambda: parallel.extract(path), args.repeat)
+            hit = await timed_async(lambda: cached.extract(path, digest), args.repeat)
+            print(f"{os.path.basename(path):<24}{page_count(path):>6}{seq * 1000:>12.1f}{par * 1000:>12.1f}"
+                  f"{hit * 1000:>12.2f}{seq / par:>8.2f}")
+
+        parallel.shutdown()
+        cached.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="순차 / 병렬 / 캐시 PDF 텍스트 추출 시간 비교")
+    parser.add_argument("files", nargs="*", help="측정할 PDF (없으면 테스트용 PDF 생성)")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20, 50], help="생성할 PDF 페이지 수")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--pages-per-task", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
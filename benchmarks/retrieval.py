@@ -0,0 +1,190 @@
+# FAISS 검색 품질 / 속도 벤치마크
+# 서버가 쓰는 인덱스(기본: jobkorea)에서 벡터를 복원해 정확한 Flat 검색 결과를 기준으로 삼고,
+# 현재 인덱스와 다시 만든 후보 인덱스(Flat / IVF / HNSW / PQ)의 recall@k, 검색 지연(p50 / p99), 메모리를 비교한다.
+# IVF는 nprobe, HNSW는 efSearch를 바꿔 가며 측정하므로 결과를 보고 FAISS_NPROBE / 빌드 옵션을 정하면 된다.
+#
+# 질의는 QA 매핑에서 뽑은 질문 / 답변을 서버와 같은 모델로 임베딩해서 만든다. (서버처럼 L2 정규화)
+# 모델 없이 돌릴 때는 --queries-from vectors 로 저장된 벡터에 잡음을 섞어서 질의로 사용한다.
+#
+# 실행: python -m benchmarks.retrieval [--queries 500] [--k 10] [--nprobe 1 4 8 16 32 64]
+#                                       [--types flat ivf hnsw pq] [--target-recall 0.95] [--out result.json]
+import argparse
+import json
+import time
+
+import faiss
+import numpy as np
+
+from utils.embedding import embedding_registry
+from utils.faiss_store import JOBKOREA_INDEX_PATH, JOBKOREA_MAPPING_PATH, set_nprobe
+from utils.index_build import INDEX_TYPES, IndexBuilder
+from utils.qa_store import QAMappingStore
+
+
+def reconstruct_all(index) -> np.ndarray:
+    """인덱스에 저장된 벡터 복원 (IVF는 direct map이 필요, PQ는 근사값)"""
+    if index.ntotal == 0:
+        raise ValueError("인덱스가 비어 있습니다. python -m utils.index_build 로 먼저 빌드하세요.")
+    try:
+        faiss.extract_index_ivf(index).make_direct_map()
+    except RuntimeError:
+        pass
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def make_queries(args, vectors: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    count = min(args.queries, len(vectors))
+    ids = rng.choice(len(vectors), size=count, replace=False)
+    if args.queries_from == "vectors":
+        # 저장된 벡터 + 평균 노름 대비 noise 비율만큼의 잡음
+        scale = float(np.linalg.norm(vectors, axis=1).mean()) * args.noise / np.sqrt(vectors.shape[1])
+        queries = vectors[ids] + rng.normal(0, scale, size=(count, vectors.shape[1])).astype("float32")
+    else:
+        mapping = QAMappingStore(args.mapping)
+        texts = [mapping.get(int(i), args.queries_from) for i in ids]
+        queries = embedding_registry.get("jobkorea").encode_sync(texts)
+    queries = np.ascontiguousarray(queries, dtype="float32")
+    faiss.normalize_L2(queries)  # 서버(generate_main_questions)와 같은 질의 정규화
+    return queries
+
+
+def index_bytes(index) -> int:
+    return int(faiss.serialize_index(index).nbytes)
+
+
+def measure(index, queries: np.ndarray, truth: np.ndarray, k: int) -> dict:
+    """질의를 하나씩 검색 (서버와 같은 방식)해서 recall@k와 지연 시간 측정"""
+    latencies = np.empty(len(queries))
+    found = np.empty((len(queries), k), dtype="int64")
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        _, ids = index.search(queries[i:i + 1], k)
+        latencies[i] = time.perf_counter() - start
+        found[i] = ids[0]
+    hits = sum(len(np.intersect1d(found[i], truth[i])) for i in range(len(queries)))
+    return {
+        "recall": round(hits / truth.size, 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 3),
+    }
+
+
+def candidates(args, vectors: np.ndarray, normalize: bool):
+    """(이름, 파라미터, 인덱스, 빌드 시간) 후보 목록"""
+    for index_type in args.types:
+        options = {"normalize": normalize, "train_size": args.train_size}
+        if index_type == "ivf":
+            options["nlist"] = args.nlist
+        elif index_type == "pq":
+            options.update(pq_m=args.pq_m, pq_bits=args.pq_bits)
+        elif index_type == "hnsw":
+            options["hnsw_m"] = args.hnsw_m
+        start = time.perf_counter()
+        builder = IndexBuilder(index_type, **options)
+        for offset in range(0, len(vectors), 4096):
+            builder.add(vectors[offset:offset + 4096].copy())
+        index = builder.finish()
+        yield index_type, builder.used_params(), index, time.perf_counter() - start
+
+
+def sweep(name: str, params: dict, index, queries, truth, k, args, build_s=None):
+    """IVF는 nprobe, HNSW는 efSearch 별로 측정 (나머지는 한 번)"""
+    memory = index_bytes(index)
+    if set_nprobe(index, 0) is not None:
+        settings = [("nprobe", n) for n in args.nprobe if n <= faiss.extract_index_ivf(index).nlist]
+    elif isinstance(index, faiss.IndexHNSW):
+        settings = [("ef_search", n) for n in args.ef_search]
+    else:
+        settings = [(None, None)]
+    for key, value in settings:
+        if key == "nprobe":
+            set_nprobe(index, value)
+        elif key == "ef_search":
+            index.hnsw.efSearch = value
+        row = {"index": name, **params, **({key: value} if key else {}), "memory_mb": round(memory / 2 ** 20, 2)}
+        if build_s is not None:
+            row["build_s"] = round(build_s, 2)
+        row.update(measure(index, queries, truth, k))
+        yield row
+
+
+def main(args):
+    if args.threads:
+        faiss.omp_set_num_threads(args.threads)
+    rng = np.random.default_rng(args.seed)
+    current = faiss.read_index(args.index)
+    vectors = reconstruct_all(current)
+    # 질의 id는 QA 매핑 id와 같아야 하므로 벡터를 줄이기 전에 샘플링
+    queries = make_queries(args, vectors, rng)
+    if args.corpus and args.corpus < len(vectors):
+        # 큰 인덱스는 일부만 사용 (현재 인덱스 비교는 전체 벡터 기준이므로 생략)
+        vectors = vectors[np.sort(rng.choice(len(vectors), size=args.corpus, replace=False))]
+        current = None
+    print(f"벡터 {len(vectors)}개 (d={vectors.shape[1]}), 질의 {len(queries)}개, k={args.k}")
+
+    rows = []
+    for normalize in args.space:
+        # 같은 벡터 공간에서 정확한 Flat 검색 결과가 기준
+        base = np.ascontiguousarray(vectors.copy())
+        if normalize:
+            faiss.normalize_L2(base)
+        exact = faiss.IndexFlatL2(base.shape[1])
+        exact.add(base)
+        _, truth = exact.search(queries, args.k)
+        space = "normalized" if normalize else "raw"
+
+        if current is not None and not normalize:
+            for row in sweep("current", {}, current, queries, truth, args.k, args):
+                rows.append({"space": space, **row})
+        for name, params, index, build_s in candidates(args, vectors, normalize):
+            for row in sweep(name, params, index, queries, truth, args.k, args, build_s):
+                rows.append({"space": space, **row})
+
+    columns = ["space", "index", "nlist", "nprobe", "hnsw_m", "ef_construction", "ef_search", "pq_m", "pq_bits",
+               "memory_mb", "build_s", "recall", "p50_ms", "p99_ms"]
+    columns = [c for c in columns if any(c in row for row in rows)]
+    print("".join(f"{c:>12}" for c in columns))
+    for row in rows:
+        print("".join(f"{str(row.get(c, '')):>12}" for c in columns))
+
+    # 목표 recall을 만족하는 설정 중 p99가 가장 낮은 것
+    passing = [row for row in rows if row["recall"] >= args.target_recall]
+    best = min(passing, key=lambda row: row["p99_ms"]) if passing else None
+    if best:
+        print(f"\nrecall@{args.k} >= {args.target_recall} 중 p99 최소: {best}")
+    else:
+        print(f"\nrecall@{args.k} >= {args.target_recall} 을 만족하는 설정이 없습니다.")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"vectors": len(vectors), "queries": len(queries), "k": args.k, "rows": rows, "best": best},
+                      f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FAISS 인덱스 recall@k / 지연 시간 / 메모리 비교")
+    parser.add_argument("--index", default=JOBKOREA_INDEX_PATH)
+    parser.add_argument("--mapping", default=JOBKOREA_MAPPING_PATH)
+    parser.add_argument("--queries", type=int, default=500, help="질의 수 (QA 매핑에서 샘플링)")
+    parser.add_argument("--queries-from", choices=("answer", "question", "vectors"), default="answer",
+                        help="질의 텍스트로 쓸 필드 (vectors: 임베딩 모델 없이 저장된 벡터 + 잡음)")
+    parser.add_argument("--noise", type=float, default=0.3, help="--queries-from vectors 의 잡음 비율")
+    parser.add_argument("--corpus", type=int, default=0, help="후보 인덱스를 만들 벡터 수 (0: 전체)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--types", nargs="+", choices=INDEX_TYPES, default=list(INDEX_TYPES))
+    parser.add_argument("--space", nargs="+", choices=("raw", "normalized"), default=["raw", "normalized"],
+                        help="후보 인덱스에 넣을 벡터 (raw: 현재처럼 정규화 없이)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    parser.add_argument("--nlist", type=int, default=100)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--pq-m", type=int, default=16)
+    parser.add_argument("--pq-bits", type=int, default=8)
+    parser.add_argument("--train-size", type=int, default=50000)
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument("--threads", type=int, default=1, help="FAISS 스레드 수 (서버 한 요청 기준이면 1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+    args.space = [value == "normalized" for value in args.space]
+    main(args)
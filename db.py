@@ -1,8 +1,9 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, ForeignKey, DateTime, Boolean
+from sqlalchemy import create_engine, Column, Integer, String, Text, ForeignKey, DateTime, Boolean, LargeBinary, UniqueConstraint, Index
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from datetime import datetime
-from config import SQL_URL
+from config import SQL_URL, ASYNC_SQL_URL
 import logging
 import pymysql
 
@@ -28,6 +29,17 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# 비동기 엔진 (aiomysql / aiosqlite) -> 이벤트 루프를 막지 않고 쿼리 실행
+async_engine = create_async_engine(
+    ASYNC_SQL_URL,
+    pool_pre_ping=True,
+    **({} if ASYNC_SQL_URL.startswith("sqlite") else {"pool_size": 10, "max_overflow": 20}),
+    echo=False
+)
+
+# 커밋 후에도 객체 속성을 다시 조회하지 않도록 expire_on_commit=False
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -35,6 +47,10 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # 유저 테이블
 class UserDB(Base):
     __tablename__ = "users"
@@ -55,6 +71,17 @@ class InterviewSessionDB(Base):
     current_main_question_index = Column(Integer, default=0)  # 진행 중인 대표질문
     current_follow_up_index = Column(Integer, default=0)  # 진행 중인 꼬리질문
     created_at = Column(DateTime, default=datetime.utcnow)
+    # 면접 진행 상태 스냅샷 (InterviewSession.to_snapshot, 압축된 JSON) -> 어느 워커든 이 행 하나로 세션 복원
+    state_snapshot = Column(LargeBinary(length=2 ** 24))  # MySQL MEDIUMBLOB
+    state_version = Column(Integer, default=0)  # 스냅샷이 갱신될 때마다 증가
+    last_message_seq = Column(Integer, default=0)  # 마지막으로 저장된 메시지의 seq
+    # 세션 목록용 요약 (utils.message_log가 메시지를 저장할 때 같이 갱신)
+    last_message = Column(Text)
+    last_message_type = Column(String(50))
+    main_question_count = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (Index("ix_interview_sessions_user_created", "user_id", "created_at"),)
 
     # UserDB와의 관계 설정
     user = relationship("UserDB", back_populates="interview_sessions")
@@ -67,6 +94,15 @@ class ChatMessageDB(Base):
     message_type = Column(String(50))  # VARCHAR(50)으로 변경
     content = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # 세션 안에서 메시지 위치를 나타내는 키 (utils.message_log.message_key) -> 같은 메시지가 두 번 저장되지 않음
+    message_key = Column(String(64))
+    # 세션 안에서 단조 증가하는 순번 -> (session_id, seq) 인덱스 순서 그대로 조회 / 커서 페이지네이션
+    seq = Column(Integer)
+
+    __table_args__ = (
+        UniqueConstraint("session_id", "message_key", name="uq_chat_messages_session_key"),
+        Index("ix_chat_messages_session_seq", "session_id", "seq", unique=True),
+    )
     
     # 관계 설정
     session = relationship("InterviewSessionDB", back_populates="messages")
@@ -74,23 +110,7 @@ class ChatMessageDB(Base):
 # InterviewSessionDB와 ChatMessageDB 간의 관계 설정
 InterviewSessionDB.messages = relationship("ChatMessageDB", back_populates="session", cascade="all, delete-orphan")
 
-# def cleanup_old_sessions():
-#     """오래된 세션만 정리하는 함수"""
-#     db = SessionLocal()
-#     try:
-#         # 24시간 이상 된 세션 삭제
-#         old_sessions = db.query(InterviewSessionDB).filter(
-#             InterviewSessionDB.created_at < datetime.now() - timedelta(hours=24)
-#         ).all()
-#         for session in old_sessions:
-#             db.query(ChatMessageDB).filter_by(session_id=session.id).delete()
-#             db.delete(session)
-#         db.commit()
-#     except Exception as e:
-#         db.rollback()
-#         logger.error(f"세션 정리 중 오류 발생: {str(e)}")
-#     finally:
-#         db.close()
+# 오래된 세션 정리는 utils.retention.RetentionWorker가 서버 실행 중 주기적으로 수행
 
 # def cleanup_tables():
 #     """모든 테이블의 데이터를 비우는 함수 (개발 단계에서만 사용)"""
@@ -1,17 +1,27 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from routers import input  # questions 제거
-from config import HOST, PORT, ORIGIN_REGEX
+from config import HOST, PORT, ORIGIN_REGEX, MAX_FSIZE
 from utils import clean_files
 from routers.login import router as login_router
 # from db import create_tables, cleanup_tables  # cleanup_tables 추가
 from db import create_tables
 from routers.chat import chat
 from routers.recommendations import recommendations  # 추가
+from routers.stats import stats
+from utils.embedding import embedding_registry
+from utils.faiss_store import faiss_indexes
+from utils.retrieval import hybrid_retriever
+from utils.prefetch import prefetcher
+from utils.retention import retention_worker
+from utils.pdf_extract import pdf_extractor
+from utils.http_fetch import http_client
+from utils.posting import posting_ingestor
+from utils.resume_digest import resume_digester
 import uvicorn
 import atexit
 import asyncio
-#from utils.extract_video import process_videos, vectorize_and_save  # 영상 추출 및 벡터화 함수 가져오기
 
 app = FastAPI(title="JOBS-Server", version="0.2.0")
 
@@ -34,39 +44,67 @@ app.add_middleware(
     max_age=3600,
 )
 
+# 사용자 요청이 처리되는 동안에는 백그라운드 선행 생성이 양보하도록 표시
+@app.middleware("http")
+async def mark_interactive_request(request, call_next):
+    async with prefetcher.interactive():
+        return await call_next(request)
+
+# 업로드 크기 제한을 넘는 요청은 본문을 읽기 전에 거절 (multipart 경계 등 여유분 1MB)
+@app.middleware("http")
+async def reject_oversized_upload(request, call_next):
+    length = request.headers.get("content-length")
+    if request.url.path.startswith("/input/uploadfile") and length and length.isdigit() \
+            and int(length) > MAX_FSIZE + 1024 * 1024:
+        return JSONResponse(status_code=413, content={
+            "detail": f"파일 크기가 너무 큽니다. (50MB 제한): 현재 크기 {int(length) / (1024 * 1024):.2f} MB"})
+    return await call_next(request)
+
 # 라우트 설정
 app.include_router(input)
 app.include_router(chat)
 app.include_router(login_router, prefix="", tags=["auth"])
 app.include_router(recommendations)  # 추가
+app.include_router(stats)
 
-""" # 서버 시작 시 영상 추출 및 벡터화 작업 실행 -> 미리 영상들을 벡터 디비에 다 넣어놓고 서버 시작
-@app.on_event("startup")
-async def startup_event():
-    # 영상 추출 작업 후 벡터화 작업 실행 순서 보장
-    await process_videos()  # 영상 추출 후
-    await vectorize_and_save()  # 그 후 벡터화 작업 실행
- """
+# FAISS 인덱스는 서버 시작 시 만들지 않고 미리 빌드해서 교체 (python -m utils.index_build)
 # 서버 시작 시 실행할 로직 - DB 테이블 생성
 @app.on_event("startup")
 async def startup_event():
     print("Creating database tables...")
     create_tables()  # db.py 안의 create_tables()
     print("Database tables created successfully!")
+    # 임베딩 모델은 요청마다가 아니라 서버 시작 시 한 번만 로드
+    await asyncio.to_thread(embedding_registry.load_all)
+    print("Embedding models loaded!")
+    # FAISS 인덱스도 한 번만 열어두고 요청 간에 공유
+    await asyncio.to_thread(faiss_indexes.load_all)
+    print("FAISS indexes loaded!")
+    # 인덱스 파일 변경 확인 / 재로드는 백그라운드 감시 작업이 스레드에서 수행
+    faiss_indexes.start_watcher()
+    # 질문 후보 키워드 검색용 BM25 색인 (없으면 QA 매핑으로 한 번 생성)
+    try:
+        await asyncio.to_thread(hybrid_retriever.load)
+    except Exception as e:
+        print(f"BM25 index not loaded: {str(e)}")
+    # 오래된 세션 정리 작업 예약 (RETENTION_INTERVAL 간격)
+    retention_worker.start()
+    # PDF 텍스트 추출 작업자 프로세스를 미리 띄워 둠 (첫 업로드가 프로세스 시작을 기다리지 않게)
+    await asyncio.to_thread(pdf_extractor.start)
 
 # 서버 종료 시 실행할 로직 - 테이블 데이터 정리
 @app.on_event("shutdown")
 async def shutdown_event():
+    await retention_worker.stop()
+    await faiss_indexes.stop_watcher()
+    pdf_extractor.shutdown()
+    await posting_ingestor.aclose()
+    await resume_digester.aclose()
+    await http_client.aclose()
     print("Cleaning up tables...")
     # cleanup_tables()  # 모든 테이블 데이터 삭제
     print("Tables cleaned up successfully!")
 
-# @app.on_event("shutdown")
-# async def shutdown_event():
-#     print("Cleaning up old sessions...")
-#     cleanup_old_sessions()
-#     print("Cleanup completed!")
-
 # 종료 시 clean file 후 종료 설정
 if __name__ == "__main__":
     atexit.register(clean_files)
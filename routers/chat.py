@@ -1,27 +1,32 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, Request
-from sqlalchemy.orm import Session
-from db import SessionLocal, InterviewSessionDB, ChatMessageDB
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update, func
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import AsyncSessionLocal, get_async_db, InterviewSessionDB, ChatMessageDB
 from utils.interview import InterviewSession
 from pydantic import BaseModel
 from routers.pdf_storage import pdf_storage
-from typing import List, Optional, Dict
-from datetime import datetime, timedelta
-import uuid
+from utils.session_cache import session_store
+from utils.prefetch import prefetcher
+from utils.message_log import message_log
+from utils.retention import retention_worker
+from routers.recommendations import build_recommendations
+from typing import Callable, List, Optional
+from datetime import datetime
+import json
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
-# 세션 저장소
-session_store: Dict[str, InterviewSession] = {}
+# 세션이 캐시에서 빠지면 (완료 / 만료 / 제거) 남은 선행 생성도 취소
+session_store.on_remove(prefetcher.cancel)
 
-chat = APIRouter(prefix="/chat", tags=["chat"])
+# 스냅샷 저장이 다른 워커와 충돌했을 때 최신 상태로 다시 시도할 횟수
+SNAPSHOT_SAVE_RETRIES = 3
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+chat = APIRouter(prefix="/chat", tags=["chat"])
 
 class ChatResponse(BaseModel):
     messages: List[dict]
@@ -43,7 +48,7 @@ class ChatSession(BaseModel):
     last_message: Optional[str] = None
     last_message_type: Optional[str] = None
 
-async def create_new_session(db: Session, session_token: str, user_id: str):
+async def create_new_session(db: AsyncSession, session_token: str, user_id: str):
     """ 새로운 세션을 생성하고 첫 번째 질문을 저장하는 함수 """
     session = InterviewSessionDB(
         session_token=session_token,
@@ -53,8 +58,8 @@ async def create_new_session(db: Session, session_token: str, user_id: str):
         current_follow_up_index=0
     )
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.commit()
+    await db.refresh(session)
 
     interview_session = InterviewSession(token=session_token)
     first_question = await interview_session.generate_main_question()
@@ -62,61 +67,190 @@ async def create_new_session(db: Session, session_token: str, user_id: str):
     if not first_question:
         raise HTTPException(status_code=500, detail="대표질문을 생성할 수 없습니다.")
 
-    message = ChatMessageDB(
-        session_id=session.id,
-        message_type="main_question",
-        content=first_question
-    )
-    db.add(message)
-    db.commit()
-    
+    session, _ = await commit_turn(db, session, interview_session, [("main_question", first_question, 0)])
     return session
 
+def schedule_prefetch(token: str, interview_session: InterviewSession):
+    """ 대표질문 전체 / 질문별 힌트 / 추천 영상을 백그라운드에서 미리 생성하는 함수 """
+    async def warm_main_questions():
+        if not interview_session.main_questions_complete:
+            await interview_session.generate_main_question(index=len(interview_session.main_questions))
+
+    def warm_hint(index: int):
+        async def step():
+            questions = interview_session.main_questions
+            if index < len(questions) and not interview_session.hints[index]:
+                await interview_session.generate_hint(questions[index], index)
+        return step
+
+    async def warm_recommendations():
+        pdf_data = pdf_storage.get_pdf(token)
+        if pdf_data and pdf_data.get("resume_text"):
+            await build_recommendations(pdf_data)
+
+    steps = [warm_main_questions]
+    steps += [warm_hint(i) for i in range(interview_session.question_num)]
+    steps.append(warm_recommendations)
+    prefetcher.schedule(token, steps)
+
+def answer_messages(main_index: int, answer: str, feedback: str) -> List[tuple]:
+    """ 답변과 그 피드백 메시지 (같은 순번의 키로 저장) """
+    return [("user_answer", answer, main_index), ("feedback", feedback, main_index)]
+
+def message_ordinal(interview_session: InterviewSession, message_type: str, main_index: int) -> int:
+    """ 메시지 키 순번 (이번 턴의 메시지가 세션 상태에 반영된 뒤 기준) """
+    if message_type in ("user_answer", "feedback"):
+        return max(len(interview_session.answers[main_index]) - 1, 0)
+    if message_type == "follow_up":
+        return max(len(interview_session.follow_up_questions[main_index]) - 1, 0)
+    return 0
+
+def apply_messages(interview_session: InterviewSession, messages: List[tuple]):
+    """ 최신 스냅샷으로 다시 읽은 세션에 이번 턴의 메시지를 반영하는 함수 (저장 충돌 후 재시도) """
+    for message_type, content, main_index in messages:
+        if message_type == "user_answer":
+            interview_session.answers[main_index].append(content)
+        elif message_type == "feedback":
+            interview_session.feedbacks[main_index].append(content)
+        elif message_type == "follow_up":
+            interview_session.follow_up_questions[main_index].append(content)
+        elif message_type == "main_question" and main_index >= len(interview_session.main_questions):
+            interview_session.main_questions.append(content)
+
+class StaleSessionState(Exception):
+    """ 다른 워커가 그 사이에 더 새로운 스냅샷을 저장함 """
+
+async def save_snapshot(db: AsyncSession, session: InterviewSessionDB, interview_session: InterviewSession):
+    """ 읽어 온 버전 그대로일 때만 스냅샷을 갱신하는 함수 (커밋은 호출하는 쪽에서 턴 메시지와 함께) """
+    expected = interview_session.state_version
+    snapshot = interview_session.to_snapshot()
+    result = await db.execute(
+        update(InterviewSessionDB)
+        .where(InterviewSessionDB.id == session.id,
+               func.coalesce(InterviewSessionDB.state_version, 0) == expected)
+        .values(state_snapshot=snapshot, state_version=expected + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        raise StaleSessionState(f"세션 스냅샷 버전 충돌 - 토큰: {session.session_token}, 기대 버전: {expected}")
+    interview_session.state_version = expected + 1
+    set_committed_value(session, "state_snapshot", snapshot)
+    set_committed_value(session, "state_version", expected + 1)
+
+async def commit_turn(db: AsyncSession, session: InterviewSessionDB, interview_session: InterviewSession,
+                      messages: List[tuple], update_row: Optional[Callable[[InterviewSessionDB], None]] = None):
+    """ 이번 턴의 메시지 / 진행 상태 / 스냅샷을 한 트랜잭션으로 저장하는 함수
+    messages: (메시지 종류, 내용, 대표질문 번호) 목록, update_row: 세션 행의 진행 상태 변경
+    다른 워커가 먼저 저장했으면 최신 스냅샷으로 세션을 다시 읽고 이번 턴을 반영해서 재시도
+    반환: (저장된 세션 행, 면접 세션) """
+    token, session_id = session.session_token, session.id
+    for attempt in range(SNAPSHOT_SAVE_RETRIES):
+        batch = message_log.batch(session_id)
+        for message_type, content, main_index in messages:
+            batch.add(message_type, content, main_index, message_ordinal(interview_session, message_type, main_index))
+        if update_row is not None:
+            update_row(session)
+        interview_session.current_main = session.current_main_question_index
+        interview_session.current_follow_up = session.current_follow_up_index
+        version = interview_session.state_version
+        try:
+            await batch.flush(db)
+            await save_snapshot(db, session, interview_session)
+            await db.commit()
+        except StaleSessionState as e:
+            logger.warning(f"{str(e)} -> 최신 상태로 다시 저장 ({attempt + 1}/{SNAPSHOT_SAVE_RETRIES})")
+            await db.rollback()
+            session = await db.get(InterviewSessionDB, session_id, populate_existing=True)
+            interview_session = await load_interview_session(db, session)
+            apply_messages(interview_session, messages)
+            continue
+        except Exception:
+            interview_session.state_version = version
+            raise
+
+        if session.status == "completed":
+            session_store.pop(token)
+        else:
+            session_store.put(token, interview_session)
+        return session, interview_session
+    raise HTTPException(status_code=409, detail="동시에 들어온 다른 요청 때문에 면접 상태를 저장하지 못했습니다. 다시 시도해주세요.")
+
+async def load_interview_session(db: AsyncSession, session: InterviewSessionDB) -> InterviewSession:
+    """ 스냅샷(없으면 DB 메시지)으로 면접 세션을 복원하는 함수 """
+    token = session.session_token
+    # 스냅샷 복원은 이력서 산출물 파일을 읽으므로 스레드에서
+    interview_session = await asyncio.to_thread(InterviewSession.from_snapshot, token, session.state_snapshot)
+    if interview_session is None:
+        interview_session = InterviewSession(token=token)
+        messages = (await db.scalars(
+            select(ChatMessageDB)
+            .filter(ChatMessageDB.session_id == session.id)
+            .order_by(ChatMessageDB.seq.asc(), ChatMessageDB.id.asc())
+        )).all()
+        interview_session.restore_from_messages(messages)
+    interview_session.state_version = session.state_version or 0
+    interview_session.current_main = session.current_main_question_index
+    interview_session.current_follow_up = session.current_follow_up_index
+    return interview_session
+
+async def get_interview_session(db: AsyncSession, session: InterviewSessionDB) -> InterviewSession:
+    """ 캐시된 면접 세션을 반환하고, 없거나 DB 스냅샷보다 오래됐으면 다시 복원하는 함수 """
+    token = session.session_token
+    interview_session = session_store.get(token)
+    # 다른 워커가 이 세션을 진행했으면 (DB 버전이 더 높으면) 이 워커의 캐시는 버림
+    if interview_session is None or interview_session.state_version < (session.state_version or 0):
+        interview_session = await load_interview_session(db, session)
+        session_store.put(token, interview_session)
+
+    # 진행 상태는 DB 기준으로 맞춤
+    interview_session.current_main = session.current_main_question_index
+    interview_session.current_follow_up = session.current_follow_up_index
+    return interview_session
+
+
+async def fetch_messages(db: AsyncSession, session_id: int, after: int, limit: int):
+    """ seq 순서대로 after 이후의 메시지를 최대 limit개 조회하는 함수 ((session_id, seq) 인덱스 사용) """
+    messages = (await db.scalars(
+        select(ChatMessageDB)
+        .filter(ChatMessageDB.session_id == session_id, ChatMessageDB.seq > after)
+        .order_by(ChatMessageDB.seq.asc())
+        .limit(limit + 1)
+    )).all()
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    return {
+        "messages": [
+            {
+                "seq": msg.seq,
+                "type": msg.message_type,
+                "text": msg.content,
+                "timestamp": msg.created_at
+            }
+            for msg in messages
+        ],
+        # 다음 요청에서 ?after= 로 넘길 값
+        "next_after": messages[-1].seq if messages else after,
+        "has_more": has_more
+    }
+
 
 @chat.get("/{token}")
-async def get_chat(token: str, db: Session = Depends(get_db)):
-    """특정 세션의 채팅 내역을 조회합니다."""
+async def get_chat(token: str, after: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=500),
+                   db: AsyncSession = Depends(get_async_db)):
+    """특정 세션의 채팅 내역을 조회합니다. (after: 마지막으로 받은 seq, limit: 최대 개수)"""
     try:
         # 세션 조회
-        session = db.query(InterviewSessionDB).filter(InterviewSessionDB.session_token == token).first()
+        session = await db.scalar(select(InterviewSessionDB).filter(InterviewSessionDB.session_token == token))
         if not session:
             session = await create_new_session(db, token)
         
-        # 세션의 모든 메시지 조회 (session_id 사용)
-        messages = db.query(ChatMessageDB)\
-            .filter(ChatMessageDB.session_id == session.id)\
-            .order_by(ChatMessageDB.created_at.asc())\
-            .all()
-        
-        # 메시지 타입별 우선순위 정의
-        type_priority = {
-            "main_question": 1,
-            "user_answer": 2,
-            "feedback": 3,
-            "follow_up": 4
-        }
-        
-        # 메시지를 시간순으로 정렬하되, 같은 시간대의 메시지는 타입 우선순위에 따라 정렬
-        sorted_messages = []
-        for msg in messages:
-            sorted_messages.append({
-                "type": msg.message_type,
-                "text": msg.content,
-                "timestamp": msg.created_at,
-                "priority": type_priority.get(msg.message_type, 5)
-            })
-        
-        # 시간순으로 정렬하되, 같은 시간대의 메시지는 타입 우선순위에 따라 정렬
-        sorted_messages.sort(key=lambda x: (x["timestamp"], x["priority"]))
-        
-        # 우선순위 필드 제거
-        for msg in sorted_messages:
-            del msg["priority"]
+        # DB에서 seq 순서로 정렬된 메시지 조회 (session_id 사용)
+        page = await fetch_messages(db, session.id, after, limit)
         
         # 메시지 목록 반환
         return {
             "session_token": token,
-            "messages": sorted_messages,
+            **page,
             "status": session.status
         }
         
@@ -125,146 +259,82 @@ async def get_chat(token: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @chat.get("/get_chat")
-async def get_chat(session_token: str):
-    """채팅 내역을 새로고침할 때 사용되는 엔드포인트"""
+async def get_chat(session_token: str, after: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=500)):
+    """채팅 내역을 새로고침할 때 사용되는 엔드포인트 (after 이후의 새 메시지만 조회 가능)"""
     try:
-        db = SessionLocal()
-        try:
+        async with AsyncSessionLocal() as db:
             # 세션 조회
-            session = db.query(InterviewSessionDB).filter_by(session_token=session_token).first()
+            session = await db.scalar(select(InterviewSessionDB).filter_by(session_token=session_token))
             if not session:
                 raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
 
             # 메시지 조회
-            messages = db.query(ChatMessageDB)\
-                .filter_by(session_id=session.id)\
-                .order_by(ChatMessageDB.created_at.asc())\
-                .all()
-            
-            # 메시지 타입별 우선순위 정의
-            type_priority = {
-                "main_question": 1,
-                "user_answer": 2,
-                "feedback": 3,
-                "follow_up": 4
-            }
-            
-            # 메시지를 시간순으로 정렬하되, 같은 시간대의 메시지는 타입 우선순위에 따라 정렬
-            sorted_messages = []
-            for msg in messages:
-                sorted_messages.append({
-                    "type": msg.message_type,
-                    "text": msg.content,
-                    "timestamp": msg.created_at,
-                    "priority": type_priority.get(msg.message_type, 5)
-                })
-            
-            # 시간순으로 정렬하되, 같은 시간대의 메시지는 타입 우선순위에 따라 정렬
-            sorted_messages.sort(key=lambda x: (x["timestamp"], x["priority"]))
-            
-            # 우선순위 필드 제거
-            for msg in sorted_messages:
-                del msg["priority"]
+            page = await fetch_messages(db, session.id, after, limit)
             
             return {
                 "status": "success",
-                "messages": sorted_messages
+                **page
             }
             
-        finally:
-            db.close()
-            
     except Exception as e:
         logger.error(f"채팅 내역 조회 중 오류 발생: {str(e)}")
         raise HTTPException(status_code=500, detail="채팅 내역을 조회할 수 없습니다.")
 
 @chat.post("/answer/{token}")
-async def submit_answer(token: str, request: AnswerRequest, db: Session = Depends(get_db)):
+async def submit_answer(token: str, request: AnswerRequest, db: AsyncSession = Depends(get_async_db)):
     try:
-        session = db.query(InterviewSessionDB).filter_by(session_token=token).first()
+        session = await db.scalar(select(InterviewSessionDB).filter_by(session_token=token))
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
         if session.status != "in_progress":
             raise HTTPException(status_code=400, detail="This session is not active")
 
-        interview_session = InterviewSession(token=token)
-        
-        # 사용자 답변 저장 (session_id 사용)
-        user_message = ChatMessageDB(
-            session_id=session.id,
-            message_type="user_answer",
-            content=request.answer
-        )
-        db.add(user_message)
+        interview_session = await get_interview_session(db, session)
         
         # 피드백 생성
         feedback = await interview_session.generate_feedback(request.answer)
         if not feedback:
             raise HTTPException(status_code=500, detail="피드백을 생성할 수 없습니다.")
             
-        feedback_message = ChatMessageDB(
-            session_id=session.id,
-            message_type="feedback",
-            content=feedback
-        )
-        db.add(feedback_message)
-        db.commit()
+        # 사용자 답변과 피드백을 한 번에 저장 (session_id 사용)
+        interview_session.store_user_answer(session.id, request.answer)
+        await commit_turn(db, session, interview_session,
+                          answer_messages(session.current_main_question_index, request.answer, feedback))
         
         return {"feedback": feedback}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"답변 제출 중 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @chat.post("/follow-up/{token}")
-async def get_follow_up_question(token: str, request: FollowUpRequest, db: Session = Depends(get_db)):
+async def get_follow_up_question(token: str, request: FollowUpRequest, db: AsyncSession = Depends(get_async_db)):
     try:
-        session = db.query(InterviewSessionDB).filter_by(session_token=token).first()
+        session = await db.scalar(select(InterviewSessionDB).filter_by(session_token=token))
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
         if session.status != "in_progress":
             raise HTTPException(status_code=400, detail="This session is not active")
 
-        interview_session = InterviewSession(token=token)
+        interview_session = await get_interview_session(db, session)
         
         # 현재 꼬리질문 진행 상태 확인
         if session.current_follow_up_index >= 2:
             # 꼬리질문 한도 도달 시 다음 대표질문으로 전환
-            session.current_follow_up_index = 0
-            session.current_main_question_index += 1
-            db.commit()
-
-            if session.current_main_question_index < 5:
-                next_question = await interview_session.generate_main_question()
-                if next_question:
-                    next_main_question = ChatMessageDB(
-                        session_id=session.id,
-                        message_type="main_question",
-                        content=next_question
-                    )
-                    db.add(next_main_question)
-                    db.commit()
-                    return {"question": next_question, "type": "main_question"}
-            else:
-                session.status = "completed"
-                db.commit()
-                return {"question": None, "type": "completed"}
+            result = await advance_main_question(db, session, interview_session)
+            if result:
+                return result
         
         # 꼬리질문 생성
         follow_up = await interview_session.generate_follow_up(request.previous_answer)
         
         if follow_up:
             # 꼬리질문 저장 (session_id 사용)
-            follow_up_message = ChatMessageDB(
-                session_id=session.id,
-                message_type="follow_up",
-                content=follow_up
-            )
-            db.add(follow_up_message)
-            session.current_follow_up_index += 1
-            db.commit()
+            session, interview_session = await commit_turn(
+                db, session, interview_session, [("follow_up", follow_up, session.current_main_question_index)],
+                next_follow_up)
             
             return {
                 "question": follow_up, 
@@ -274,51 +344,259 @@ async def get_follow_up_question(token: str, request: FollowUpRequest, db: Sessi
         
         return {"question": None, "type": "no_question"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"꼬리질문 생성 중 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@chat.get("/all/sessions")
-async def get_sessions(user_id: str, db: Session = Depends(get_db)):
+async def advance_main_question(db: AsyncSession, session: InterviewSessionDB, interview_session: InterviewSession):
+    """ 다음 대표질문으로 넘어가거나 세션을 완료 처리하는 함수 """
+    next_index = session.current_main_question_index + 1
+
+    def move(row: InterviewSessionDB):
+        row.current_main_question_index = next_index
+        row.current_follow_up_index = 0
+        if next_index >= 5:
+            row.status = "completed"
+
+    if next_index < 5:
+        next_question = await interview_session.generate_main_question(index=next_index)
+        if next_question:
+            await commit_turn(db, session, interview_session, [("main_question", next_question, next_index)], move)
+            return {"question": next_question, "type": "main_question"}
+        return None
+
+    await commit_turn(db, session, interview_session, [], move)
+    return {"question": None, "type": "completed"}
+
+def next_follow_up(row: InterviewSessionDB):
+    row.current_follow_up_index += 1
+
+def sse_event(data: dict, event: Optional[str] = None) -> str:
+    """ Server-Sent Events 형식 메시지 """
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+async def get_active_session(db: AsyncSession, token: str) -> InterviewSessionDB:
+    session = await db.scalar(select(InterviewSessionDB).filter_by(session_token=token))
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if session.status != "in_progress":
+        raise HTTPException(status_code=400, detail="This session is not active")
+    return session
+
+@chat.post("/answer/{token}/stream")
+async def submit_answer_stream(token: str, request: AnswerRequest, db: AsyncSession = Depends(get_async_db)):
+    """피드백을 생성되는 대로 text/event-stream으로 전송하고, 끝나면 DB에 저장"""
+    session = await get_active_session(db, token)
+    interview_session = await get_interview_session(db, session)
+    session_id = session.id
+
+    async def event_stream():
+        chunks = []
+        try:
+            async for chunk in interview_session.stream_feedback(request.answer):
+                chunks.append(chunk)
+                yield sse_event({"token": chunk})
+
+            feedback = "".join(chunks).strip()
+            if not feedback:
+                yield sse_event({"detail": "피드백을 생성할 수 없습니다."}, event="error")
+                return
+
+            # 스트림이 끝난 뒤 답변과 피드백 전체 텍스트 저장
+            interview_session.store_user_answer(session_id, request.answer)
+            async with AsyncSessionLocal() as write_db:
+                row = await write_db.get(InterviewSessionDB, session_id)
+                await commit_turn(write_db, row, interview_session,
+                                  answer_messages(row.current_main_question_index, request.answer, feedback))
+            yield sse_event({"feedback": feedback}, event="done")
+        except Exception as e:
+            logger.error(f"피드백 스트리밍 중 오류: {str(e)}")
+            yield sse_event({"detail": str(e)}, event="error")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@chat.post("/follow-up/{token}/stream")
+async def get_follow_up_question_stream(token: str, request: FollowUpRequest, db: AsyncSession = Depends(get_async_db)):
+    """꼬리질문을 생성되는 대로 text/event-stream으로 전송하고, 끝나면 DB에 저장"""
+    session = await get_active_session(db, token)
+    interview_session = await get_interview_session(db, session)
+
+    # 꼬리질문 한도 도달 시에는 다음 대표질문을 한 번에 전송
+    if session.current_follow_up_index >= 2:
+        try:
+            result = await advance_main_question(db, session, interview_session)
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"대표질문 전환 중 오류: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+        if result:
+            async def single_event():
+                yield sse_event(result, event="done")
+            return StreamingResponse(single_event(), media_type="text/event-stream",
+                                     headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    session_id = session.id
+
+    async def event_stream():
+        chunks = []
+        try:
+            async for chunk in interview_session.stream_follow_up(request.previous_answer):
+                chunks.append(chunk)
+                yield sse_event({"token": chunk})
+
+            follow_up = "".join(chunks).strip()
+            if not follow_up:
+                yield sse_event({"question": None, "type": "no_question"}, event="done")
+                return
+
+            async with AsyncSessionLocal() as write_db:
+                row = await write_db.get(InterviewSessionDB, session_id)
+                row, _ = await commit_turn(
+                    write_db, row, interview_session, [("follow_up", follow_up, row.current_main_question_index)],
+                    next_follow_up)
+                follow_up_count = row.current_follow_up_index
+            yield sse_event({"question": follow_up, "type": "follow_up", "follow_up_count": follow_up_count},
+                            event="done")
+        except Exception as e:
+            logger.error(f"꼬리질문 스트리밍 중 오류: {str(e)}")
+            yield sse_event({"detail": str(e)}, event="error")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@chat.post("/turn/{token}")
+async def submit_turn(token: str, request: AnswerRequest, db: AsyncSession = Depends(get_async_db)):
+    """답변 한 번으로 피드백과 다음 질문(꼬리질문 또는 다음 대표질문)을 동시에 생성하는 API"""
     try:
-        # 유저 ID를 기준으로 세션을 필터링 (최신순)
-        sessions = db.query(InterviewSessionDB)\
-            .filter(InterviewSessionDB.user_id == user_id)\
-            .order_by(InterviewSessionDB.created_at.desc())\
-            .all()
+        session = await get_active_session(db, token)
+        interview_session = await get_interview_session(db, session)
+        interview_session.store_user_answer(session.id, request.answer)
+
+        # 꼬리질문 한도에 도달했으면 다음 대표질문, 아니면 꼬리질문을 피드백과 함께 생성
+        advance = session.current_follow_up_index >= 2
+        next_main_index = session.current_main_question_index + 1
+        feedback_task = interview_session.generate_feedback(request.answer)
+        if not advance:
+            next_task = interview_session.generate_follow_up(request.answer)
+        elif next_main_index < 5:
+            next_task = interview_session.generate_main_question(index=next_main_index)
+        else:
+            next_task = None
+
+        if next_task is not None:
+            feedback, next_question = await asyncio.gather(feedback_task, next_task)
+        else:
+            feedback, next_question = await feedback_task, None
 
-        # 세션 정보를 JSON 형태로 변환
-        session_list = []
-        for session in sessions:
-            # 해당 세션의 메시지들을 조회 (session_id 사용)
-            messages = db.query(ChatMessageDB)\
-                .filter(ChatMessageDB.session_id == session.id)\
-                .order_by(ChatMessageDB.created_at.desc())\
-                .all()
-
-            # 마지막 메시지 가져오기
-            last_message = messages[0].content if messages else None
-
-            # 대표질문 개수 계산
-            main_questions = [msg for msg in messages if msg.message_type == "main_question"]
-
-            session_list.append({
-                "session_token": session.session_token,
-                "status": session.status,
-                "created_at": session.created_at,
-                "last_message": last_message,
-                "current_question": len(main_questions)
-            })
-
-        return session_list
+        if not feedback:
+            raise HTTPException(status_code=500, detail="피드백을 생성할 수 없습니다.")
+
+        # 이번 턴의 메시지와 진행 상태를 한 트랜잭션으로 저장
+        main_index = session.current_main_question_index
+        messages = answer_messages(main_index, request.answer, feedback)
+        result = {"feedback": feedback}
+        update_row = None
+
+        def move(row: InterviewSessionDB):
+            row.current_main_question_index = next_main_index
+            row.current_follow_up_index = 0
+            if next_main_index >= 5:
+                row.status = "completed"
+
+        if not advance:
+            if next_question:
+                messages.append(("follow_up", next_question, main_index))
+                update_row = next_follow_up
+                result.update({"question": next_question, "type": "follow_up"})
+            else:
+                result.update({"question": None, "type": "no_question"})
+        elif next_question:
+            messages.append(("main_question", next_question, next_main_index))
+            update_row = move
+            result.update({"question": next_question, "type": "main_question"})
+        elif next_main_index >= 5:
+            update_row = move
+            result.update({"question": None, "type": "completed"})
+        else:
+            result.update({"question": None, "type": "no_question"})
+
+        session, _ = await commit_turn(db, session, interview_session, messages, update_row)
+        if result.get("type") == "follow_up":
+            result["follow_up_count"] = session.current_follow_up_index
+        return result
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"턴 처리 중 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@chat.get("/hint/{token}")
+async def get_hint(token: str, db: AsyncSession = Depends(get_async_db)):
+    """현재 대표질문에 대한 힌트 (선행 생성된 힌트가 있으면 바로 반환)"""
+    try:
+        session = await get_active_session(db, token)
+        interview_session = await get_interview_session(db, session)
+        index = session.current_main_question_index
+        if index < len(interview_session.hints) and interview_session.hints[index]:
+            return {"hint": interview_session.hints[index][-1], "question_index": index}
+
+        question = await interview_session.generate_main_question(index=index)
+        if not question:
+            raise HTTPException(status_code=404, detail="현재 대표질문이 없습니다.")
+        hint = await interview_session.generate_hint(question, index)
+        session_store.put(token, interview_session)
+        return {"hint": hint, "question_index": index}
+    except HTTPException:
+        raise
     except Exception as e:
+        logger.error(f"힌트 생성 중 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@chat.get("/all/sessions")
+async def get_sessions(user_id: str, limit: int = Query(50, ge=1, le=200), offset: int = Query(0, ge=0),
+                       db: AsyncSession = Depends(get_async_db)):
+    try:
+        # 유저 ID를 기준으로 세션을 필터링 (최신순, (user_id, created_at) 인덱스)
+        # 마지막 메시지 / 대표질문 수는 메시지 저장 시 갱신되는 요약 컬럼에서 바로 읽음
+        rows = (await db.execute(
+            select(
+                InterviewSessionDB.session_token,
+                InterviewSessionDB.status,
+                InterviewSessionDB.created_at,
+                InterviewSessionDB.updated_at,
+                InterviewSessionDB.last_message,
+                InterviewSessionDB.last_message_type,
+                InterviewSessionDB.main_question_count,
+            )
+            .filter(InterviewSessionDB.user_id == user_id)
+            .order_by(InterviewSessionDB.created_at.desc(), InterviewSessionDB.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )).all()
 
+        # 세션 정보를 JSON 형태로 변환
+        return [
+            {
+                "session_token": row.session_token,
+                "status": row.status,
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+                "last_message": row.last_message,
+                "last_message_type": row.last_message_type,
+                "current_question": row.main_question_count or 0
+            }
+            for row in rows
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 @chat.post("/start/{pdf_token}")
-async def start_chat(pdf_token: str, request: StartChatRequest, db: Session = Depends(get_db)):
+async def start_chat(pdf_token: str, request: StartChatRequest, db: AsyncSession = Depends(get_async_db)):
     """새로운 채팅 세션을 시작하는 API"""
     try:
         # PDF 토큰 존재 여부 확인
@@ -332,12 +610,14 @@ async def start_chat(pdf_token: str, request: StartChatRequest, db: Session = De
             )
 
         # 기존 세션이 있는지 확인
-        existing_session = db.query(InterviewSessionDB).filter_by(
+        existing_session = await db.scalar(select(InterviewSessionDB).filter_by(
             session_token=pdf_token
-        ).first()
+        ))
         
         if existing_session:
             logger.info(f"기존 세션 발견: {pdf_token}")
+            if existing_session.status == "in_progress":
+                schedule_prefetch(pdf_token, await get_interview_session(db, existing_session))
             return {"session_token": pdf_token}
 
         # 새 세션 생성
@@ -345,37 +625,24 @@ async def start_chat(pdf_token: str, request: StartChatRequest, db: Session = De
             logger.info(f"새 세션 생성 시도: {pdf_token}")
             session = await create_new_session(db, pdf_token, request.user_id)  # 유저 아이디 전달
             logger.info(f"새 세션 생성 성공: {pdf_token}")
+            # 다음 질문 / 힌트 / 추천 영상은 응답 후 백그라운드에서 준비
+            schedule_prefetch(pdf_token, await get_interview_session(db, session))
             return {"session_token": pdf_token}
         except Exception as e:
             logger.error(f"세션 생성 중 오류 발생: {str(e)}")
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         logger.error(f"채팅 시작 중 오류 발생: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @chat.post("/cleanup")
-async def cleanup_sessions(db: Session = Depends(get_db)):
-    """ 오래된 세션들을 정리하는 API """
+async def cleanup_sessions():
+    """ 완료된 세션과 오래된 세션들을 정리하는 API (정리 작업을 즉시 한 번 실행) """
     try:
-        # 완료된 세션 삭제
-        completed_sessions = db.query(InterviewSessionDB).filter_by(status="completed").all()
-        for session in completed_sessions:
-            db.query(ChatMessageDB).filter_by(session_id=session.id).delete()
-            db.delete(session)
-        
-        # 24시간 이상 된 세션 삭제
-        old_sessions = db.query(InterviewSessionDB).filter(
-            InterviewSessionDB.created_at < datetime.now() - timedelta(hours=24)
-        ).all()
-        for session in old_sessions:
-            db.query(ChatMessageDB).filter_by(session_id=session.id).delete()
-            db.delete(session)
-        
-        db.commit()
-        return {"message": "세션 정리 완료"}
+        result = await retention_worker.run_once(include_completed=True)
+        return {"message": "세션 정리 완료", **result}
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,8 +1,13 @@
 import os
 import uuid
+import asyncio
+import hashlib
 from fastapi import APIRouter, Response, Cookie, File, Form, UploadFile, HTTPException
-from config import FILE_DIR, MAX_FSIZE
-from utils import echo, load_pdf_to_text
+from config import FILE_DIR, MAX_FSIZE, UPLOAD_CHUNK_SIZE
+from utils import echo
+from utils.pdf_extract import pdf_extractor, PDFExtractTimeout
+from utils.posting import posting_ingestor
+from utils.resume_digest import resume_digester
 from routers.pdf_storage import pdf_storage
 from datetime import datetime
 
@@ -21,6 +26,32 @@ async def reload_form(token: str = Cookie(None)):
         return None
     return pdf_data
 
+def too_large(file_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"파일 크기가 너무 큽니다. (50MB 제한): 현재 크기 {file_size / (1024 * 1024):.2f} MB",
+    )
+
+async def save_upload(file: UploadFile, file_path: str):
+    """업로드 파일을 청크 단위로 저장하고, 크기 제한을 넘는 순간 중단 후 파일 삭제 (반환: 파일 SHA-256)"""
+    written = 0
+    digest = hashlib.sha256()
+    fsave = await asyncio.to_thread(open, file_path, "wb")
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > MAX_FSIZE:
+                raise too_large(written)
+            digest.update(chunk)
+            await asyncio.to_thread(fsave.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(fsave.close)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    await asyncio.to_thread(fsave.close)
+    return digest.hexdigest()
+
 @input.post("/uploadfile/")
 async def upload_file(
     res: Response,
@@ -31,37 +62,51 @@ async def upload_file(
     token = str(uuid.uuid4())
     res.set_cookie("token", token)
 
-    content = await file.read()
-    file_size = len(content)
+    # File size validation (크기를 알 수 있으면 읽기 전에 거절)
+    if file.size is not None and file.size > MAX_FSIZE:
+        await file.close()
+        raise too_large(file.size)
 
-    # File size validation
-    if file_size > MAX_FSIZE:
-        raise HTTPException(
-            status_code=413,
-            detail=f"파일 크기가 너무 큽니다. (50MB 제한): 현재 크기 {file_size / (1024 * 1024):.2f} MB",
-        )
+    # 채용 공고는 파일 저장 / 텍스트 추출과 동시에 백그라운드에서 가져와서 요약 (URL별로 저장, 응답은 기다리지 않음)
+    posting_ingestor.start(recruitUrl)
 
     # Define file path
     file_path = os.path.join(FILE_DIR, f"{token}.pdf")
 
-    # Save the file
+    # Save the file (메모리에 전부 올리지 않고 청크 단위로 디스크에 기록)
     try:
-        with open(file_path, "wb") as fsave:
-            fsave.write(content)
-
-        # Extract text from PDF
-        resume_text = load_pdf_to_text(file_path)
-
+        file_hash = await save_upload(file, file_path)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 저장 중 오류 발생: {str(e)}")
-
     finally:
         await file.close()
 
+    # 같은 내용의 파일은 디스크에 한 벌만 유지 (파일 이름 = SHA-256)
+    canonical_path = os.path.join(FILE_DIR, f"{file_hash}.pdf")
+    if os.path.exists(canonical_path):
+        os.remove(file_path)
+    else:
+        os.replace(file_path, canonical_path)
+    file_path = canonical_path
+
+    # Extract text from PDF (별도 프로세스에서 페이지 단위로 실행, 같은 파일이면 캐시된 텍스트 사용)
+    try:
+        resume_text = await pdf_extractor.extract(file_path, file_hash)
+    except PDFExtractTimeout as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"PDF 텍스트 추출 중 오류 발생: {str(e)}")
+
+    # 프롬프트용 이력서 요약을 백그라운드에서 시작 (같은 이력서면 저장된 요약 사용)
+    resume_digester.start(file_hash, resume_text)
+
     # Store data in memory using pdf_storage
     pdf_data = {
         "resume_text": resume_text,
         "recruitUrl": recruitUrl,
+        "resume_hash": file_hash,  # 이력서 산출물(utils.resume_artifacts)을 찾는 키
         "created_at": datetime.now().isoformat(),  # 생성 시간 추가
     }
     pdf_storage.add_pdf(token, pdf_data)
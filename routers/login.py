@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from db import get_db, UserDB
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import get_async_db, UserDB
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -19,12 +20,12 @@ class UserLogin(BaseModel):
     pw: str
 
 @router.post("/signup")
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # FastAPI 콘솔에서 확인 용
     print(f"[signup] 요청 받은 아이디: {user.id}")
 
     # 이미 같은 아이디가 존재하는지 확인
-    exist_user = db.query(UserDB).filter(UserDB.id == user.id).first()
+    exist_user = await db.scalar(select(UserDB).filter(UserDB.id == user.id))
     if exist_user:
         print("[signup] 이미 존재하는 아이디입니다.")
         return {"message": "User already exists"}  # 프론트에서 이 메시지 확인 가능
@@ -38,19 +39,19 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
         phone=user.phone
     )
     db.add(new_user)
-    db.commit()
+    await db.commit()
 
     print("[signup] 회원가입 성공")
     return {"message": "Signup success"}
 
 @router.post("/login")
-def login(user: UserLogin, db: Session = Depends(get_db)):
+async def login(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
     print(f"[login] 로그인 시도 아이디: {user.id}")
     # 아이디와 비밀번호가 일치하는지 확인
-    exist_user = db.query(UserDB).filter(
+    exist_user = await db.scalar(select(UserDB).filter(
         UserDB.id == user.id,
         UserDB.pw == user.pw
-    ).first()
+    ))
 
     if exist_user:
         print("[login] 로그인 성공")
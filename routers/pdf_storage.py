@@ -1,31 +1,269 @@
 # PDF 파일 저장소
+# 토큰 -> 업로드된 이력서 데이터. 실제 저장은 백엔드가 담당한다.
+#   memory: 프로세스 내 LRU (개수 / 크기 상한 + TTL)
+#   sqlite: CACHE_DIR의 SQLite 파일 (여러 uvicorn 워커가 같은 토큰을 조회 가능)
+import json
 import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from config import (PDF_STORAGE_BACKEND, PDF_STORAGE_PATH, PDF_STORAGE_TTL, PDF_STORAGE_MAX_ENTRIES,
+                    PDF_STORAGE_MAX_BYTES)
 
 logger = logging.getLogger(__name__)
 
-class PDFStorage:
+
+def _encode(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class PDFStorageBackend(ABC):
+    """PDF 저장소 백엔드 인터페이스"""
+
     def __init__(self):
-        self._pdf_files = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, token: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def set(self, token: str, data: dict):
+        ...
+
+    @abstractmethod
+    def delete(self, token: str):
+        ...
+
+    @abstractmethod
+    def size(self) -> int:
+        ...
+
+    @abstractmethod
+    def bytes(self) -> int:
+        ...
+
+    @abstractmethod
+    def keys(self) -> list:
+        ...
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": self.size(),
+            "bytes": self.bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+        }
+
+
+class MemoryPDFBackend(PDFStorageBackend):
+    """프로세스 내 LRU 백엔드"""
+
+    def __init__(self, ttl: float = PDF_STORAGE_TTL, max_entries: int = PDF_STORAGE_MAX_ENTRIES,
+                 max_bytes: int = PDF_STORAGE_MAX_BYTES):
+        super().__init__()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # token -> (data, size, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.monotonic() - entry[2] > self.ttl:
+                self._remove(token)
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, token: str, data: dict):
+        size = len(_encode(data).encode("utf-8"))
+        with self._lock:
+            self._remove(token)
+            self._entries[token] = (data, size, time.monotonic())
+            self._bytes += size
+            # 방금 넣은 항목 하나는 남기고 오래 사용하지 않은 것부터 제거
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+                logger.info(f"PDF 저장소에서 제거됨 - 토큰: {oldest}")
+
+    def delete(self, token: str):
+        with self._lock:
+            self._remove(token)
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def bytes(self) -> int:
+        return self._bytes
+
+    def keys(self) -> list:
+        return list(self._entries)
+
+
+class SQLitePDFBackend(PDFStorageBackend):
+    """여러 워커가 공유하는 SQLite 백엔드 (TTL + 개수 / 크기 상한, 오래 안 쓴 것부터 제거)"""
+
+    def __init__(self, path: str = PDF_STORAGE_PATH, ttl: float = PDF_STORAGE_TTL,
+                 max_entries: int = PDF_STORAGE_MAX_ENTRIES, max_bytes: int = PDF_STORAGE_MAX_BYTES):
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pdf_storage (
+                    token TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pdf_storage_accessed ON pdf_storage (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, token: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value, created_at FROM pdf_storage WHERE token = ?", (token,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl:
+                conn.execute("DELETE FROM pdf_storage WHERE token = ?", (token,))
+                conn.commit()
+                self.evictions += 1
+                self.misses += 1
+                return None
+            conn.execute("UPDATE pdf_storage SET accessed_at = ? WHERE token = ?", (now, token))
+            conn.commit()
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, token: str, data: dict):
+        value = _encode(data)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            # 다시 저장해도 생성 시각(TTL 기준)은 유지
+            conn.execute(
+                "INSERT INTO pdf_storage (token, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(token) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "accessed_at = excluded.accessed_at",
+                (token, value, len(value.encode("utf-8")), now, now),
+            )
+            self._evict(conn, now, keep=token)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float, keep: str):
+        removed = conn.execute("DELETE FROM pdf_storage WHERE created_at < ? AND token != ?",
+                               (now - self.ttl, keep)).rowcount
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pdf_storage").fetchone()
+        if count > self.max_entries or total > self.max_bytes:
+            doomed = []
+            for token, size in conn.execute(
+                    "SELECT token, size FROM pdf_storage WHERE token != ? ORDER BY accessed_at ASC", (keep,)):
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                doomed.append((token,))
+                count -= 1
+                total -= size
+            conn.executemany("DELETE FROM pdf_storage WHERE token = ?", doomed)
+            removed += len(doomed)
+        self.evictions += max(removed, 0)
+
+    def delete(self, token: str):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM pdf_storage WHERE token = ?", (token,))
+            conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM pdf_storage").fetchone()[0]
+
+    def bytes(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM pdf_storage").fetchone()[0]
+
+    def keys(self) -> list:
+        with self._lock:
+            return [row[0] for row in self._connect().execute("SELECT token FROM pdf_storage")]
+
+
+BACKENDS = {
+    "memory": MemoryPDFBackend,
+    "sqlite": SQLitePDFBackend,
+}
+
+
+class PDFStorage:
+    def __init__(self, backend: Optional[PDFStorageBackend] = None):
+        self._backend = backend or BACKENDS[PDF_STORAGE_BACKEND]()
+
+    @property
+    def backend(self) -> PDFStorageBackend:
+        return self._backend
 
     def add_pdf(self, token: str, data: dict):
         """PDF 파일 정보를 저장소에 추가"""
-        self._pdf_files[token] = data
+        self._backend.set(token, data)
         logger.info(f"PDF 저장소에 추가됨 - 토큰: {token}")
-        logger.info(f"현재 저장된 토큰들: {list(self._pdf_files.keys())}")
 
     def get_pdf(self, token: str) -> dict:
         """토큰으로 PDF 파일 정보 조회"""
-        pdf_data = self._pdf_files.get(token)
+        pdf_data = self._backend.get(token)
         if pdf_data is None:
             logger.error(f"토큰에 해당하는 PDF 데이터가 없음: {token}")
             return None
         logger.info(f"PDF 데이터 조회 성공 - 토큰: {token}")
         return pdf_data
 
+    def remove_pdf(self, token: str):
+        self._backend.delete(token)
+
+    def stats(self) -> dict:
+        return {"backend": type(self._backend).__name__, **self._backend.stats()}
+
     def print_pdf_files(self):
         """디버깅용 함수"""
-        logger.info(f"현재 저장된 PDF 파일들: {list(self._pdf_files.keys())}")
+        logger.info(f"현재 저장된 PDF 파일들: {self._backend.keys()}")
 
 # 전역 인스턴스 생성
 pdf_storage = PDFStorage()
-
@@ -1,20 +1,13 @@
 import httpx
 from fastapi import APIRouter, HTTPException
-from utils.recommendation import RecommendVideo
-from config import FILE_DIR
+from utils.recommendation import recommendation_service
+from config import FILE_DIR, RECOMMEND_TOP_N, RECOMMEND_BATCH_MAX_TOKENS
 from routers.pdf_storage import pdf_storage
-import pandas as pd
-import json
 import os
-from typing import List
-from pydantic import BaseModel
+from typing import Dict, List
+from pydantic import BaseModel, Field
 
-# youtube_data.json 파일 로드
-with open("utils/youtube_data.json", "r", encoding="utf-8") as f:
-    youtube_data = json.load(f)
-
-# DataFrame으로 변환
-video_database = pd.DataFrame(youtube_data)
+# 영상 메타데이터 / FAISS 인덱스는 recommendation_service가 서버 전체에서 한 번만 로드
 
 recommendations = APIRouter(prefix="/recommend", tags=["recommend"])
 
@@ -24,6 +17,41 @@ class RecommendationResponse(BaseModel):
     thumbnail: str
     url: str
 
+class BatchRecommendationRequest(BaseModel):
+    tokens: List[str] = Field(..., min_length=1, max_length=RECOMMEND_BATCH_MAX_TOKENS)
+    top_n: int = Field(RECOMMEND_TOP_N, ge=1, le=50)
+
+class BatchRecommendationResponse(BaseModel):
+    results: Dict[str, List[RecommendationResponse]]
+    missing: List[str]
+
+async def build_recommendations(pdf_data: dict) -> list:
+    """추천 영상 계산 (선행 생성에서도 사용)
+    결과는 pdf_storage가 아니라 recommendation_service가 인덱스 버전별로 캐시 -> 인덱스가 바뀌면 다시 계산"""
+    return await recommendation_service.recommend(pdf_data["resume_text"], pdf_data.get("resume_hash"))
+
+@recommendations.post("/batch", response_model=BatchRecommendationResponse)
+async def get_batch_recommendations(request: BatchRecommendationRequest):
+    """여러 토큰의 추천 영상을 임베딩 / FAISS 검색 한 번으로 계산"""
+    tokens = list(dict.fromkeys(request.tokens))
+    found, missing = [], []
+    for token in tokens:
+        pdf_data = pdf_storage.get_pdf(token)
+        if pdf_data and pdf_data.get("resume_text"):
+            found.append((token, pdf_data))
+        else:
+            missing.append(token)
+
+    try:
+        results = await recommendation_service.recommend_many(
+            [(pdf_data["resume_text"], pdf_data.get("resume_hash")) for _, pdf_data in found], request.top_n)
+    except Exception as e:
+        print(f"❌ 배치 추천 처리 중 오류 발생: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+    print(f"✅ 배치 추천 완료 - 토큰 {len(found)}개, 없는 토큰 {len(missing)}개")
+    return {"results": {token: videos for (token, _), videos in zip(found, results)}, "missing": missing}
+
 @recommendations.get("/{token}", response_model=List[RecommendationResponse])
 async def get_recommendations(token: str):
     try:
@@ -41,19 +69,14 @@ async def get_recommendations(token: str):
         
         print(f"📄 이력서 텍스트 길이: {len(resume_text)}")
         
-        # 추천 시스템 초기화 및 실행
-        recommender = RecommendVideo(token=token, video_database=video_database)
-        recommended_videos = await recommender.recommend_videos()
+        # 추천 실행 (미리 계산된 결과는 recommendation_service 캐시에서 인덱스 버전을 확인한 뒤 반환)
+        recommended_videos = await build_recommendations(pdf_data)
         
         if not recommended_videos:
             raise HTTPException(status_code=404, detail="추천 영상을 찾을 수 없습니다.")
         
         print(f"✅ 추천된 영상 수: {len(recommended_videos)}")
         
-        # 추천 결과를 pdf_storage에 저장
-        pdf_data["recommendations"] = recommended_videos
-        pdf_storage.add_pdf(token, pdf_data)
-        
         return recommended_videos
         
     except HTTPException as he:
@@ -1,24 +1,20 @@
-import requests
-from bs4 import BeautifulSoup
 from fastapi import APIRouter, HTTPException
+from utils.http_fetch import page_fetcher, FetchError
 
+# 인증 없이 임의 URL을 가져오는 라우트이므로 main.py에 등록하지 않음 (공고 요약은 utils.posting에서 같은 클라이언트 사용)
 router = APIRouter()
 
 @router.get("/scrape-url/")
 async def scrape_url(url: str):
     try:
-        # URL에 요청을 보내고 HTML 응답 받기
-        response = requests.get(url)
-        response.raise_for_status()  # 4xx, 5xx 에러 발생 시 예외 발생
+        # 공유 HTTP 클라이언트로 요청 (타임아웃 / 크기 상한), 바뀌지 않은 페이지는 캐시에서 반환
+        page = await page_fetcher.fetch(url)
 
-        # HTML 내용 파싱
-        soup = BeautifulSoup(response.content, "html.parser")
+        # 제목과 본문 텍스트 (스크립트 / 메뉴 제거, FETCH_MAX_TEXT_CHARS로 자름)
+        title = page["title"] or "제목 없음"
+        body = page["text"]
 
-        # 예시: 제목과 본문 텍스트 추출 (HTML 구조에 따라 수정 가능)
-        title = soup.title.string if soup.title else "제목 없음"
-        body = soup.get_text()
-
-        return {"title": title, "body": body}
+        return {"title": title, "body": body, "truncated": page["truncated"], "cache": page["cache"]}
     
-    except requests.exceptions.RequestException as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    except FetchError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
@@ -0,0 +1,94 @@
+# 서버 내부 컴포넌트 상태 조회용 라우터
+from fastapi import APIRouter
+from utils.embedding import embedding_registry
+from utils.faiss_store import faiss_indexes
+from utils.session_cache import session_store
+from utils.llm_cache import llm_cache
+from utils.prefetch import prefetcher
+from utils.message_log import message_log
+from utils.retention import retention_worker
+from routers.pdf_storage import pdf_storage
+from utils.pdf_extract import pdf_extractor
+from utils.resume_artifacts import resume_artifacts
+from utils.recommendation import recommendation_service
+from utils.retrieval import hybrid_retriever
+from utils.http_fetch import page_fetcher
+from utils.posting import posting_ingestor
+from utils.resume_digest import resume_digester
+
+stats = APIRouter(prefix="/stats", tags=["stats"])
+
+@stats.get("/embedding")
+async def get_embedding_stats():
+    """임베딩 모델별 큐 길이 / 배치 크기 통계"""
+    return embedding_registry.stats()
+
+@stats.get("/faiss")
+async def get_faiss_stats():
+    """FAISS 인덱스별 로드 버전 / 재로드 횟수"""
+    return faiss_indexes.stats()
+
+@stats.get("/sessions")
+async def get_session_cache_stats():
+    """면접 세션 캐시 적중 / 미스 / 제거 횟수"""
+    return session_store.stats()
+
+@stats.get("/llm-cache")
+async def get_llm_cache_stats():
+    """LLM 응답 캐시 항목 수 / 호출 종류별 적중 횟수"""
+    return llm_cache.stats()
+
+@stats.get("/prefetch")
+async def get_prefetch_stats():
+    """선행 생성 작업 실행 / 완료 / 취소 횟수"""
+    return prefetcher.stats()
+
+@stats.get("/messages")
+async def get_message_log_stats():
+    """채팅 메시지 배치 저장 횟수 / 배치당 메시지 수"""
+    return message_log.stats()
+
+@stats.get("/retention")
+async def get_retention_stats():
+    """세션 정리 작업 실행 횟수 / 마지막 실행에서 삭제한 행 수와 걸린 시간"""
+    return retention_worker.stats()
+
+@stats.get("/pdf-storage")
+async def get_pdf_storage_stats():
+    """이력서 저장소 백엔드 / 저장 개수 / 크기 / 적중률"""
+    return pdf_storage.stats()
+
+@stats.get("/pdf-extract")
+async def get_pdf_extract_stats():
+    """PDF 텍스트 추출 건수 / 시간 초과 / 평균 소요 시간"""
+    return pdf_extractor.stats()
+
+@stats.get("/resume-artifacts")
+async def get_resume_artifact_stats():
+    """이력서 해시별 산출물 종류별 재사용(적중) / 새로 계산(미스) 횟수"""
+    return resume_artifacts.stats()
+
+@stats.get("/recommendations")
+async def get_recommendation_stats():
+    """영상 추천 결과 캐시 적중 / 무효화 횟수와 배치 검색 횟수"""
+    return recommendation_service.stats()
+
+@stats.get("/retrieval")
+async def get_retrieval_stats():
+    """질문 후보 검색 설정 / BM25 색인 상태 / 최근 검색의 후보 겹침과 단계별 시간"""
+    return hybrid_retriever.stats()
+
+@stats.get("/fetch")
+async def get_fetch_stats():
+    """외부 페이지 요청 수 / 캐시 적중(그대로 사용, 304 재검증) / 시간 초과 / 크기 초과"""
+    return page_fetcher.stats()
+
+@stats.get("/postings")
+async def get_posting_stats():
+    """채용 공고 요약 작업 수 / 질문 생성 시점에 요약이 준비돼 있던 비율"""
+    return posting_ingestor.stats()
+
+@stats.get("/resume-digest")
+async def get_resume_digest_stats():
+    """이력서 요약 생성 수 / 템플릿별 프롬프트 토큰 (원문 대비)"""
+    return resume_digester.stats()
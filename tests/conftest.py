@@ -0,0 +1,59 @@
+# 테스트 공통 설정
+# config를 import하기 전에 DB / 캐시 경로를 임시 디렉토리로 바꿔서 실제 MySQL / cache 디렉토리를 건드리지 않는다.
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+TMP_DIR = tempfile.mkdtemp(prefix="jobs-server-test-")
+os.environ.update({
+    "SQL_URL": f"sqlite:///{os.path.join(TMP_DIR, 'test.sqlite3')}",
+    "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "test-key"),
+    "PDF_STORAGE_BACKEND": "memory",
+    "RESUME_ARTIFACT_DIR": os.path.join(TMP_DIR, "resumes"),
+    "LLM_CACHE_PATH": os.path.join(TMP_DIR, "llm_cache.sqlite3"),
+    "FETCH_CACHE_PATH": os.path.join(TMP_DIR, "fetch_cache.sqlite3"),
+    "POSTING_CACHE_PATH": os.path.join(TMP_DIR, "postings.sqlite3"),
+    "RETENTION_ENABLED": "false",
+})
+
+
+@pytest.fixture
+def http_server():
+    """외부 사이트 대신 쓰는 127.0.0.1 HTTP 서버 (tests/local_http_server.py)"""
+    from local_http_server import LocalHTTPServer
+
+    with LocalHTTPServer() as server:
+        yield server
+
+
+@pytest.fixture
+def db_tables():
+    """테스트마다 빈 테이블로 시작"""
+    from db import Base, engine
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def run():
+    """코루틴 실행 (실행이 끝나면 비동기 엔진 연결을 정리해서 다음 이벤트 루프와 섞이지 않게 함)"""
+    from db import async_engine
+
+    def _run(coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                await async_engine.dispose()
+        return asyncio.run(main())
+    return _run
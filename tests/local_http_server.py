@@ -0,0 +1,132 @@
+# 테스트용 로컬 HTTP 서버
+# 외부 사이트 대신 127.0.0.1의 임의 포트에서 정해진 응답을 돌려준다. (별도 스레드에서 실행)
+# ETag / Last-Modified 조건부 요청, 지연 응답, 리다이렉트, 큰 응답을 흉내낼 수 있고 받은 요청을 기록한다.
+#
+# 테스트에서는 conftest의 http_server 픽스처로 사용한다.
+#
+# 사용 예:
+#   with LocalHTTPServer() as server:
+#       server.add("/posting", "<html><title>채용</title>...</html>", etag='"v1"')
+#       fetcher = PageFetcher(AsyncHttpClient(allow_private=True), PageCache(tmp_path))
+#       page = await fetcher.fetch(server.url("/posting"))
+#       assert server.requests[-1]["headers"].get("If-None-Match") is None
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Union
+
+
+class _Route:
+    def __init__(self, body: bytes, status: int, content_type: str, etag: Optional[str],
+                 last_modified: Optional[str], delay: float, headers: Dict[str, str]):
+        self.body = body
+        self.status = status
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.delay = delay
+        self.headers = headers
+
+
+class LocalHTTPServer:
+    """경로별 고정 응답을 돌려주는 로컬 HTTP 서버"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.routes: Dict[str, _Route] = {}
+        self.requests: List[dict] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def add(self, path: str, body: Union[str, bytes] = b"", status: int = 200,
+            content_type: str = "text/html; charset=utf-8", etag: Optional[str] = None,
+            last_modified: Optional[Union[str, float]] = None, delay: float = 0, headers: Optional[dict] = None):
+        """path 응답 등록 (last_modified: HTTP 날짜 문자열 또는 epoch 초, delay: 응답 전 대기 초)"""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if isinstance(last_modified, (int, float)):
+            last_modified = formatdate(last_modified, usegmt=True)
+        with self._lock:
+            self.routes[path] = _Route(body, status, content_type, etag, last_modified, delay, dict(headers or {}))
+
+    def redirect(self, path: str, location: str, status: int = 302):
+        self.add(path, b"", status=status, headers={"Location": location})
+
+    def count(self, path: str) -> int:
+        """path로 들어온 요청 수"""
+        with self._lock:
+            return sum(1 for request in self.requests if request["path"] == path)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                with server._lock:
+                    server.requests.append({"method": "GET", "path": path, "headers": dict(self.headers)})
+                    route = server.routes.get(path)
+                if route is None:
+                    self._send(404, b"not found", "text/plain", {})
+                    return
+                if route.delay:
+                    time.sleep(route.delay)
+                headers = dict(route.headers)
+                if route.etag:
+                    headers["ETag"] = route.etag
+                if route.last_modified:
+                    headers["Last-Modified"] = route.last_modified
+                if route.status == 200 and self._not_modified(route):
+                    self._send(304, b"", None, headers)
+                    return
+                self._send(route.status, route.body, route.content_type, headers)
+
+            def _not_modified(self, route: _Route) -> bool:
+                if route.etag and self.headers.get("If-None-Match") == route.etag:
+                    return True
+                return bool(route.last_modified and self.headers.get("If-Modified-Since") == route.last_modified)
+
+            def _send(self, status: int, body: bytes, content_type: Optional[str], headers: dict):
+                self.send_response(status)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "LocalHTTPServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "LocalHTTPServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_openai")
+pytest.importorskip("openai")
+
+import routers.chat as chat  # noqa: E402
+from db import AsyncSessionLocal, ChatMessageDB, InterviewSessionDB  # noqa: E402
+from routers.pdf_storage import pdf_storage  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from utils.interview import InterviewSession  # noqa: E402
+from utils.message_log import MessageBatch  # noqa: E402
+
+
+@pytest.fixture
+def stubs(monkeypatch):
+    """LLM 호출 대신 잠깐 기다렸다가 세션에 결과를 추가하는 생성 함수 (시작 / 끝 순서 기록)"""
+    monkeypatch.setattr(InterviewSession, "_init_faiss", lambda self: None)
+    events, flushes = [], []
+
+    async def generate_feedback(self, last_answer):
+        events.append("feedback:start")
+        await asyncio.sleep(0.2)
+        events.append("feedback:end")
+        self.feedbacks[self.current_main].append(f"피드백: {last_answer}")
+        return f"피드백: {last_answer}"
+
+    async def generate_follow_up(self, last_answer):
+        events.append("follow_up:start")
+        await asyncio.sleep(0.2)
+        events.append("follow_up:end")
+        self.follow_up_questions[self.current_main].append("꼬리질문")
+        return "꼬리질문"
+
+    async def generate_main_question(self, index=None):
+        events.append("main_question:start")
+        await asyncio.sleep(0.2)
+        events.append("main_question:end")
+        self.main_questions.append(f"대표질문 {index + 1}")
+        return f"대표질문 {index + 1}"
+
+    real_flush = MessageBatch.flush
+
+    async def flush(self, db):
+        flushes.append([row["message_type"] for row in self.rows])
+        return await real_flush(self, db)
+
+    monkeypatch.setattr(InterviewSession, "generate_feedback", generate_feedback)
+    monkeypatch.setattr(InterviewSession, "generate_follow_up", generate_follow_up)
+    monkeypatch.setattr(InterviewSession, "generate_main_question", generate_main_question)
+    monkeypatch.setattr(MessageBatch, "flush", flush)
+    return events, flushes
+
+
+async def start_session(token: str, follow_up_index: int) -> None:
+    pdf_storage.add_pdf(token, {"resume_text": "이력서", "recruitUrl": "https://example.com/job"})
+    async with AsyncSessionLocal() as db:
+        row = InterviewSessionDB(session_token=token, status="in_progress",
+                                 current_main_question_index=0, current_follow_up_index=follow_up_index)
+        db.add(row)
+        await db.commit()
+        session = InterviewSession(token)
+        session.main_questions = ["대표질문 1"]
+        await chat.commit_turn(db, row, session, [("main_question", "대표질문 1", 0)])
+
+
+async def stored_messages(token: str):
+    async with AsyncSessionLocal() as db:
+        row = await db.scalar(select(InterviewSessionDB).filter_by(session_token=token))
+        messages = (await db.execute(
+            select(ChatMessageDB.seq, ChatMessageDB.message_type, ChatMessageDB.content)
+            .where(ChatMessageDB.session_id == row.id)
+            .order_by(ChatMessageDB.seq))).all()
+        return row, [tuple(message) for message in messages]
+
+
+@pytest.mark.parametrize("follow_up_index, next_type, question", [
+    (0, "follow_up", "꼬리질문"),
+    (2, "main_question", "대표질문 2"),
+])
+def test_turn_generates_concurrently_and_flushes_once(db_tables, run, stubs, follow_up_index, next_type, question):
+    events, flushes = stubs
+    token = f"turn-{next_type}"
+
+    async def scenario():
+        await start_session(token, follow_up_index)
+        flushes.clear()
+        async with AsyncSessionLocal() as db:
+            result = await chat.submit_turn(token, chat.AnswerRequest(answer="답변"), db)
+        return result, await stored_messages(token)
+
+    result, (row, messages) = run(scenario())
+
+    # 피드백과 다음 질문을 동시에 생성 (둘 다 시작한 뒤에 끝남)
+    assert events[:2] == ["feedback:start", f"{next_type}:start"]
+    assert set(events[2:]) == {"feedback:end", f"{next_type}:end"}
+    assert result["feedback"] == "피드백: 답변"
+    assert (result["question"], result["type"]) == (question, next_type)
+
+    # 답변 / 피드백 / 질문을 한 번의 flush로 연속된 seq에 저장
+    assert flushes == [["user_answer", "feedback", next_type]]
+    assert messages == [
+        (1, "main_question", "대표질문 1"),
+        (2, "user_answer", "답변"),
+        (3, "feedback", "피드백: 답변"),
+        (4, next_type, question),
+    ]
+    assert row.last_message_seq == 4
+    assert row.state_version == 2
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_openai")
+pytest.importorskip("openai")
+
+from utils.interview import InterviewSession  # noqa: E402
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setattr(InterviewSession, "_init_faiss", lambda self: None)
+    session = InterviewSession("follow-up", pdf_data={"resume_text": "이력서", "recruitUrl": "https://example.com"})
+    session.main_questions = ["q1"]
+    return session
+
+
+def test_follow_up_limit_returns_none_without_appending(session):
+    session.follow_up_questions[0] = [f"fq{i}" for i in range(session.answer_per_question - 1)]
+    assert asyncio.run(session.generate_follow_up("답변")) is None
+    assert len(session.follow_up_questions[0]) == session.answer_per_question - 1
+
+
+def test_follow_up_failure_returns_none(session, monkeypatch):
+    import utils.interview as interview
+
+    async def empty(chain, template_id, inputs):
+        return "   "
+
+    monkeypatch.setattr(interview.llm_cache, "ainvoke", empty)
+    assert asyncio.run(session.generate_follow_up("답변")) is None
+    assert session.follow_up_questions[0] == []
+
+
+def test_stream_follow_up_at_limit_yields_nothing(session):
+    session.follow_up_questions[0] = [f"fq{i}" for i in range(session.answer_per_question - 1)]
+
+    async def collect():
+        return [chunk async for chunk in session.stream_follow_up("답변")]
+
+    assert asyncio.run(collect()) == []
@@ -0,0 +1,118 @@
+import asyncio
+import os
+
+import pytest
+
+from utils.http_fetch import AsyncHttpClient, FetchError, PageCache, PageFetcher, ResponseTooLarge
+
+PAGE = "<html><head><title>채용 공고</title><script>var x;</script></head><body><p>주요 업무</p></body></html>"
+
+
+def make_fetcher(tmp_path, fresh: float = 0, **client_kwargs) -> PageFetcher:
+    client_kwargs.setdefault("allow_private", True)  # 테스트 서버는 127.0.0.1
+    return PageFetcher(AsyncHttpClient(**client_kwargs), PageCache(os.path.join(tmp_path, "fetch.sqlite3")),
+                       fresh=fresh)
+
+
+def fetch_all(fetcher: PageFetcher, *urls):
+    async def main():
+        try:
+            return await asyncio.gather(*(fetcher.fetch(url) for url in urls), return_exceptions=True)
+        finally:
+            await fetcher.client.aclose()
+    return asyncio.run(main())
+
+
+def test_etag_revalidation(http_server, tmp_path):
+    http_server.add("/p", PAGE, etag='"v1"')
+    fetcher = make_fetcher(tmp_path)
+    first, = fetch_all(fetcher, http_server.url("/p"))
+    second, = fetch_all(fetcher, http_server.url("/p"))
+
+    assert first["cache"] == "miss"
+    assert first["title"] == "채용 공고" and "주요 업무" in first["text"] and "var x" not in first["text"]
+    assert second["cache"] == "revalidated" and second["text"] == first["text"]
+    assert http_server.requests[0]["headers"].get("If-None-Match") is None
+    assert http_server.requests[1]["headers"].get("If-None-Match") == '"v1"'
+
+
+def test_last_modified_revalidation_and_change(http_server, tmp_path):
+    http_server.add("/p", PAGE, last_modified=1_700_000_000)
+    fetcher = make_fetcher(tmp_path)
+    fetch_all(fetcher, http_server.url("/p"))
+    revalidated, = fetch_all(fetcher, http_server.url("/p"))
+    assert revalidated["cache"] == "revalidated"
+    assert http_server.requests[1]["headers"].get("If-Modified-Since") == "Tue, 14 Nov 2023 22:13:20 GMT"
+
+    # 내용이 바뀌면 다시 받음
+    http_server.add("/p", PAGE.replace("주요 업무", "자격 요건"), last_modified=1_800_000_000)
+    changed, = fetch_all(fetcher, http_server.url("/p"))
+    assert changed["cache"] == "miss" and "자격 요건" in changed["text"]
+
+
+def test_fresh_window_skips_request(http_server, tmp_path):
+    http_server.add("/p", PAGE, etag='"v1"')
+    fetcher = make_fetcher(tmp_path, fresh=600)
+    fetch_all(fetcher, http_server.url("/p"))
+    cached, = fetch_all(fetcher, http_server.url("/p"))
+    assert cached["cache"] == "fresh"
+    assert http_server.count("/p") == 1
+
+
+def test_response_size_cap(http_server, tmp_path):
+    http_server.add("/big", "x" * 5000)
+    error, = fetch_all(make_fetcher(tmp_path, max_bytes=1000), http_server.url("/big"))
+    assert isinstance(error, ResponseTooLarge)
+    assert error.status_code == 413
+    assert "1,000바이트" in str(error)
+
+
+def test_private_address_rejected_before_request(http_server, tmp_path):
+    http_server.add("/p", PAGE)
+    error, = fetch_all(make_fetcher(tmp_path, allow_private=False), http_server.url("/p"))
+    assert isinstance(error, FetchError)
+    assert error.status_code == 400
+    assert http_server.count("/p") == 0
+
+
+def test_peer_address_checked_after_dns(http_server, tmp_path, monkeypatch):
+    import utils.http_fetch as http_fetch
+
+    # DNS 확인에서는 공인 주소였다가 접속할 때 내부 주소로 바뀐 경우 (DNS rebinding) -> 본문을 읽기 전에 차단
+    http_server.add("/p", PAGE)
+    checks = []
+    real_is_public = http_fetch._is_public
+    monkeypatch.setattr(http_fetch, "_is_public",
+                        lambda address: checks.append(address) or len(checks) == 1 or real_is_public(address))
+    error, = fetch_all(make_fetcher(tmp_path, allow_private=False), http_server.url("/p"))
+    assert isinstance(error, FetchError) and error.status_code == 400
+    assert len(checks) == 2
+
+
+def test_timeout(http_server, tmp_path):
+    http_server.add("/slow", PAGE, delay=1.0)
+    error, = fetch_all(make_fetcher(tmp_path, timeout=0.2), http_server.url("/slow"))
+    assert isinstance(error, FetchError)
+    assert error.status_code == 504
+
+
+def test_concurrent_fetches_share_one_request(http_server, tmp_path):
+    http_server.add("/p", PAGE, delay=0.3)
+    fetcher = make_fetcher(tmp_path)
+    url = http_server.url("/p")
+    pages = fetch_all(fetcher, url, url + "#section", url)
+
+    assert http_server.count("/p") == 1
+    assert all(page["text"] == pages[0]["text"] for page in pages)
+
+
+def test_http_error_status(http_server, tmp_path):
+    http_server.add("/gone", "없음", status=404)
+    error, = fetch_all(make_fetcher(tmp_path), http_server.url("/gone"))
+    assert isinstance(error, FetchError) and error.status_code == 502
+
+
+@pytest.mark.parametrize("url", ["ftp://example.com/file", "not a url"])
+def test_rejects_non_http_urls(tmp_path, url):
+    error, = fetch_all(make_fetcher(tmp_path), url)
+    assert isinstance(error, FetchError) and error.status_code == 400
@@ -0,0 +1,101 @@
+import asyncio
+import os
+
+from utils.llm_cache import LLMCache
+
+
+class FakePrompt:
+    template = "질문: {question}"
+
+    def format(self, **inputs) -> str:
+        return self.template.format(**inputs)
+
+
+class FakeLLM:
+    model_name = "fake-model"
+    temperature = 0
+
+    def __init__(self):
+        self.calls = 0
+
+
+class FakeChain:
+    def __init__(self, answer: str = "응답"):
+        self.prompt = FakePrompt()
+        self.llm = FakeLLM()
+        self.answer = answer
+
+    async def ainvoke(self, inputs: dict) -> dict:
+        self.llm.calls += 1
+        return {"text": self.answer}
+
+
+def make_cache(tmp_path, **kwargs) -> LLMCache:
+    return LLMCache(path=os.path.join(tmp_path, "llm_cache.sqlite3"), **kwargs)
+
+
+def test_ainvoke_hits_cache_for_normalized_input(tmp_path):
+    cache = make_cache(tmp_path)
+    chain = FakeChain()
+
+    async def scenario():
+        first = await cache.ainvoke(chain, "feedback", {"question": "자기소개  해주세요"})
+        second = await cache.ainvoke(chain, "feedback", {"question": " 자기소개 해주세요 "})
+        return first, second
+
+    assert asyncio.run(scenario()) == ("응답", "응답")
+    assert chain.llm.calls == 1
+    assert cache.stats()["templates"]["feedback"] == {"hits": 1, "misses": 1}
+
+
+def test_disabled_template_bypasses_cache(tmp_path):
+    cache = make_cache(tmp_path, disabled_templates=["hint"])
+    chain = FakeChain()
+    for _ in range(2):
+        asyncio.run(cache.ainvoke(chain, "hint", {"question": "q"}))
+    assert chain.llm.calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_expired_entry_is_removed(tmp_path, monkeypatch):
+    import utils.llm_cache as llm_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = make_cache(tmp_path, ttl=60)
+    cache.set("k", "feedback", "값")
+    assert cache.get("k") == "값"
+
+    now[0] += 61
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_evicts_least_recently_used_over_entry_limit(tmp_path, monkeypatch):
+    import utils.llm_cache as llm_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = make_cache(tmp_path, max_entries=10)
+    for i in range(49):
+        now[0] += 1
+        cache.set(f"k{i}", "feedback", "값")
+    now[0] += 1
+    assert cache.get("k0") == "값"  # 가장 먼저 넣었지만 최근에 사용
+
+    # 50번째 쓰기에서 상한의 90%까지 오래 사용하지 않은 것부터 제거
+    now[0] += 1
+    cache.set("k49", "feedback", "값")
+    assert cache.stats()["entries"] == 9
+    assert cache.get("k0") == "값"
+    assert cache.get("k49") == "값"
+    assert cache.get("k1") is None
+
+
+def test_evicts_over_byte_limit(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=1000)
+    for i in range(50):
+        cache.set(f"k{i}", "feedback", "x" * 100)
+    stats = cache.stats()
+    assert stats["bytes"] <= 900
+    assert cache.get("k49") is not None
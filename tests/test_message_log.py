@@ -0,0 +1,95 @@
+from sqlalchemy import select
+
+from db import AsyncSessionLocal, ChatMessageDB, InterviewSessionDB
+from utils.message_log import MessageLog, message_key
+
+
+async def create_session(db) -> InterviewSessionDB:
+    session = InterviewSessionDB(session_token="log", status="in_progress",
+                                 current_main_question_index=0, current_follow_up_index=0)
+    db.add(session)
+    await db.commit()
+    return session
+
+
+def test_message_key():
+    assert message_key("feedback", 2, 1) == "feedback:2:1"
+    assert message_key("main_question", 0) == "main_question:0:0"
+
+
+def test_batch_dedup_within_batch_and_against_stored_rows(db_tables, run):
+    log = MessageLog()
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            session = await create_session(db)
+            batch = log.batch(session.id).add("main_question", "q1", 0).add("main_question", "q1 again", 0)
+            assert await batch.flush(db) == 1
+            await db.commit()
+
+            # 재시도: 이미 저장된 대표질문은 빠지고 새 답변 / 피드백만 저장
+            batch = (log.batch(session.id)
+                     .add("main_question", "q1", 0)
+                     .add("user_answer", "a1", 0)
+                     .add("feedback", "f1", 0))
+            assert await batch.flush(db) == 2
+            await db.commit()
+
+            # 전부 중복이면 아무것도 바꾸지 않음
+            assert await log.batch(session.id).add("feedback", "f1", 0).flush(db) == 0
+            await db.commit()
+
+            await db.refresh(session)
+            rows = (await db.execute(
+                select(ChatMessageDB.seq, ChatMessageDB.message_key, ChatMessageDB.content)
+                .order_by(ChatMessageDB.seq))).all()
+            return session, rows
+
+    session, rows = run(scenario())
+    assert [tuple(row) for row in rows] == [
+        (1, "main_question:0:0", "q1"),
+        (2, "user_answer:0:0", "a1"),
+        (3, "feedback:0:0", "f1"),
+    ]
+    # 요약 컬럼은 실제로 저장된 메시지 기준
+    assert session.last_message_seq == 3
+    assert session.main_question_count == 1
+    assert (session.last_message, session.last_message_type) == ("f1", "feedback")
+    assert log.stats() == {"batches": 2, "rows": 3, "rows_per_batch": 1.5}
+
+
+def test_empty_batch_is_noop(db_tables, run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            session = await create_session(db)
+            return await MessageLog().batch(session.id).flush(db)
+
+    assert run(scenario()) == 0
+
+
+def test_fetch_messages_keyset_pagination(db_tables, run):
+    from routers.chat import fetch_messages
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            session = await create_session(db)
+            # 저장 순서와 seq 순서가 달라도 seq 순서대로 조회
+            for seq in (3, 1, 5, 2, 4):
+                db.add(ChatMessageDB(session_id=session.id, message_type="user_answer", content=f"m{seq}",
+                                     seq=seq, message_key=f"user_answer:0:{seq}"))
+            await db.commit()
+            return [await fetch_messages(db, session.id, after, limit)
+                    for after, limit in ((0, 2), (2, 2), (4, 1), (0, 5), (5, 10), (9, 10))]
+
+    first, second, last, exact, at_end, past_end = run(scenario())
+    assert [m["seq"] for m in first["messages"]] == [1, 2]
+    assert [m["text"] for m in first["messages"]] == ["m1", "m2"]
+    assert (first["next_after"], first["has_more"]) == (2, True)
+    assert [m["seq"] for m in second["messages"]] == [3, 4]
+    assert (second["next_after"], second["has_more"]) == (4, True)
+    # limit + 1번째가 없으면 has_more는 False
+    assert ([m["seq"] for m in last["messages"]], last["next_after"], last["has_more"]) == ([5], 5, False)
+    assert (len(exact["messages"]), exact["has_more"]) == (5, False)
+    # 마지막 메시지 이후 -> 빈 페이지, next_after는 그대로
+    assert at_end == {"messages": [], "next_after": 5, "has_more": False}
+    assert past_end == {"messages": [], "next_after": 9, "has_more": False}
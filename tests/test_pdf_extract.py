@@ -0,0 +1,87 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from benchmarks.pdf_extract import make_pdf
+from utils.pdf_extract import PDFExtractor, WorkerPool, extract_text
+from utils.resume_artifacts import ArtifactTextCache, ResumeArtifactStore
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(2)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_pool_reuses_prewarmed_workers(pool):
+    pids = {worker.process.pid for worker in pool._workers}
+
+    async def scenario():
+        return await asyncio.gather(*(pool.run(os.getpid) for _ in range(6)))
+
+    assert set(asyncio.run(scenario())) <= pids
+    assert pool.start_method != "fork"
+    assert pool.replaced == 0
+
+
+def test_timeout_replaces_only_the_busy_worker(pool):
+    async def scenario():
+        slow = asyncio.ensure_future(pool.run(time.sleep, 30))
+        await asyncio.sleep(0.1)
+        fast = await pool.run(os.getpid)  # 다른 작업자는 계속 사용 가능
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(slow, timeout=0.2)
+        return fast, await asyncio.gather(*(pool.run(os.getpid) for _ in range(4)))
+
+    before = {worker.process.pid for worker in pool._workers}
+    fast, after = asyncio.run(scenario())
+    now = {worker.process.pid for worker in pool._workers}
+
+    assert pool.replaced == 1
+    assert len(now) == 2 and len(before & now) == 1
+    assert fast in before & now
+    assert set(after) <= now
+    assert pool.busy() == 0
+
+
+def test_crashed_worker_is_replaced(pool):
+    async def scenario():
+        with pytest.raises(RuntimeError, match="exit code 3"):
+            await pool.run(os._exit, 3)
+        return await pool.run(sum, [1, 2, 3])
+
+    assert asyncio.run(scenario()) == 6
+    assert pool.replaced == 1
+
+
+def test_worker_exception_is_raised(pool):
+    async def scenario():
+        await pool.run(int, "not a number")
+
+    with pytest.raises(ValueError):
+        asyncio.run(scenario())
+    assert pool.replaced == 0
+
+
+def test_extract_matches_sequential_and_uses_cache(tmp_path):
+    path = os.path.join(tmp_path, "resume.pdf")
+    make_pdf(path, pages=11, lines_per_page=5)
+    extractor = PDFExtractor(workers=2, pages_per_task=2, timeout=60,
+                             cache=ArtifactTextCache(ResumeArtifactStore(os.path.join(tmp_path, "cache"))))
+    try:
+        async def scenario():
+            first = await extractor.extract(path)
+            second = await extractor.extract(path)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+    finally:
+        extractor.shutdown()
+
+    assert first == second == extract_text(path)
+    stats = extractor.stats()
+    assert (stats["extracted"], stats["pages"], stats["replaced_workers"]) == (1, 11, 0)
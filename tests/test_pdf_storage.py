@@ -0,0 +1,79 @@
+import importlib
+import os
+
+import pytest
+
+from routers.pdf_storage import MemoryPDFBackend, PDFStorage, PDFStorageBackend, SQLitePDFBackend
+
+# routers 패키지가 같은 이름의 전역 인스턴스를 내보내므로 모듈은 직접 가져옴
+pdf_storage_module = importlib.import_module("routers.pdf_storage")
+
+
+def data(size: int = 10) -> dict:
+    return {"resume_text": "x" * size, "recruitUrl": "https://example.com"}
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        PDFStorageBackend()
+
+
+def test_memory_lru_by_count():
+    backend = MemoryPDFBackend(ttl=60, max_entries=2, max_bytes=10_000)
+    backend.set("a", data())
+    backend.set("b", data())
+    assert backend.get("a") is not None
+    backend.set("c", data())
+
+    assert sorted(backend.keys()) == ["a", "c"]
+    assert backend.stats()["evictions"] == 1
+
+
+def test_memory_evicts_by_bytes_but_keeps_newest():
+    backend = MemoryPDFBackend(ttl=60, max_entries=10, max_bytes=200)
+    backend.set("a", data(100))
+    backend.set("b", data(100))
+    assert backend.keys() == ["b"]
+    backend.set("big", data(1000))
+    assert backend.keys() == ["big"]
+
+
+def test_memory_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(pdf_storage_module.time, "monotonic", lambda: now[0])
+    backend = MemoryPDFBackend(ttl=30, max_entries=10, max_bytes=10_000)
+    backend.set("a", data())
+    now[0] += 31
+    assert backend.get("a") is None
+    assert backend.size() == 0 and backend.bytes() == 0
+
+
+def test_sqlite_lru_keeps_recently_used(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(pdf_storage_module.time, "time", lambda: now[0])
+    backend = SQLitePDFBackend(path=os.path.join(tmp_path, "pdf.sqlite3"), ttl=3600, max_entries=2,
+                               max_bytes=10_000)
+    for token in ("a", "b"):
+        now[0] += 1
+        backend.set(token, data())
+    now[0] += 1
+    assert backend.get("a") == data()
+    now[0] += 1
+    backend.set("c", data())
+
+    assert sorted(backend.keys()) == ["a", "c"]
+    assert backend.stats()["evictions"] == 1
+
+
+def test_sqlite_ttl_and_shared_file(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(pdf_storage_module.time, "time", lambda: now[0])
+    path = os.path.join(tmp_path, "pdf.sqlite3")
+    writer = PDFStorage(SQLitePDFBackend(path=path, ttl=60))
+    reader = PDFStorage(SQLitePDFBackend(path=path, ttl=60))
+    writer.add_pdf("tok", data())
+    assert reader.get_pdf("tok") == data()
+
+    now[0] += 61
+    assert reader.get_pdf("tok") is None
+    assert writer.backend.size() == 0
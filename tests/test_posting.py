@@ -0,0 +1,136 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from utils.http_fetch import AsyncHttpClient, PageCache, PageFetcher
+from utils.posting import PostingIngestor, PostingStore, summarize_posting
+
+POSTING = """
+로그인
+회원가입
+채용 정보
+Acme Corp
+클라우드 플랫폼을 만드는 팀입니다.
+주요 업무
+쿠버네티스 기반 배포 파이프라인 개발
+쿠버네티스 기반   배포 파이프라인 개발
+자격 요건
+Python 3년 이상
+공유하기
+© 2024 Acme Corp. All rights reserved.
+"""
+PAGE = f"<html><head><title>백엔드 개발자</title></head><body><pre>{POSTING}</pre></body></html>"
+
+
+def test_summarize_drops_boilerplate_and_duplicates():
+    summary = summarize_posting("백엔드 개발자", POSTING, max_chars=1000).splitlines()
+
+    assert summary[0] == "백엔드 개발자"
+    assert summary.count("쿠버네티스 기반 배포 파이프라인 개발") == 1
+    assert not any(word in line for line in summary for word in ("로그인", "회원가입", "공유하기", "©"))
+    assert summary[-1] == "Python 3년 이상"
+
+
+def test_summarize_anchors_on_section_heading():
+    intro = [f"회사 소개 {i}번째 문단입니다" for i in range(10)]
+    text = "\n".join(intro + ["자격 요건", "Go 경험"])
+    summary = summarize_posting("", text, max_chars=1000).splitlines()
+
+    # 소제목 앞의 머리말은 5줄만 남김
+    assert summary == intro[-5:] + ["자격 요건", "Go 경험"]
+
+
+def test_summarize_respects_max_chars():
+    text = "\n".join(f"업무 {i:02d}: 서비스 운영 및 개선" for i in range(50))
+    summary = summarize_posting("제목", text, max_chars=100)
+    assert 0 < len(summary) <= 100
+    assert summary.endswith("서비스 운영 및 개선")  # 줄 단위로 자름
+
+    # 첫 줄부터 길면 그 줄을 잘라서라도 반환
+    assert summarize_posting("", "가" * 500, max_chars=50) == "가" * 50
+
+
+@pytest.fixture
+def ingestor(tmp_path):
+    fetcher = PageFetcher(AsyncHttpClient(allow_private=True), PageCache(os.path.join(tmp_path, "fetch.sqlite3")),
+                          fresh=0)
+    return PostingIngestor(fetcher, PostingStore(os.path.join(tmp_path, "postings.sqlite3")), max_chars=1000)
+
+
+def run(ingestor, coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await ingestor.aclose()
+            await ingestor.fetcher.client.aclose()
+    return asyncio.run(main())
+
+
+def test_start_runs_one_task_per_url(http_server, ingestor):
+    http_server.add("/job", PAGE, delay=0.3)
+    url = http_server.url("/job")
+
+    async def scenario():
+        tasks = [ingestor.start(url), ingestor.start(url + "#apply"), ingestor.start(url)]
+        entry = await tasks[0]
+        again = await ingestor.start(url)  # 저장된 요약 사용
+        return tasks, entry, again
+
+    tasks, entry, again = run(ingestor, scenario())
+    assert tasks[0] is tasks[1] is tasks[2]
+    assert http_server.count("/job") == 1
+    assert entry["status"] == "ready" and entry["summary"].startswith("백엔드 개발자")
+    assert again["summary"] == entry["summary"]
+    assert ingestor.started == 1 and ingestor.ready == 1
+
+
+def test_start_ignores_non_url(ingestor):
+    async def scenario():
+        return ingestor.start("백엔드 개발자 채용 공고 내용")
+
+    assert run(ingestor, scenario()) is None
+
+
+def test_lookup_does_not_wait_for_pending_fetch(http_server, ingestor):
+    http_server.add("/job", PAGE, delay=1.0)
+    url = http_server.url("/job")
+
+    async def scenario():
+        started = time.perf_counter()
+        # 시작된 적 없는 URL -> 작업만 시작하고 바로 빈 문자열
+        first = await ingestor.lookup(url)
+        second = await ingestor.lookup(url)
+        elapsed = time.perf_counter() - started
+        await ingestor.start(url)  # 진행 중인 작업을 그대로 돌려받음
+        return first, second, elapsed, await ingestor.lookup(url)
+
+    first, second, elapsed, ready = run(ingestor, scenario())
+    assert first == second == ""
+    assert elapsed < 0.5
+    assert ready.startswith("백엔드 개발자")
+    assert ingestor.lookups == {"ready": 1, "pending": 2, "missing": 0, "text": 0}
+    assert http_server.count("/job") == 1
+
+
+def test_lookup_missing_after_failed_fetch(http_server, ingestor):
+    http_server.add("/gone", "없음", status=404)
+    url = http_server.url("/gone")
+
+    async def scenario():
+        entry = await ingestor.start(url)
+        return entry, await ingestor.lookup(url)
+
+    entry, summary = run(ingestor, scenario())
+    assert entry["status"] == "failed"
+    assert summary == ""
+    assert ingestor.lookups["missing"] == 1
+    assert http_server.count("/gone") == 1  # 실패도 기록해 두고 다시 요청하지 않음
+
+
+def test_lookup_summarizes_pasted_text(ingestor):
+    summary = run(ingestor, ingestor.lookup(POSTING))
+    assert "Python 3년 이상" in summary and "로그인" not in summary
+    assert ingestor.lookups["text"] == 1
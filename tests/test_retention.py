@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from db import AsyncSessionLocal, ChatMessageDB, InterviewSessionDB
+from utils.retention import RetentionWorker
+from utils.session_cache import session_store
+
+
+async def seed(sessions):
+    """[(토큰, 생성 후 지난 시간(시간), 상태, 메시지 수)]"""
+    async with AsyncSessionLocal() as db:
+        for token, age_hours, status, messages in sessions:
+            session = InterviewSessionDB(session_token=token, status=status, current_main_question_index=0,
+                                         current_follow_up_index=0,
+                                         created_at=datetime.utcnow() - timedelta(hours=age_hours))
+            db.add(session)
+            await db.flush()
+            for i in range(messages):
+                db.add(ChatMessageDB(session_id=session.id, message_type="user_answer", content=f"a{i}",
+                                     seq=i + 1, message_key=f"user_answer:0:{i}"))
+        await db.commit()
+
+
+async def remaining():
+    async with AsyncSessionLocal() as db:
+        tokens = (await db.scalars(
+            select(InterviewSessionDB.session_token).order_by(InterviewSessionDB.id))).all()
+        messages = await db.scalar(select(func.count()).select_from(ChatMessageDB))
+        return tokens, messages
+
+
+def test_deletes_old_sessions_in_chunks(db_tables, run):
+    worker = RetentionWorker(max_age_hours=24, chunk_size=2, time_budget=10, enabled=False)
+    session_store.put("old-1", object())
+
+    async def scenario():
+        await seed([("old-1", 48, "in_progress", 3), ("old-2", 30, "completed", 2), ("old-3", 25, "in_progress", 1),
+                    ("new", 1, "in_progress", 4)])
+        result = await worker.run_once()
+        return result, await remaining()
+
+    result, (tokens, messages) = run(scenario())
+    assert tokens == ["new"]
+    assert messages == 4
+    assert (result["sessions"], result["messages"], result["chunks"], result["finished"]) == (3, 6, 2, True)
+    assert "old-1" not in session_store
+
+
+def test_include_completed(db_tables, run):
+    worker = RetentionWorker(max_age_hours=24, chunk_size=10, time_budget=10, enabled=False)
+
+    async def scenario():
+        await seed([("done", 1, "completed", 2), ("active", 1, "in_progress", 1)])
+        await worker.run_once()
+        kept = await remaining()
+        await worker.run_once(include_completed=True)
+        return kept, await remaining()
+
+    kept, after = run(scenario())
+    assert kept == (["done", "active"], 3)
+    assert after == (["active"], 1)
+
+
+def test_time_budget_leaves_rest_for_next_run(db_tables, run):
+    worker = RetentionWorker(max_age_hours=24, chunk_size=1, time_budget=0, enabled=False)
+
+    async def scenario():
+        await seed([("old-1", 48, "in_progress", 1), ("old-2", 48, "in_progress", 1)])
+        result = await worker.run_once()
+        return result, await remaining()
+
+    result, (tokens, _) = run(scenario())
+    assert result["finished"] is False
+    assert tokens == ["old-1", "old-2"]
@@ -0,0 +1,105 @@
+import os
+
+import faiss
+import numpy as np
+import pytest
+
+from utils.bm25 import BM25Index, build_bm25, tokenize
+from utils.faiss_store import IndexHandle
+from utils.qa_store import QAMappingStore, QAMappingWriter
+from utils.retrieval import HybridRetriever, fuse
+
+QUESTIONS = [
+    "자기소개를 해주세요",
+    "프로젝트에서 맡은 역할은 무엇인가요",
+    "협업 중 갈등을 해결한 경험이 있나요",
+    "kubernetes로 서비스를 배포해 본 경험이 있나요",
+]
+
+
+def test_tokenize_korean_bigrams_and_symbols():
+    assert tokenize("배포 경험 C++ node.js") == ["배포", "경험", "c++", "node.js"]
+
+
+def test_fuse_rrf_rewards_documents_in_both_lists():
+    dense_ids, dense_scores = np.array([1, 2, 3]), np.array([0.9, 0.8, 0.7])
+    lexical_ids, lexical_scores = np.array([3, 4]), np.array([5.0, 4.0])
+    top = fuse(dense_ids, dense_scores, lexical_ids, lexical_scores, k=4, method="rrf", rrf_k=60)
+
+    ids = [doc_id for doc_id, _ in top]
+    assert ids[0] == 3  # 두 목록에 모두 있는 문서
+    assert set(ids) == {1, 2, 3, 4}
+    assert top[0][1] == pytest.approx(1 / 63 + 1 / 61)
+
+
+def test_fuse_linear_uses_normalized_scores():
+    dense_ids, dense_scores = np.array([1, 2]), np.array([0.9, 0.1])
+    lexical_ids, lexical_scores = np.array([2, 3]), np.array([10.0, 1.0])
+    top = dict(fuse(dense_ids, dense_scores, lexical_ids, lexical_scores, k=3, method="linear", alpha=0.25))
+
+    assert top[1] == pytest.approx(0.25)
+    assert top[2] == pytest.approx(0.75)
+    assert top[3] == pytest.approx(0.0)
+
+
+def test_fuse_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        fuse(np.array([1]), np.array([1.0]), np.array([1]), np.array([1.0]), k=1, method="max")
+
+
+def test_bm25_search_ranks_keyword_match(tmp_path):
+    path = os.path.join(tmp_path, "qa.bm25.npz")
+    assert build_bm25(QUESTIONS, path) == len(QUESTIONS)
+    ids, scores, terms = BM25Index(path).search("쿠버네티스 대신 kubernetes 배포", k=2)
+
+    assert ids.tolist() == [3]
+    assert scores[0] > 0
+    assert "kubernetes" in terms
+
+
+class FakeIndexes:
+    def __init__(self, handle):
+        self.handle = handle
+
+    def get(self, name):
+        return self.handle
+
+
+@pytest.fixture
+def retriever(tmp_path, monkeypatch):
+    mapping_path = os.path.join(tmp_path, "qa.qa")
+    writer = QAMappingWriter(mapping_path)
+    for question in QUESTIONS:
+        writer.add({"question": question, "answer": ""})
+    writer.close()
+
+    # 질의 벡터는 0번 문서와 가장 가깝고 3번(kubernetes) 문서와는 가장 멂
+    vectors = np.eye(len(QUESTIONS), dtype="float32")
+    index = faiss.IndexFlatIP(len(QUESTIONS))
+    index.add(vectors)
+    handle = IndexHandle("jobkorea", index, QAMappingStore(mapping_path), version=1, mmapped=False)
+    monkeypatch.setattr("utils.retrieval.faiss_indexes", FakeIndexes(handle))
+    return lambda mode: HybridRetriever(bm25_path=os.path.join(tmp_path, "qa.bm25.npz"), mode=mode,
+                                        fusion="rrf", candidates=2)
+
+
+QUERY = np.array([[1.0, 0.5, 0.2, 0.0]], dtype="float32")
+
+
+def test_hybrid_adds_keyword_only_match(retriever):
+    questions, diagnostics = retriever("hybrid").retrieve(QUERY, "kubernetes 배포 경험", k=3)
+
+    # 2번은 두 목록에 모두 있어서 1위, 3번은 키워드 검색으로만 찾아서 상위 3개에 들어옴
+    assert questions[0] == QUESTIONS[2]
+    assert set(questions) == {QUESTIONS[0], QUESTIONS[2], QUESTIONS[3]}
+    assert diagnostics["mode"] == "hybrid"
+    assert diagnostics["from_lexical_only"] == 1
+    assert diagnostics["from_both"] == 1
+
+
+def test_dense_mode_ignores_bm25(retriever):
+    questions, diagnostics = retriever("dense").retrieve(QUERY, "kubernetes 배포 경험", k=3)
+
+    assert questions == [QUESTIONS[0], QUESTIONS[1], QUESTIONS[2]]
+    assert diagnostics["mode"] == "dense"
+    assert diagnostics["lexical_candidates"] == 0
@@ -0,0 +1,65 @@
+from utils.session_cache import SessionCache
+
+
+class FakeSession:
+    def __init__(self, size: int = 10):
+        self.size = size
+
+    def approx_size(self) -> int:
+        return self.size
+
+
+def test_lru_eviction_by_count():
+    cache = SessionCache(max_entries=2, ttl=60, max_bytes=10_000)
+    removed = []
+    cache.on_remove(removed.append)
+    cache.put("a", FakeSession())
+    cache.put("b", FakeSession())
+    assert cache.get("a") is not None  # a를 최근 사용으로
+    cache.put("c", FakeSession())
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert removed == ["b"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_eviction_by_bytes_keeps_newest():
+    cache = SessionCache(max_entries=10, ttl=60, max_bytes=100)
+    cache.put("a", FakeSession(60))
+    cache.put("b", FakeSession(60))
+    assert "a" not in cache
+    assert cache.stats()["bytes"] == 60
+
+    # 상한보다 큰 세션도 방금 넣은 것 하나는 남김
+    cache.put("big", FakeSession(500))
+    assert len(cache) == 1 and "big" in cache
+
+
+def test_idle_ttl_expiration(monkeypatch):
+    import utils.session_cache as session_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(session_cache.time, "monotonic", lambda: now[0])
+    cache = SessionCache(max_entries=10, ttl=30, max_bytes=10_000)
+    removed = []
+    cache.on_remove(removed.append)
+    cache.put("a", FakeSession())
+    now[0] += 31
+
+    assert cache.get("a") is None
+    assert removed == ["a"]
+    assert cache.stats()["expirations"] == 1
+
+
+def test_put_replaces_without_notify():
+    cache = SessionCache(max_entries=10, ttl=60, max_bytes=10_000)
+    removed = []
+    cache.on_remove(removed.append)
+    cache.put("a", FakeSession(10))
+    cache.put("a", FakeSession(20))
+
+    assert removed == []
+    assert cache.stats()["bytes"] == 20
+    assert cache.pop("a").size == 20
+    assert removed == ["a"]
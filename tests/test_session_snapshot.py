@@ -0,0 +1,118 @@
+import json
+import zlib
+
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_openai")
+pytest.importorskip("openai")
+
+from utils.interview import InterviewSession, SNAPSHOT_FORMAT  # noqa: E402
+from utils.resume_artifacts import resume_artifacts  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_faiss(monkeypatch):
+    # 테스트에는 jobkorea 인덱스 파일이 없음
+    monkeypatch.setattr(InterviewSession, "_init_faiss", lambda self: None)
+
+
+def make_session(token="tok", resume="이력서 본문", resume_hash="hash-1"):
+    return InterviewSession(token, pdf_data={"resume_text": resume, "recruitUrl": "https://example.com/job",
+                                             "resume_hash": resume_hash, "posting": "공고 요약"})
+
+
+def decode(snapshot: bytes) -> dict:
+    return json.loads(zlib.decompress(snapshot[1:]).decode("utf-8"))
+
+
+def test_snapshot_round_trip_without_resume_text():
+    resume_artifacts.put("hash-1", "text", "이력서 본문", "text")
+    session = make_session()
+    session.main_questions = ["q1", "q2"]
+    session.answers[0] = ["a1"]
+    session.feedbacks[0] = ["f1"]
+    session.follow_up_questions[0] = ["fq1"]
+    session.current_main, session.current_follow_up = 0, 1
+
+    snapshot = session.to_snapshot()
+    assert snapshot[0] == SNAPSHOT_FORMAT
+    assert "resume" not in decode(snapshot)
+
+    restored = InterviewSession.from_snapshot("tok", snapshot)
+    assert restored.resume == "이력서 본문"
+    assert restored.posting == "공고 요약"
+    assert restored.main_questions == ["q1", "q2"]
+    assert restored.answers[0] == ["a1"] and restored.feedbacks[0] == ["f1"]
+    assert restored.follow_up_questions[0] == ["fq1"]
+    assert (restored.current_main, restored.current_follow_up) == (0, 1)
+
+
+def test_snapshot_falls_back_to_pdf_storage(monkeypatch):
+    from routers.pdf_storage import pdf_storage
+
+    pdf_storage.add_pdf("tok-2", {"resume_text": "업로드 원문", "recruitUrl": "https://example.com/job"})
+    session = make_session(token="tok-2", resume="업로드 원문", resume_hash="hash-missing")
+    restored = InterviewSession.from_snapshot("tok-2", session.to_snapshot())
+    assert restored.resume == "업로드 원문"
+
+
+def test_snapshot_without_hash_keeps_resume():
+    session = make_session(resume_hash=None)
+    snapshot = session.to_snapshot()
+    assert decode(snapshot)["resume"] == "이력서 본문"
+    assert InterviewSession.from_snapshot("unknown", snapshot).resume == "이력서 본문"
+
+
+def test_reads_format_1_and_rejects_unknown():
+    session = make_session(resume_hash=None)
+    payload = session.to_snapshot()[1:]
+    assert InterviewSession.from_snapshot("tok", bytes([1]) + payload).resume == "이력서 본문"
+    assert InterviewSession.from_snapshot("tok", bytes([99]) + payload) is None
+    assert InterviewSession.from_snapshot("tok", bytes([SNAPSHOT_FORMAT]) + b"broken") is None
+
+
+def test_concurrent_turns_keep_both_answers(db_tables, run):
+    import routers.chat as chat
+    from db import AsyncSessionLocal, InterviewSessionDB, ChatMessageDB
+    from routers.pdf_storage import pdf_storage
+    from sqlalchemy import select
+
+    pdf_storage.add_pdf("cas", {"resume_text": "이력서", "recruitUrl": "https://example.com/job"})
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            row = InterviewSessionDB(session_token="cas", status="in_progress",
+                                     current_main_question_index=0, current_follow_up_index=0)
+            db.add(row)
+            await db.commit()
+            session = InterviewSession("cas")
+            session.main_questions = ["q1", "q2", "q3", "q4", "q5"]
+            session.main_questions_complete = True
+            await chat.commit_turn(db, row, session, [("main_question", "q1", 0)])
+            session_id = row.id
+
+        # 두 워커가 같은 버전을 읽은 뒤 각자 답변을 저장
+        async with AsyncSessionLocal() as db1, AsyncSessionLocal() as db2:
+            row1 = await db1.get(InterviewSessionDB, session_id)
+            row2 = await db2.get(InterviewSessionDB, session_id)
+            worker1 = await chat.load_interview_session(db1, row1)
+            worker2 = await chat.load_interview_session(db2, row2)
+            for db, row, worker, answer in ((db1, row1, worker1, "A"), (db2, row2, worker2, "B")):
+                worker.answers[0].append(answer)
+                worker.feedbacks[0].append(f"fb {answer}")
+                await chat.commit_turn(db, row, worker, chat.answer_messages(0, answer, f"fb {answer}"))
+
+        async with AsyncSessionLocal() as db:
+            keys = (await db.scalars(select(ChatMessageDB.message_key).order_by(ChatMessageDB.seq))).all()
+            row = await db.get(InterviewSessionDB, session_id)
+            # 오래된 캐시는 DB 버전이 더 높으면 버리고 다시 복원
+            chat.session_store.put("cas", worker1)
+            fresh = await chat.get_interview_session(db, row)
+            return keys, row.state_version, fresh, worker1
+
+    keys, version, fresh, stale = run(scenario())
+    assert keys == ["main_question:0:0", "user_answer:0:0", "feedback:0:0", "user_answer:0:1", "feedback:0:1"]
+    assert version == 3
+    assert fresh is not stale
+    assert fresh.answers[0] == ["A", "B"]
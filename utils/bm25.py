@@ -0,0 +1,191 @@
+# QA 매핑 질문에 대한 BM25 역색인
+# 형태소 분석기 없이 한글은 음절 bigram, 영문 / 숫자는 단어 단위(c++, node.js 같은 기호 포함)로 토큰화한다.
+# 역색인은 CSR 배열(단어별 문서 id / 출현 횟수)로 .npz 파일에 미리 저장해 두고,
+# 검색할 때는 질의 단어 중 idf가 높은 것만 골라서 numpy로 점수를 누적한다. (질의 당 수 ms)
+#
+# 실행: python -m utils.bm25 <faiss_qa_mapping.qa> [출력 경로]
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from array import array
+from collections import Counter, defaultdict
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import BM25_K1, BM25_B, BM25_MAX_QUERY_TERMS, FAISS_RELOAD_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+BM25_FORMAT = 1
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+def tokenize(text: str) -> List[str]:
+    """한글 단어 -> 음절 bigram (한 글자 단어는 그대로), 영문 / 숫자 -> 소문자 단어"""
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text.lower()):
+        if "가" <= word[0] <= "힣" and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def build_bm25(texts: Iterable[str], out_path: str) -> int:
+    """문서(질문) 목록으로 역색인을 만들어 저장하고 문서 수 반환 (임시 파일에 쓴 뒤 교체)"""
+    postings = defaultdict(lambda: (array("I"), array("H")))  # 단어 -> (문서 id, 출현 횟수)
+    doc_lengths = array("I")
+    for doc_id, text in enumerate(texts):
+        counts = Counter(tokenize(text))
+        doc_lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            ids, tfs = postings[term]
+            ids.append(doc_id)
+            tfs.append(min(tf, 65535))
+
+    vocab = sorted(postings)
+    offsets = np.zeros(len(vocab) + 1, dtype=np.uint64)
+    offsets[1:] = np.cumsum([len(postings[term][0]) for term in vocab])
+    doc_ids = np.concatenate([np.frombuffer(postings[t][0], dtype=np.uint32) for t in vocab]) if vocab \
+        else np.zeros(0, dtype=np.uint32)
+    tfs = np.concatenate([np.frombuffer(postings[t][1], dtype=np.uint16) for t in vocab]) if vocab \
+        else np.zeros(0, dtype=np.uint16)
+
+    tmp_path = f"{out_path}.tmp.npz"
+    np.savez(tmp_path, format=np.array([BM25_FORMAT]), vocab=np.array(vocab, dtype=np.str_), offsets=offsets,
+             doc_ids=doc_ids, tfs=tfs, doc_lengths=np.frombuffer(doc_lengths, dtype=np.uint32))
+    os.replace(tmp_path, out_path)
+    return len(doc_lengths)
+
+
+class BM25Index:
+    """메모리에 올린 BM25 역색인"""
+
+    def __init__(self, path: str, k1: float = BM25_K1, b: float = BM25_B,
+                 max_query_terms: int = BM25_MAX_QUERY_TERMS):
+        with np.load(path) as data:
+            if int(data["format"][0]) != BM25_FORMAT:
+                raise ValueError(f"지원하지 않는 BM25 색인 형식입니다: {path}")
+            vocab = data["vocab"]
+            self._offsets = data["offsets"].astype(np.int64)
+            self._doc_ids = data["doc_ids"]
+            self._tfs = data["tfs"].astype(np.float32)
+            doc_lengths = data["doc_lengths"].astype(np.float32)
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.max_query_terms = max_query_terms
+        self.count = len(doc_lengths)
+        self.vocab_size = len(vocab)
+        self._terms = {term: i for i, term in enumerate(vocab.tolist())}
+        df = np.diff(self._offsets).astype(np.float32)
+        self._idf = np.log1p((self.count - df + 0.5) / (df + 0.5)).astype(np.float32)
+        # 문서 길이 정규화 항은 문서마다 고정이므로 미리 계산
+        avgdl = float(doc_lengths.mean()) if self.count else 1.0
+        self._norm = (k1 * (1 - b + b * doc_lengths / max(avgdl, 1e-6))).astype(np.float32)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def query_terms(self, text: str) -> List[str]:
+        """색인에 있는 질의 단어 중 idf가 높은 순으로 max_query_terms개"""
+        terms = [t for t in set(tokenize(text)) if t in self._terms]
+        terms.sort(key=lambda t: self._idf[self._terms[t]], reverse=True)
+        return terms[:self.max_query_terms]
+
+    def search(self, text: str, k: int) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """(문서 id, 점수, 사용한 질의 단어) 점수 내림차순, 점수 0인 문서는 제외"""
+        terms = self.query_terms(text)
+        if not terms or not self.count:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32), terms
+        scores = np.zeros(self.count, dtype=np.float32)
+        for term in terms:
+            t = self._terms[term]
+            start, end = self._offsets[t], self._offsets[t + 1]
+            ids = self._doc_ids[start:end]
+            tf = self._tfs[start:end]
+            # 단어마다 문서 id가 한 번씩만 나오므로 fancy index로 바로 누적
+            scores[ids] += self._idf[t] * tf * (self.k1 + 1) / (tf + self._norm[ids])
+        k = min(k, self.count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        top = top[scores[top] > 0]
+        return top.astype(np.int64), scores[top], terms
+
+
+class BM25Store:
+    """파일이 바뀌면 다시 읽는 BM25 색인 (없으면 QA 매핑으로 한 번 만들어서 저장)"""
+
+    def __init__(self, path: str, check_interval: float = FAISS_RELOAD_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._index: Optional[BM25Index] = None
+        self._signature = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def get(self, mapping=None) -> Optional[BM25Index]:
+        """현재 색인 (mapping: 색인이 없을 때 만들 QA 매핑, 문서 수가 다르면 None)"""
+        now = time.monotonic()
+        if self._index is None or now - self._last_check >= self.check_interval:
+            with self._lock:
+                if self._index is None or now - self._last_check >= self.check_interval:
+                    self._last_check = now
+                    try:
+                        self._maybe_reload(mapping)
+                    except Exception as e:
+                        logger.error(f"BM25 색인 로드 실패: {str(e)}")
+        index = self._index
+        if index is None or (mapping is not None and len(mapping) != index.count):
+            return None
+        return index
+
+    def _maybe_reload(self, mapping):
+        if not os.path.exists(self.path):
+            if mapping is None:
+                return
+            start = time.perf_counter()
+            count = build_bm25((mapping.get(i) for i in range(len(mapping))), self.path)
+            logger.info(f"✅ BM25 색인 생성 완료 ({count}개, {time.perf_counter() - start:.2f}s): {self.path}")
+        st = os.stat(self.path)
+        signature = (st.st_mtime_ns, st.st_size)
+        if self._index is not None and signature == self._signature:
+            return
+        index = BM25Index(self.path)
+        if mapping is not None and len(mapping) != index.count:
+            logger.warning(f"BM25 색인 문서 수({index.count})가 QA 매핑({len(mapping)})과 달라 사용하지 않습니다.")
+        if self._index is not None:
+            self.reloads += 1
+        self._index, self._signature = index, signature
+        logger.info(f"✅ BM25 색인 로드 완료 ({index.count}개, 단어 {index.vocab_size}개)")
+
+    @property
+    def signature(self):
+        return self._signature
+
+    def stats(self) -> dict:
+        index = self._index
+        return {
+            "path": self.path,
+            "loaded": index is not None,
+            "documents": index.count if index else None,
+            "vocab_size": index.vocab_size if index else None,
+            "reloads": self.reloads,
+        }
+
+
+# 실행: python -m utils.bm25 <faiss_qa_mapping.qa> [출력 경로]
+if __name__ == "__main__":
+    from utils.qa_store import QAMappingStore
+    if len(sys.argv) < 2:
+        print("사용법: python -m utils.bm25 <faiss_qa_mapping.qa> [출력 경로]")
+        sys.exit(1)
+    qa = QAMappingStore(sys.argv[1])
+    dst = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(sys.argv[1])[0] + ".bm25.npz"
+    total = build_bm25((qa.get(i) for i in range(len(qa))), dst)
+    print(f"✅ {total}개 질문 BM25 색인 완료: {dst}")
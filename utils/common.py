@@ -28,11 +28,8 @@ def clean_files():
 
 # 이력서(PDF)에서 텍스트 추출하는 함수
 def load_pdf_to_text(pdf_path):
-    text = ""
     reader = PdfReader(pdf_path)
-    for page in reader.pages:
-        text += page.extract_text()
-    return text
+    return "".join(page.extract_text() for page in reader.pages)
 
 # 추출한 텍스트 요약하는 함수
 def summarize_text(text, max_length=1000):
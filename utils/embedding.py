@@ -0,0 +1,166 @@
+# 임베딩 모델 레지스트리
+# 모델은 프로세스 당 한 번만 로드하고, 여러 요청에서 동시에 들어온 encode 호출을
+# 하나의 배치로 묶어서 forward pass 한 번으로 처리한다.
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+
+import numpy as np
+
+from config import JOBKOREA_EMBED_MODEL, YOUTUBE_EMBED_MODEL, EMBED_MAX_BATCH_SIZE, EMBED_MAX_WAIT_MS
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedEncoder:
+    """SentenceTransformer 모델 하나와 마이크로 배치 큐를 관리하는 클래스"""
+
+    def __init__(self, name: str, model_name: str, max_batch_size: int = EMBED_MAX_BATCH_SIZE,
+                 max_wait_ms: float = EMBED_MAX_WAIT_MS):
+        self.name = name
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._queue = None
+        self._worker = None
+        self._loop = None
+
+        # 통계
+        self._batches = 0
+        self._items = 0
+        self._requests = 0
+        self._max_batch = 0
+        self._recent_batch_sizes = deque(maxlen=100)
+        self._total_encode_time = 0.0
+
+    @property
+    def model(self):
+        """모델을 한 번만 로드해서 반환"""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    start = time.perf_counter()
+                    self._model = SentenceTransformer(self.model_name)
+                    logger.info(f"✅ 임베딩 모델 로드 완료 - {self.name} ({self.model_name}, {time.perf_counter() - start:.2f}s)")
+        return self._model
+
+    def encode_sync(self, texts: List[str]) -> np.ndarray:
+        """배치 큐를 거치지 않고 바로 인코딩 (오프라인 작업용)"""
+        return np.asarray(self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False), dtype="float32")
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """다른 요청과 묶어서 인코딩하고 입력 순서대로 벡터를 반환"""
+        if not texts:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype="float32")
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((list(texts), future))
+        return await future
+
+    async def _run(self):
+        while True:
+            first = await self._queue.get()
+            pending = [first]
+            size = len(first[0])
+            deadline = time.monotonic() + self.max_wait
+
+            # max_batch_size 또는 max_wait 중 먼저 도달할 때까지 요청을 모음
+            while size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            texts = [text for item in pending for text in item[0]]
+            try:
+                start = time.perf_counter()
+                vectors = await asyncio.to_thread(self.encode_sync, texts)
+                self._record(len(pending), len(texts), time.perf_counter() - start)
+            except Exception as e:
+                logger.error(f"임베딩 배치 처리 실패 - {self.name}: {str(e)}")
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for batch_texts, future in pending:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(batch_texts)])
+                offset += len(batch_texts)
+
+    def _record(self, requests: int, items: int, elapsed: float):
+        self._batches += 1
+        self._requests += requests
+        self._items += items
+        self._max_batch = max(self._max_batch, items)
+        self._recent_batch_sizes.append(items)
+        self._total_encode_time += elapsed
+
+    def stats(self) -> dict:
+        recent = list(self._recent_batch_sizes)
+        return {
+            "model": self.model_name,
+            "loaded": self._model is not None,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "batches": self._batches,
+            "requests": self._requests,
+            "items": self._items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0,
+            "recent_avg_batch_size": round(sum(recent) / len(recent), 2) if recent else 0,
+            "max_batch_size_seen": self._max_batch,
+            "avg_encode_ms": round(self._total_encode_time / self._batches * 1000, 2) if self._batches else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+class EmbeddingRegistry:
+    """이름으로 임베딩 모델을 조회하는 프로세스 전역 레지스트리"""
+
+    def __init__(self):
+        self._encoders: Dict[str, BatchedEncoder] = {}
+
+    def register(self, name: str, model_name: str, **kwargs):
+        self._encoders[name] = BatchedEncoder(name, model_name, **kwargs)
+
+    def get(self, name: str) -> BatchedEncoder:
+        encoder = self._encoders.get(name)
+        if encoder is None:
+            raise KeyError(f"등록되지 않은 임베딩 모델입니다: {name}")
+        return encoder
+
+    def load_all(self):
+        """서버 시작 시 등록된 모든 모델을 미리 로드"""
+        for encoder in self._encoders.values():
+            encoder.model
+
+    async def encode(self, name: str, texts: List[str]) -> np.ndarray:
+        return await self.get(name).encode(texts)
+
+    def stats(self) -> dict:
+        return {name: encoder.stats() for name, encoder in self._encoders.items()}
+
+
+# 전역 인스턴스 생성
+embedding_registry = EmbeddingRegistry()
+embedding_registry.register("jobkorea", JOBKOREA_EMBED_MODEL)
+embedding_registry.register("youtube", YOUTUBE_EMBED_MODEL)
@@ -1,11 +1,10 @@
 # 안쓰는 일회성 파일입니다. 주석 해제하지 마세요
+# (영상 자막 추출용. YouTube FAISS 인덱스는 python -m utils.index_build youtube 로 빌드)
 # import os
 # import json
 # import yt_dlp
 # import whisper
-# from sentence_transformers import SentenceTransformer
 # import asyncio
-# import faiss
 
 # # youtube_data.json 경로 설정
 # YOUTUBE_DATA_PATH = os.path.join(os.path.dirname(__file__), "youtube_data.json")
@@ -79,38 +78,12 @@
 #         else:
 #             print(f"❌ {video['title']} 텍스트 변환 실패")
 
-# # 비디오 텍스트 -> 벡터 DB
-# async def vectorize_and_save():
-#     print("🔍 FAISS 벡터화 시작...")
-    
-#     model = SentenceTransformer('all-MiniLM-L6-v2')
-#     video_texts = [video["text"] for video in youtube_data if "text" in video]  # 변환된 텍스트 리스트
-    
-#     if not video_texts:
-#         print("❌ 변환된 텍스트가 없습니다. 벡터화를 중단합니다.")
-#         return
-
-#     embeddings = model.encode(video_texts, convert_to_numpy=True)  # 벡터화
-
-#     # FAISS 벡터 데이터베이스 생성 및 삽입
-#     d = embeddings.shape[1]
-#     index = faiss.IndexFlatL2(d)
-#     index.add(embeddings)
-
-#     # FAISS 인덱스를 파일로 저장
-#     faiss_path = os.path.join(os.path.dirname(__file__), "youtube.faiss")
-#     faiss.write_index(index, faiss_path)
-#     print(f"✅ FAISS 인덱스 저장 완료: {faiss_path}")
-
 # async def main():
 #     print("🎬 YouTube 영상 처리 시작...")
 
 #     # 1단계: 오디오 다운로드 및 텍스트 변환
 #     await process_videos()
 
-#     # 2단계: FAISS 인덱스 생성 및 저장
-#     await vectorize_and_save()
-
 #     print("🎉 모든 작업 완료!")
 
 # # 실행
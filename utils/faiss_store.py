@@ -0,0 +1,304 @@
+# FAISS 인덱스 관리자
+# 각 인덱스를 프로세스 당 한 번만 (가능하면 mmap으로) 열고, 파일이 바뀌면 새 인덱스를 다 읽은 뒤
+# 참조만 교체하는 방식으로 원자적으로 다시 로드한다. 사용하는 쪽에는 검색만 가능한 핸들을 넘겨준다.
+# 서버에서는 파일 확인 / 재로드를 백그라운드 감시 작업(start_watcher)이 스레드에서 하므로 get()은 현재 핸들만 반환한다.
+# 인덱스 파일 옆에 매니페스트(python -m utils.index_build 가 생성)가 있으면 로드할 때
+# 모델 / 차원 / 벡터 수 / 파일 크기가 맞는지 확인하고, 맞지 않으면 그 인덱스는 사용하지 않는다.
+import asyncio
+import os
+import json
+import hashlib
+import threading
+import time
+import logging
+from typing import Dict, Optional
+
+import faiss
+import numpy as np
+
+from config import (FAISS_RELOAD_INTERVAL, FAISS_REQUIRE_MANIFEST, FAISS_NPROBE, JOBKOREA_EMBED_MODEL,
+                    YOUTUBE_EMBED_MODEL)
+from utils.qa_store import load_mapping, convert_pickle
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOBKOREA_INDEX_PATH = os.path.join(BASE_DIR, "faiss_index.jobkorea")
+JOBKOREA_MAPPING_PATH = os.path.join(BASE_DIR, "faiss_qa_mapping.qa")
+JOBKOREA_LEGACY_MAPPING_PATH = os.path.join(BASE_DIR, "faiss_qa_mapping.pkl")
+JOBKOREA_BM25_PATH = os.path.join(BASE_DIR, "faiss_qa_mapping.bm25.npz")
+YOUTUBE_INDEX_PATH = os.path.join(BASE_DIR, "youtube.faiss")
+
+MANIFEST_FORMAT = 1
+
+
+class IndexManifestError(ValueError):
+    """인덱스 파일과 매니페스트 내용이 맞지 않음"""
+
+
+def manifest_path(index_path: str) -> str:
+    return index_path + ".manifest.json"
+
+
+def read_manifest(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def validate_manifest(manifest: dict, index, mapping=None, index_path: Optional[str] = None,
+                      model_name: Optional[str] = None):
+    """매니페스트와 실제 인덱스 / 매핑 / 사용할 임베딩 모델 비교 (다르면 IndexManifestError)"""
+    errors = []
+    if manifest.get("format") != MANIFEST_FORMAT:
+        errors.append(f"지원하지 않는 매니페스트 형식: {manifest.get('format')}")
+    if manifest.get("dim") != index.d:
+        errors.append(f"차원 불일치 (매니페스트 {manifest.get('dim')}, 인덱스 {index.d})")
+    if manifest.get("count") != index.ntotal:
+        errors.append(f"벡터 수 불일치 (매니페스트 {manifest.get('count')}, 인덱스 {index.ntotal})")
+    if mapping is not None and len(mapping) != index.ntotal:
+        errors.append(f"매핑 수 불일치 (매핑 {len(mapping)}, 인덱스 {index.ntotal})")
+    if model_name and manifest.get("model") != model_name:
+        errors.append(f"임베딩 모델 불일치 (매니페스트 {manifest.get('model')}, 서버 {model_name})")
+    expected_bytes = manifest.get("files", {}).get("index", {}).get("bytes")
+    if index_path and expected_bytes is not None and os.path.getsize(index_path) != expected_bytes:
+        errors.append(f"인덱스 파일 크기 불일치 (매니페스트 {expected_bytes}, 파일 {os.path.getsize(index_path)})")
+    if errors:
+        raise IndexManifestError("; ".join(errors))
+
+
+def set_nprobe(index, nprobe: int) -> Optional[int]:
+    """IVF 인덱스면 nprobe를 설정하고 적용된 값 반환 (IVF가 아니면 None)"""
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except RuntimeError:
+        return None
+    if nprobe > 0:
+        ivf.nprobe = min(nprobe, ivf.nlist)
+    return ivf.nprobe
+
+
+def _file_signature(path: str):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _read_index(path: str):
+    """mmap으로 인덱스를 열고, 지원하지 않는 인덱스 타입이면 일반 로드로 대체"""
+    try:
+        return faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY), True
+    except Exception as e:
+        logger.warning(f"mmap 로드 불가, 일반 로드로 대체 ({os.path.basename(path)}): {str(e)}")
+        return faiss.read_index(path), False
+
+
+class IndexHandle:
+    """검색만 허용하는 읽기 전용 인덱스 핸들"""
+
+    def __init__(self, name: str, index, mapping, version: int, mmapped: bool, fingerprint: str = "",
+                 manifest: Optional[dict] = None):
+        self.name = name
+        self._index = index
+        self._mapping = mapping
+        self.version = version
+        self.mmapped = mmapped
+        # 인덱스 파일 내용이 같으면 프로세스가 달라도 같은 값 (검색 결과 캐시 키에 사용)
+        self.fingerprint = fingerprint
+        self.manifest = manifest
+        self.nprobe = set_nprobe(index, FAISS_NPROBE)
+        # 정규화된 벡터로 만든 인덱스면 검색 벡터도 같은 방식으로 정규화
+        self.normalize = bool(manifest and manifest.get("normalize"))
+        self.loaded_at = time.time()
+
+    @property
+    def ntotal(self) -> int:
+        return self._index.ntotal
+
+    @property
+    def d(self) -> int:
+        return self._index.d
+
+    @property
+    def metric_type(self) -> int:
+        return self._index.metric_type
+
+    @property
+    def mapping(self):
+        return self._mapping
+
+    def search(self, vectors: np.ndarray, k: int):
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        if self.normalize:
+            vectors = vectors.copy()
+            faiss.normalize_L2(vectors)
+        return self._index.search(vectors, k)
+
+
+class _IndexEntry:
+    def __init__(self, name: str, index_path: str, mapping_path: Optional[str], legacy_mapping_path: Optional[str],
+                 model_name: Optional[str] = None):
+        self.name = name
+        self.index_path = index_path
+        self.mapping_path = mapping_path
+        self.legacy_mapping_path = legacy_mapping_path
+        self.manifest_path = manifest_path(index_path)
+        self.model_name = model_name
+        self.handle: Optional[IndexHandle] = None
+        self.signature = None
+        self.last_check = 0.0
+        self.reloads = 0
+        self.lock = threading.Lock()
+
+    def paths(self):
+        return [p for p in (self.index_path, self.mapping_path) if p]
+
+
+class FaissIndexManager:
+    """이름으로 FAISS 인덱스 핸들을 조회하는 프로세스 전역 관리자"""
+
+    def __init__(self, check_interval: float = FAISS_RELOAD_INTERVAL):
+        self.check_interval = check_interval
+        self._entries: Dict[str, _IndexEntry] = {}
+        self._watcher: Optional[asyncio.Task] = None
+
+    def register(self, name: str, index_path: str, mapping_path: Optional[str] = None,
+                 legacy_mapping_path: Optional[str] = None, model_name: Optional[str] = None):
+        """legacy_mapping_path: mapping_path가 없을 때 변환해서 사용할 이전 형식(피클) 매핑
+        model_name: 검색 벡터를 만드는 임베딩 모델 (매니페스트의 모델과 다르면 로드하지 않음)
+        """
+        self._entries[name] = _IndexEntry(name, index_path, mapping_path, legacy_mapping_path, model_name)
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None and not self._watcher.done()
+
+    def get(self, name: str) -> IndexHandle:
+        """현재 인덱스 핸들 반환 (감시 작업이 없으면 파일이 바뀌었는지 직접 확인해서 다시 로드)"""
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"등록되지 않은 FAISS 인덱스입니다: {name}")
+
+        now = time.monotonic()
+        if entry.handle is not None and (self.watching or now - entry.last_check < self.check_interval):
+            return entry.handle
+        return self._check(entry, now)
+
+    async def aget(self, name: str) -> IndexHandle:
+        """이벤트 루프용 get (아직 로드되지 않았거나 확인이 필요하면 스레드에서 로드)"""
+        entry = self._entries.get(name)
+        if entry is not None and entry.handle is not None and \
+                (self.watching or time.monotonic() - entry.last_check < self.check_interval):
+            return entry.handle
+        return await asyncio.to_thread(self.get, name)
+
+    def _check(self, entry: _IndexEntry, now: float) -> IndexHandle:
+        name = entry.name
+        with entry.lock:
+            if entry.handle is not None and now - entry.last_check < self.check_interval:
+                return entry.handle
+            entry.last_check = now
+            try:
+                self._maybe_reload(entry)
+            except Exception as e:
+                if entry.handle is None:
+                    logger.error(f"FAISS 인덱스 로드 실패 ({name}): {str(e)}")
+                    raise
+                logger.error(f"FAISS 인덱스 재로드 실패, 기존 인덱스 유지 ({name}): {str(e)}")
+        return entry.handle
+
+    def _maybe_reload(self, entry: _IndexEntry):
+        if (entry.mapping_path and not os.path.exists(entry.mapping_path)
+                and entry.legacy_mapping_path and os.path.exists(entry.legacy_mapping_path)):
+            convert_pickle(entry.legacy_mapping_path, entry.mapping_path)
+
+        for path in entry.paths():
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"FAISS 인덱스 또는 매핑 파일이 없습니다: {path}")
+
+        paths = entry.paths()
+        if os.path.exists(entry.manifest_path):
+            paths.append(entry.manifest_path)
+        signature = tuple(_file_signature(p) for p in paths)
+        if entry.handle is not None and signature == entry.signature:
+            return
+
+        start = time.perf_counter()
+        index, mmapped = _read_index(entry.index_path)
+        mapping = load_mapping(entry.mapping_path) if entry.mapping_path else None
+        manifest = read_manifest(entry.manifest_path)
+        if manifest is not None:
+            validate_manifest(manifest, index, mapping, entry.index_path, entry.model_name)
+        elif FAISS_REQUIRE_MANIFEST:
+            raise IndexManifestError(f"매니페스트가 없습니다: {entry.manifest_path}")
+        else:
+            logger.warning(f"FAISS 인덱스 매니페스트 없음, 검증 없이 로드 ({entry.name})")
+
+        # 새 인덱스를 완전히 읽은 다음 참조만 교체 -> 검색 중인 요청은 이전 핸들을 계속 사용
+        version = entry.handle.version + 1 if entry.handle else 1
+        fingerprint = hashlib.sha1(repr([s[:2] for s in signature]).encode()).hexdigest()[:12]
+        entry.handle = IndexHandle(entry.name, index, mapping, version, mmapped, fingerprint, manifest)
+        entry.signature = signature
+        if version > 1:
+            entry.reloads += 1
+        logger.info(f"✅ FAISS 인덱스 로드 완료 - {entry.name} v{version} "
+                    f"(ntotal={index.ntotal}, mmap={mmapped}, {time.perf_counter() - start:.2f}s)")
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            for entry in list(self._entries.values()):
+                if entry.handle is None:
+                    continue
+                try:
+                    # 파일 확인 / 새 인덱스 로드는 스레드에서, 핸들 교체는 참조 대입 한 번
+                    await asyncio.to_thread(self._check, entry, time.monotonic())
+                except Exception as e:
+                    logger.error(f"FAISS 인덱스 확인 실패 ({entry.name}): {str(e)}")
+
+    def start_watcher(self):
+        """서버 시작 시 파일 변경 감시 시작 (이후 get()은 파일을 확인하지 않음)"""
+        if not self.watching:
+            self._watcher = asyncio.get_running_loop().create_task(self._watch())
+
+    async def stop_watcher(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+
+    def load_all(self):
+        """서버 시작 시 등록된 인덱스를 미리 로드 (없는 인덱스는 경고만)"""
+        for name in self._entries:
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.warning(f"FAISS 인덱스 미리 로드 실패 ({name}): {str(e)}")
+
+    def stats(self) -> dict:
+        result = {}
+        for name, entry in self._entries.items():
+            handle = entry.handle
+            result[name] = {
+                "loaded": handle is not None,
+                "version": handle.version if handle else None,
+                "fingerprint": handle.fingerprint if handle else None,
+                "ntotal": handle.ntotal if handle else None,
+                "mmap": handle.mmapped if handle else None,
+                "nprobe": handle.nprobe if handle else None,
+                "build": {k: handle.manifest.get(k) for k in ("version", "model", "index_type", "normalize",
+                                                              "build_time")} if handle and handle.manifest else None,
+                "reloads": entry.reloads,
+                "watching": self.watching,
+            }
+        return result
+
+
+# 전역 인스턴스 생성
+faiss_indexes = FaissIndexManager()
+faiss_indexes.register("jobkorea", JOBKOREA_INDEX_PATH, JOBKOREA_MAPPING_PATH, JOBKOREA_LEGACY_MAPPING_PATH,
+                       model_name=JOBKOREA_EMBED_MODEL)
+faiss_indexes.register("youtube", YOUTUBE_INDEX_PATH, model_name=YOUTUBE_EMBED_MODEL)
@@ -0,0 +1,378 @@
+# 외부 페이지 가져오기
+# 서버 전체에서 httpx.AsyncClient 하나를 공유해서 연결을 재사용하고, 요청마다 타임아웃 / 호스트별 동시 요청 수 /
+# 응답 크기 상한을 적용한다. HTML 파싱은 이벤트 루프가 아닌 스레드에서 실행하고, 추출 결과는 URL별로
+# SQLite에 저장해 두었다가 ETag / Last-Modified 조건부 요청으로 바뀌지 않았으면 그대로 사용한다.
+import asyncio
+import ipaddress
+import json
+import logging
+import re
+import socket
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+from bs4 import BeautifulSoup
+
+from config import (FETCH_TIMEOUT, FETCH_CONNECT_TIMEOUT, FETCH_MAX_CONNECTIONS, FETCH_PER_HOST_LIMIT,
+                    FETCH_MAX_BYTES, FETCH_MAX_TEXT_CHARS, FETCH_ALLOW_PRIVATE, FETCH_CACHE_PATH, FETCH_CACHE_FRESH,
+                    FETCH_CACHE_TTL, FETCH_CACHE_MAX_ENTRIES)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401  (있으면 더 빠른 파서 사용)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+USER_AGENT = "Mozilla/5.0 (compatible; JOBS-Server/0.2)"
+_NOISE_TAGS = ("script", "style", "noscript", "iframe", "svg", "header", "footer", "nav", "form")
+_BLANK_LINES = re.compile(r"\n{3,}")
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+
+
+class FetchError(Exception):
+    """페이지를 가져올 수 없음 (status_code: 클라이언트에 돌려줄 HTTP 상태 코드)"""
+
+    def __init__(self, message: str, status_code: int = 502):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ResponseTooLarge(FetchError):
+    def __init__(self, limit: int):
+        super().__init__(f"응답이 {limit:,}바이트를 넘습니다.", status_code=413)
+
+
+def normalize_url(url: str) -> str:
+    """캐시 키용 URL (앞뒤 공백과 #fragment 제거, 스킴 / 호스트 소문자)"""
+    parts = urlsplit(url.strip())
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        raise FetchError(f"http(s) URL이 아닙니다: {url[:200]}", status_code=400)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+def parse_html(content: bytes, content_type: str = "", max_chars: int = FETCH_MAX_TEXT_CHARS) -> dict:
+    """본문 텍스트 추출 (스크립트 / 메뉴 등 제거, 공백 정리, max_chars로 자름) - 스레드에서 실행"""
+    if "html" not in content_type and content_type:
+        text = content.decode("utf-8", errors="replace")
+        title = ""
+    else:
+        soup = BeautifulSoup(content, HTML_PARSER)
+        title = soup.title.get_text(strip=True) if soup.title else ""
+        for tag in soup(_NOISE_TAGS):
+            tag.decompose()
+        text = soup.get_text("\n")
+    lines = (_SPACES.sub(" ", line).strip() for line in text.splitlines())
+    text = _BLANK_LINES.sub("\n\n", "\n".join(line for line in lines if line))
+    return {"title": title, "text": text[:max_chars], "truncated": len(text) > max_chars, "chars": len(text)}
+
+
+def _is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address)
+    return not (ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved or ip.is_multicast
+                or ip.is_unspecified)
+
+
+class AsyncHttpClient:
+    """연결 풀 / 타임아웃 / 호스트별 동시 요청 제한 / 응답 크기 상한이 있는 공유 HTTP 클라이언트"""
+
+    def __init__(self, timeout: float = FETCH_TIMEOUT, connect_timeout: float = FETCH_CONNECT_TIMEOUT,
+                 max_connections: int = FETCH_MAX_CONNECTIONS, per_host_limit: int = FETCH_PER_HOST_LIMIT,
+                 max_bytes: int = FETCH_MAX_BYTES, allow_private: bool = FETCH_ALLOW_PRIVATE):
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.max_bytes = max_bytes
+        self.allow_private = allow_private
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.too_large = 0
+        self.bytes = 0
+        self.by_host = defaultdict(int)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._loop = loop
+            self._host_limits = {}
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                follow_redirects=True,
+                max_redirects=5,
+                headers={"User-Agent": USER_AGENT},
+                # 접속한 서버 주소를 직접 확인하므로 프록시 환경 변수는 쓰지 않음
+                trust_env=False,
+                # 리다이렉트로 바뀐 주소까지 요청마다 확인
+                event_hooks={"request": [self._check_request], "response": [self._check_response]},
+            )
+        return self._client
+
+    async def _check_request(self, request: httpx.Request):
+        if self.allow_private:
+            return
+        host = request.url.host
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, request.url.port or 443,
+                                                                 type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            raise FetchError(f"호스트를 찾을 수 없습니다: {host}", status_code=400)
+        if not all(_is_public(info[4][0]) for info in infos):
+            raise FetchError(f"내부망 주소는 요청할 수 없습니다: {host}", status_code=400)
+
+    async def _check_response(self, response: httpx.Response):
+        # 연결할 때 DNS를 다시 조회하므로 (DNS rebinding) 실제로 접속한 주소를 본문을 읽기 전에 다시 확인
+        if self.allow_private:
+            return
+        stream = response.extensions.get("network_stream")
+        address = stream.get_extra_info("server_addr") if stream is not None else None
+        if not address or not _is_public(address[0]):
+            raise FetchError(f"내부망 주소는 요청할 수 없습니다: {response.request.url.host}", status_code=400)
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphore
+
+    async def get(self, url: str, headers: Optional[dict] = None) -> Tuple[int, httpx.Headers, bytes, str]:
+        """(상태 코드, 응답 헤더, 본문, 최종 URL) - 본문이 max_bytes를 넘으면 읽다가 중단"""
+        client = self._get_client()
+        host = urlsplit(url).hostname or ""
+        self.requests += 1
+        self.by_host[host] += 1
+        try:
+            async with self._host_limit(host):
+                # httpx 타임아웃은 읽기 한 번 기준이므로 전체 시간은 따로 제한 (호스트 대기 시간은 제외)
+                result = await asyncio.wait_for(self._download(client, url, headers), self.timeout)
+            self.bytes += len(result[2])
+            return result
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise FetchError(f"요청 시간이 초과되었습니다 ({self.timeout:g}s): {url[:200]}", status_code=504)
+        except ResponseTooLarge:
+            self.too_large += 1
+            raise
+        except FetchError:
+            self.errors += 1
+            raise
+        except httpx.TimeoutException:
+            self.timeouts += 1
+            raise FetchError(f"요청 시간이 초과되었습니다 ({self.timeout:g}s): {url[:200]}", status_code=504)
+        except httpx.HTTPError as e:
+            self.errors += 1
+            raise FetchError(f"요청 실패: {str(e)}", status_code=502)
+
+    async def _download(self, client: httpx.AsyncClient, url: str, headers: Optional[dict]):
+        async with client.stream("GET", url, headers=headers) as response:
+            length = response.headers.get("content-length")
+            if length and length.isdigit() and int(length) > self.max_bytes:
+                raise ResponseTooLarge(self.max_bytes)
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > self.max_bytes:
+                    raise ResponseTooLarge(self.max_bytes)
+        return response.status_code, response.headers, bytes(body), str(response.url)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        return {
+            "timeout": self.timeout,
+            "max_connections": self.max_connections,
+            "per_host_limit": self.per_host_limit,
+            "max_bytes": self.max_bytes,
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "too_large": self.too_large,
+            "bytes": self.bytes,
+            "top_hosts": dict(sorted(self.by_host.items(), key=lambda item: item[1], reverse=True)[:10]),
+        }
+
+
+class PageCache:
+    """URL별 추출 결과 + 검증자(ETag / Last-Modified) SQLite 캐시"""
+
+    def __init__(self, path: str = FETCH_CACHE_PATH, ttl: float = FETCH_CACHE_TTL,
+                 max_entries: int = FETCH_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._conn = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")  # 여러 uvicorn 워커가 같은 파일을 공유
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS fetch_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    value TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_fetch_cache_accessed ON fetch_cache (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, url: str) -> Optional[dict]:
+        """{"page", "etag", "last_modified", "fetched_at"} (보관 기간이 지났으면 None)"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value, etag, last_modified, fetched_at FROM fetch_cache WHERE url = ?",
+                               (url,)).fetchone()
+            if row is None:
+                return None
+            if now - row[3] > self.ttl:
+                conn.execute("DELETE FROM fetch_cache WHERE url = ?", (url,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE fetch_cache SET accessed_at = ? WHERE url = ?", (now, url))
+            conn.commit()
+        return {"page": json.loads(row[0]), "etag": row[1], "last_modified": row[2], "fetched_at": row[3]}
+
+    def set(self, url: str, page: dict, etag: Optional[str], last_modified: Optional[str]):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO fetch_cache (url, etag, last_modified, value, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, json.dumps(page, ensure_ascii=False), now, now),
+            )
+            conn.commit()
+            self._writes += 1
+            if self._writes % 50 == 0:
+                self._evict(conn, now)
+
+    def touch(self, url: str):
+        """304 응답 -> 내용은 그대로 두고 확인 시각만 갱신"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE fetch_cache SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM fetch_cache WHERE fetched_at < ?", (now - self.ttl,))
+        count = conn.execute("SELECT COUNT(*) FROM fetch_cache").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute("DELETE FROM fetch_cache WHERE url IN "
+                         "(SELECT url FROM fetch_cache ORDER BY accessed_at ASC LIMIT ?)",
+                         (count - self.max_entries,))
+        conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM fetch_cache").fetchone()[0]
+
+
+class PageFetcher:
+    """URL -> 본문 텍스트 (캐시 / 조건부 요청 / 같은 URL 동시 요청은 한 번만)"""
+
+    def __init__(self, client: AsyncHttpClient, cache: PageCache, fresh: float = FETCH_CACHE_FRESH,
+                 max_chars: int = FETCH_MAX_TEXT_CHARS):
+        self.client = client
+        self.cache = cache
+        self.fresh = fresh
+        self.max_chars = max_chars
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+        self.parse_seconds = 0.0
+
+    async def fetch(self, url: str) -> dict:
+        """{"url", "final_url", "title", "text", "truncated", "chars", "cache"}"""
+        url = normalize_url(url)
+        future = self._inflight.get(url)
+        if future is not None:
+            return dict(await asyncio.shield(future))
+        future = self._inflight[url] = asyncio.get_running_loop().create_future()
+        try:
+            page = await self._fetch(url)
+            future.set_result(page)
+            return page
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 쪽이 없어도 경고가 남지 않도록
+            raise
+        finally:
+            self._inflight.pop(url, None)
+
+    async def _fetch(self, url: str) -> dict:
+        cached = await asyncio.to_thread(self.cache.get, url)
+        if cached is not None and time.time() - cached["fetched_at"] < self.fresh:
+            self.fresh_hits += 1
+            return {**cached["page"], "cache": "fresh"}
+
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        status, response_headers, content, final_url = await self.client.get(url, headers)
+
+        if status == 304 and cached is not None:
+            self.revalidated += 1
+            await asyncio.to_thread(self.cache.touch, url)
+            return {**cached["page"], "cache": "revalidated"}
+        if status >= 400:
+            raise FetchError(f"페이지 응답 오류 (HTTP {status}): {url[:200]}", status_code=502)
+
+        start = time.perf_counter()
+        # BeautifulSoup 파싱은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        page = await asyncio.to_thread(parse_html, content, response_headers.get("content-type", ""),
+                                       self.max_chars)
+        self.parse_seconds += time.perf_counter() - start
+        self.downloads += 1
+        page.update(url=url, final_url=final_url)
+        await asyncio.to_thread(self.cache.set, url, page, response_headers.get("etag"),
+                                response_headers.get("last-modified"))
+        return {**page, "cache": "miss"}
+
+    def stats(self) -> dict:
+        return {
+            "fresh_window": self.fresh,
+            "cached_pages": self.cache.size(),
+            "fresh_hits": self.fresh_hits,
+            "revalidated": self.revalidated,
+            "downloads": self.downloads,
+            "inflight": len(self._inflight),
+            "avg_parse_ms": round(self.parse_seconds / self.downloads * 1000, 2) if self.downloads else 0,
+            "parser": HTML_PARSER,
+            "client": self.client.stats(),
+        }
+
+
+# 전역 인스턴스 생성
+http_client = AsyncHttpClient()
+page_fetcher = PageFetcher(http_client, PageCache())
@@ -0,0 +1,335 @@
+# FAISS 인덱스 오프라인 빌드 도구
+# 입력을 한 줄씩 읽으면서 chunk 단위로 임베딩해서 인덱스에 바로 추가한다. (전체 벡터를 메모리에 올리지 않음)
+# 학습이 필요한 인덱스(IVF / PQ)는 앞쪽 train_size개 벡터만 모아서 학습한 뒤 나머지를 이어서 추가한다.
+# 결과는 INDEX_BUILD_DIR/<이름>/<버전>/ 에 인덱스 / 매핑 / 매니페스트로 저장하고,
+# publish 하면 서버가 읽는 위치로 교체한다. (이전 버전 디렉토리를 다시 publish 하면 롤백)
+#
+# 실행:
+#   python -m utils.index_build jobkorea --input data/jobkorea.csv [--type ivf --nlist 100] [--publish]
+#   python -m utils.index_build youtube --input utils/youtube_data.json [--type flat] [--publish]
+#   python -m utils.index_build publish <빌드 디렉토리>
+#   python -m utils.index_build verify [jobkorea youtube]
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import faiss
+import numpy as np
+
+from config import INDEX_BUILD_DIR
+from utils.embedding import BatchedEncoder, embedding_registry
+from utils.bm25 import build_bm25
+from utils.faiss_store import (JOBKOREA_INDEX_PATH, JOBKOREA_MAPPING_PATH, JOBKOREA_BM25_PATH, YOUTUBE_INDEX_PATH,
+                               MANIFEST_FORMAT, faiss_indexes, manifest_path, read_manifest, validate_manifest)
+from utils.qa_store import QAMappingStore, QAMappingWriter
+
+logger = logging.getLogger(__name__)
+
+INDEX_TYPES = ("flat", "ivf", "hnsw", "pq")
+METRICS = {"l2": faiss.METRIC_L2, "ip": faiss.METRIC_INNER_PRODUCT}
+JOBKOREA_MAX_QUESTIONS = 19  # question1 ~ question19
+
+
+def iter_jobkorea_csv(path: str) -> Iterator[dict]:
+    """잡코리아 CSV(question1/answer1 ... 가로 형태)를 질문/답변 레코드로 한 줄씩 변환"""
+    csv.field_size_limit(sys.maxsize)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            for i in range(1, JOBKOREA_MAX_QUESTIONS + 1):
+                question = (row.get(f"question{i}") or "").strip()
+                answer = (row.get(f"answer{i}") or "").strip()
+                if question and answer:
+                    yield {"question": question, "answer": answer}
+
+
+def iter_youtube(path: str) -> Iterator[dict]:
+    """영상 메타데이터(JSON 목록 또는 JSON Lines). 인덱스 id = 파일 안의 순서"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+class Source(NamedTuple):
+    reader: Callable[[str], Iterator[dict]]
+    text: Callable[[dict], str]
+    index_path: str
+    mapping_path: Optional[str]
+    bm25_path: Optional[str] = None
+
+
+def _video_text(video: dict) -> str:
+    # 자막(text)이 없는 영상은 제목으로 대신해서 id 순서를 메타데이터 파일과 맞춤
+    return video.get("text") or video.get("title") or ""
+
+
+SOURCES: Dict[str, Source] = {
+    "jobkorea": Source(iter_jobkorea_csv, lambda record: record["question"], JOBKOREA_INDEX_PATH,
+                       JOBKOREA_MAPPING_PATH, JOBKOREA_BM25_PATH),
+    "youtube": Source(iter_youtube, _video_text, YOUTUBE_INDEX_PATH, None),
+}
+
+
+class IndexBuilder:
+    """chunk 단위로 벡터를 받아 FAISS 인덱스를 만드는 클래스"""
+
+    def __init__(self, index_type: str, metric: str = "l2", normalize: bool = True, train_size: int = 50000,
+                 nlist: int = 100, nprobe: int = 8, pq_m: int = 16, pq_bits: int = 8, hnsw_m: int = 32,
+                 ef_construction: int = 40, ef_search: int = 64):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"지원하지 않는 인덱스 종류입니다: {index_type}")
+        self.index_type = index_type
+        self.metric = metric
+        self.normalize = normalize
+        self.train_size = train_size
+        self.params = {"nlist": nlist, "nprobe": nprobe, "pq_m": pq_m, "pq_bits": pq_bits, "hnsw_m": hnsw_m,
+                       "ef_construction": ef_construction, "ef_search": ef_search}
+        self.index = None
+        self.dim = None
+        self._pending: List[np.ndarray] = []  # 학습 전까지 모아 두는 벡터
+        self._pending_count = 0
+
+    @property
+    def needs_training(self) -> bool:
+        return self.index_type in ("ivf", "pq")
+
+    def used_params(self) -> dict:
+        keys = {"flat": (), "ivf": ("nlist", "nprobe"), "hnsw": ("hnsw_m", "ef_construction", "ef_search"),
+                "pq": ("pq_m", "pq_bits")}[self.index_type]
+        return {key: self.params[key] for key in keys}
+
+    def add(self, vectors: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        if self.normalize:
+            faiss.normalize_L2(vectors)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        if self.index is None and self.needs_training:
+            self._pending.append(vectors)
+            self._pending_count += len(vectors)
+            if self._pending_count >= self.train_size:
+                self._train_and_flush()
+            return
+        if self.index is None:
+            self.index = self._create(self._pending_count)
+        self.index.add(vectors)
+
+    def finish(self):
+        if self.dim is None:
+            raise ValueError("인덱스에 넣을 데이터가 없습니다.")
+        if self.index is None:
+            self._train_and_flush()
+        return self.index
+
+    def _train_and_flush(self):
+        sample = np.vstack(self._pending)
+        self.index = self._create(len(sample))
+        start = time.perf_counter()
+        self.index.train(sample[:self.train_size])
+        logger.info(f"인덱스 학습 완료 ({min(len(sample), self.train_size)}개, {time.perf_counter() - start:.2f}s)")
+        self.index.add(sample)
+        self._pending = []
+
+    def _create(self, train_count: int):
+        d, metric, p = self.dim, METRICS[self.metric], self.params
+        if self.index_type == "flat":
+            return faiss.IndexFlatL2(d) if metric == faiss.METRIC_L2 else faiss.IndexFlatIP(d)
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(d, p["hnsw_m"], metric)
+            index.hnsw.efConstruction = p["ef_construction"]
+            index.hnsw.efSearch = p["ef_search"]
+            return index
+        if self.index_type == "ivf":
+            # 학습 데이터보다 클러스터가 많으면 학습할 수 없음
+            if train_count < p["nlist"]:
+                logger.warning(f"학습 데이터({train_count}개)가 nlist({p['nlist']})보다 적어 nlist를 줄입니다.")
+                p["nlist"] = max(1, train_count)
+            quantizer = faiss.IndexFlatL2(d) if metric == faiss.METRIC_L2 else faiss.IndexFlatIP(d)
+            index = faiss.IndexIVFFlat(quantizer, d, p["nlist"], metric)
+            index.nprobe = min(p["nprobe"], p["nlist"])
+            p["nprobe"] = index.nprobe
+            return index
+        if d % p["pq_m"] != 0:
+            raise ValueError(f"PQ 부분 벡터 수(pq_m={p['pq_m']})가 차원({d})을 나누어 떨어지게 해야 합니다.")
+        while p["pq_bits"] > 1 and 2 ** p["pq_bits"] > train_count:
+            p["pq_bits"] -= 1
+            logger.warning(f"학습 데이터({train_count}개)가 적어 pq_bits를 {p['pq_bits']}로 줄입니다.")
+        return faiss.IndexPQ(d, p["pq_m"], p["pq_bits"], metric)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build(name: str, input_path: str, index_type: str = "flat", out_dir: str = INDEX_BUILD_DIR,
+          model_name: Optional[str] = None, chunk_size: int = 256, limit: Optional[int] = None, **options) -> str:
+    """인덱스를 새 버전 디렉토리에 빌드하고 경로 반환 (options: IndexBuilder 인자)"""
+    source = SOURCES[name]
+    encoder = BatchedEncoder(name, model_name or embedding_registry.get(name).model_name)
+    version = datetime.now().strftime("%Y%m%d-%H%M%S")
+    build_dir = os.path.join(out_dir, name, version)
+    os.makedirs(build_dir)
+
+    builder = IndexBuilder(index_type, **options)
+    writer = QAMappingWriter(os.path.join(build_dir, "mapping.qa")) if source.mapping_path else None
+    start = time.perf_counter()
+    count = 0
+    chunk: List[str] = []
+    for record in source.reader(input_path):
+        if limit is not None and count >= limit:
+            break
+        if writer is not None:
+            writer.add(record)
+        chunk.append(source.text(record))
+        count += 1
+        if len(chunk) >= chunk_size:
+            builder.add(encoder.encode_sync(chunk))
+            chunk = []
+            logger.info(f"{name}: {count}개 임베딩 완료")
+    if chunk:
+        builder.add(encoder.encode_sync(chunk))
+
+    index = builder.finish()
+    index_file = os.path.join(build_dir, "index.faiss")
+    faiss.write_index(index, index_file)
+    files = {"index": {"path": "index.faiss", "bytes": os.path.getsize(index_file)}}
+    if writer is not None:
+        writer.close()
+        files["mapping"] = {"path": "mapping.qa", "bytes": os.path.getsize(os.path.join(build_dir, "mapping.qa"))}
+    if source.bm25_path:
+        # 키워드 검색용 BM25 색인도 같은 id 순서로 함께 생성
+        mapping = QAMappingStore(os.path.join(build_dir, "mapping.qa"))
+        build_bm25((mapping.get(i) for i in range(len(mapping))), os.path.join(build_dir, "bm25.npz"))
+        files["bm25"] = {"path": "bm25.npz", "bytes": os.path.getsize(os.path.join(build_dir, "bm25.npz"))}
+
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "name": name,
+        "version": version,
+        "model": encoder.model_name,
+        "dim": index.d,
+        "normalize": builder.normalize,
+        "metric": builder.metric,
+        "index_type": index_type,
+        "params": builder.used_params(),
+        "count": index.ntotal,
+        "build_time": datetime.now().isoformat(timespec="seconds"),
+        "build_seconds": round(time.perf_counter() - start, 2),
+        "source": {"path": os.path.abspath(input_path), "sha256": _sha256(input_path)},
+        "files": files,
+    }
+    with open(os.path.join(build_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    logger.info(f"✅ {name} 인덱스 빌드 완료: {build_dir} ({index.ntotal}개, {manifest['build_seconds']}s)")
+    return build_dir
+
+
+def _install(src: str, dst: str):
+    """같은 디렉토리의 임시 파일로 복사한 뒤 교체 (서버는 완성된 파일만 봄)"""
+    tmp_path = f"{dst}.{os.getpid()}.tmp"
+    shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+def publish(build_dir: str) -> dict:
+    """빌드 결과를 검증하고 서버가 읽는 위치로 교체 (매니페스트를 마지막에 교체)"""
+    manifest = read_manifest(os.path.join(build_dir, "manifest.json"))
+    if manifest is None:
+        raise FileNotFoundError(f"매니페스트가 없습니다: {build_dir}")
+    source = SOURCES[manifest["name"]]
+    index_file = os.path.join(build_dir, manifest["files"]["index"]["path"])
+    mapping_file = os.path.join(build_dir, manifest["files"]["mapping"]["path"]) if source.mapping_path else None
+    validate_manifest(manifest, faiss.read_index(index_file),
+                      QAMappingStore(mapping_file) if mapping_file else None, index_file)
+
+    _install(index_file, source.index_path)
+    if mapping_file:
+        _install(mapping_file, source.mapping_path)
+    if source.bm25_path and "bm25" in manifest["files"]:
+        _install(os.path.join(build_dir, manifest["files"]["bm25"]["path"]), source.bm25_path)
+    _install(os.path.join(build_dir, "manifest.json"), manifest_path(source.index_path))
+    logger.info(f"✅ {manifest['name']} 인덱스 교체 완료: {manifest['version']}")
+    return manifest
+
+
+def verify(names: List[str]) -> bool:
+    """서버와 같은 방식으로 인덱스를 로드해서 매니페스트 / 모델이 맞는지 확인"""
+    ok = True
+    for name in names:
+        try:
+            handle = faiss_indexes.get(name)
+        except Exception as e:
+            print(f"❌ {name}: {str(e)}")
+            ok = False
+            continue
+        if handle.manifest is None:
+            print(f"⚠️ {name}: 매니페스트 없음 (ntotal={handle.ntotal}, d={handle.d})")
+        else:
+            print(f"✅ {name}: {handle.manifest['version']} {handle.manifest['index_type']} "
+                  f"(model={handle.manifest['model']}, ntotal={handle.ntotal}, d={handle.d})")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="FAISS 인덱스 빌드 / 교체 / 검증")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name in SOURCES:
+        sub = commands.add_parser(name, help=f"{name} 인덱스 빌드")
+        sub.add_argument("--input", required=True, help="입력 파일 (jobkorea: CSV, youtube: JSON / JSON Lines)")
+        sub.add_argument("--type", choices=INDEX_TYPES, default="flat", dest="index_type")
+        sub.add_argument("--out-dir", default=INDEX_BUILD_DIR)
+        sub.add_argument("--model", default=None, help="임베딩 모델 (기본: 서버 설정과 같은 모델)")
+        sub.add_argument("--chunk-size", type=int, default=256, help="한 번에 임베딩할 문장 수")
+        sub.add_argument("--limit", type=int, default=None, help="앞쪽 N개만 사용 (테스트용)")
+        sub.add_argument("--metric", choices=tuple(METRICS), default="l2")
+        sub.add_argument("--no-normalize", action="store_false", dest="normalize", help="L2 정규화하지 않음")
+        sub.add_argument("--train-size", type=int, default=50000, help="IVF / PQ 학습에 사용할 벡터 수")
+        sub.add_argument("--nlist", type=int, default=100)
+        sub.add_argument("--nprobe", type=int, default=8)
+        sub.add_argument("--pq-m", type=int, default=16)
+        sub.add_argument("--pq-bits", type=int, default=8)
+        sub.add_argument("--hnsw-m", type=int, default=32)
+        sub.add_argument("--ef-construction", type=int, default=40)
+        sub.add_argument("--ef-search", type=int, default=64)
+        sub.add_argument("--publish", action="store_true", help="빌드 후 서버가 읽는 위치로 교체")
+
+    sub = commands.add_parser("publish", help="빌드 결과를 서버가 읽는 위치로 교체")
+    sub.add_argument("build_dir")
+    sub = commands.add_parser("verify", help="현재 인덱스와 매니페스트 검증")
+    sub.add_argument("names", nargs="*", default=list(SOURCES))
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "publish":
+        publish(args.build_dir)
+    elif args.command == "verify":
+        sys.exit(0 if verify(args.names) else 1)
+    else:
+        build_dir = build(args.command, args.input, args.index_type, args.out_dir, args.model, args.chunk_size,
+                          args.limit, metric=args.metric, normalize=args.normalize, train_size=args.train_size,
+                          nlist=args.nlist, nprobe=args.nprobe, pq_m=args.pq_m, pq_bits=args.pq_bits,
+                          hnsw_m=args.hnsw_m, ef_construction=args.ef_construction, ef_search=args.ef_search)
+        print(build_dir)
+        if args.publish:
+            publish(build_dir)
+
+
+if __name__ == "__main__":
+    main()
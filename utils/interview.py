@@ -8,33 +8,48 @@ from langchain.chains import LLMChain
 from langchain_openai import OpenAI
 from routers.pdf_storage import pdf_storage
 from config import FILE_DIR, API_KEY
-from db import SessionLocal, InterviewSessionDB, ChatMessageDB
 from typing import Optional, Dict, Any
+import asyncio
 import logging
 import re
-from sentence_transformers import SentenceTransformer
+import sys
+import json
+import zlib
+from utils.embedding import embedding_registry
+from utils.faiss_store import faiss_indexes
+from utils.retrieval import hybrid_retriever
+from utils.llm_cache import llm_cache
+from utils.resume_artifacts import resume_artifacts, short_hash
+from utils.posting import posting_ingestor
+from utils.resume_digest import resume_digester
 import faiss
-import pickle
 
 logger = logging.getLogger(__name__)
 
-# FAISS 파일 경로 설정
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-FAISS_INDEX_PATH = os.path.join(BASE_DIR, "faiss_index.jobkorea")
-FAISS_MAPPING_PATH = os.path.join(BASE_DIR, "faiss_qa_mapping.pkl")
+# 세션 스냅샷 형식 버전 (스냅샷 첫 바이트)
+# 2: 이력서 해시가 있으면 이력서 원문 대신 해시만 저장하고 복원할 때 이력서 산출물(text)에서 다시 읽음
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_FORMATS = (1, 2)
 
 class InterviewSession:
-    def __init__(self, token: str, question_num=5, answer_per_question=5, mock_data_path=None):
+    def __init__(self, token: str, question_num=5, answer_per_question=5, mock_data_path=None, pdf_data=None):
         self.token = token
         self.llm = OpenAI(api_key=API_KEY, temperature=0.7)
         
-        # PDF 데이터 로드
-        pdf_data = pdf_storage.get_pdf(token)
+        # PDF 데이터 로드 (스냅샷에서 복원할 때는 pdf_data를 직접 넘겨받음)
+        if pdf_data is None:
+            pdf_data = pdf_storage.get_pdf(token)
         if not pdf_data:
             raise ValueError(f"토큰 {token}에 해당하는 PDF 데이터가 없습니다.")
         
         self.resume = pdf_data.get("resume_text", "")
         self.recruit_url = pdf_data.get("recruitUrl", "")
+        # 채용 공고 요약 (업로드 시 백그라운드에서 만든 것을 질문 생성 직전에 조회, 스냅샷에서는 그대로 복원)
+        self.posting = pdf_data.get("posting") or ""
+        # 이력서 파일 SHA-256 -> 같은 이력서의 임베딩 / 검색 결과 / 대표질문을 토큰 간에 공유
+        self.resume_hash = pdf_data.get("resume_hash")
+        # 프롬프트에 넣을 이력서 요약 (처음 필요할 때 이력서 산출물에서 조회)
+        self.resume_digest = ""
         
         if not self.resume or not self.recruit_url:
             raise ValueError("이력서 또는 채용공고 URL이 없습니다.")
@@ -50,6 +65,12 @@ class InterviewSession:
         self.answers = [[] for _ in range(question_num)]
         self.hints = [[] for _ in range(question_num)]
         self.feedbacks = [[] for _ in range(question_num)]
+        # DB 메시지로 복원한 세션은 아직 묻지 않은 대표질문을 갖고 있지 않음
+        self.main_questions_complete = False
+        # 대표질문 생성 / 이어 붙이기는 한 번에 하나만 (백그라운드 미리 생성과 요청 처리가 겹치는 경우)
+        self._main_questions_lock = asyncio.Lock()
+        # 마지막으로 읽거나 저장한 스냅샷 버전 (InterviewSessionDB.state_version, 더 높으면 다른 워커가 진행한 것)
+        self.state_version = 0
         
         self.mock_data_path = mock_data_path
         self.example_questions = self._load_mock_interview_data(mock_data_path)
@@ -58,20 +79,109 @@ class InterviewSession:
         self._init_faiss()
 
     def _init_faiss(self):
-        """FAISS 관련 초기화"""
+        """FAISS 관련 초기화 (인덱스는 faiss_indexes가 프로세스 당 한 번만 로드)"""
         try:
-            if not os.path.exists(FAISS_INDEX_PATH) or not os.path.exists(FAISS_MAPPING_PATH):
-                raise FileNotFoundError("FAISS 인덱스 또는 매핑 파일이 없습니다.")
-            
-            self.index = faiss.read_index(FAISS_INDEX_PATH)
-            with open(FAISS_MAPPING_PATH, "rb") as f:
-                self.mapping = pickle.load(f)
-            
-            logger.info("✅ FAISS 인덱스 및 매핑 로드 완료")
+            faiss_indexes.get("jobkorea")
         except Exception as e:
             logger.error(f"FAISS 초기화 실패: {str(e)}")
             raise
 
+    def restore_from_messages(self, messages):
+        """DB에 저장된 메시지(ChatMessageDB, 시간순)로 세션 상태를 복원 (LLM 호출 없음)"""
+        index = -1
+        for msg in messages:
+            if msg.message_type == "main_question":
+                if index + 1 >= self.question_num:
+                    break
+                index += 1
+                self.main_questions.append(msg.content)
+                continue
+            if index < 0:
+                continue
+            if msg.message_type == "user_answer":
+                self.answers[index].append(msg.content)
+            elif msg.message_type == "feedback":
+                self.feedbacks[index].append(msg.content)
+            elif msg.message_type == "follow_up":
+                self.follow_up_questions[index].append(msg.content)
+        self.main_questions_complete = len(self.main_questions) >= self.question_num
+        logger.info(f"세션 복원 완료 - 토큰: {self.token}, 대표질문 {len(self.main_questions)}개")
+
+    def to_snapshot(self) -> bytes:
+        """세션 상태를 DB 저장용 압축 스냅샷으로 직렬화"""
+        state = {
+            "recruit_url": self.recruit_url,
+            "posting": self.posting,
+            "resume_hash": self.resume_hash,
+            "question_num": self.question_num,
+            "answer_per_question": self.answer_per_question,
+            "current_main": self.current_main,
+            "current_follow_up": self.current_follow_up,
+            "main_questions": self.main_questions,
+            "main_questions_complete": self.main_questions_complete,
+            "follow_up_questions": self.follow_up_questions,
+            "answers": self.answers,
+            "hints": self.hints,
+            "feedbacks": self.feedbacks,
+        }
+        if not self.resume_hash:
+            # 해시가 없는 (예전에 업로드된) 이력서만 원문을 함께 저장
+            state["resume"] = self.resume
+        payload = json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return bytes([SNAPSHOT_FORMAT]) + zlib.compress(payload)
+
+    @classmethod
+    def from_snapshot(cls, token: str, snapshot: bytes) -> Optional["InterviewSession"]:
+        """스냅샷으로 세션 복원 (형식이 다르거나 깨진 스냅샷, 이력서를 찾을 수 없으면 None)"""
+        if not snapshot or snapshot[0] not in SNAPSHOT_FORMATS:
+            return None
+        try:
+            state = json.loads(zlib.decompress(snapshot[1:]).decode("utf-8"))
+        except Exception as e:
+            logger.error(f"세션 스냅샷 복원 실패 - 토큰: {token}, {str(e)}")
+            return None
+
+        resume = state.get("resume") or cls._load_resume(token, state.get("resume_hash"))
+        if not resume:
+            logger.error(f"세션 스냅샷 복원 실패 - 토큰: {token}, 이력서를 찾을 수 없습니다.")
+            return None
+
+        session = cls(
+            token=token,
+            question_num=state["question_num"],
+            answer_per_question=state["answer_per_question"],
+            pdf_data={"resume_text": resume, "recruitUrl": state["recruit_url"],
+                      "posting": state.get("posting"), "resume_hash": state.get("resume_hash")},
+        )
+        session.current_main = state["current_main"]
+        session.current_follow_up = state["current_follow_up"]
+        session.main_questions = state["main_questions"]
+        session.main_questions_complete = state["main_questions_complete"]
+        session.follow_up_questions = state["follow_up_questions"]
+        session.answers = state["answers"]
+        session.hints = state["hints"]
+        session.feedbacks = state["feedbacks"]
+        return session
+
+    @staticmethod
+    def _load_resume(token: str, resume_hash: Optional[str]) -> str:
+        """스냅샷에 없는 이력서 원문 (이력서 산출물 -> 업로드 데이터 순서로 조회)"""
+        if resume_hash:
+            text = resume_artifacts.get(resume_hash, "text", "text")
+            if text:
+                return text
+        pdf_data = pdf_storage.get_pdf(token)
+        return pdf_data.get("resume_text", "") if pdf_data else ""
+
+    def approx_size(self) -> int:
+        """세션 캐시 메모리 상한 계산용 대략적인 크기 (bytes)"""
+        size = sys.getsizeof(self.resume) + sys.getsizeof(self.recruit_url) + sys.getsizeof(self.posting)
+        size += sys.getsizeof(self.example_questions)
+        size += sum(sys.getsizeof(q) for q in self.main_questions)
+        for group in (self.follow_up_questions, self.answers, self.hints, self.feedbacks):
+            size += sum(sys.getsizeof(text) for items in group for text in items)
+        return size
+
     def _load_mock_interview_data(self, mock_data_path=None):
         if not mock_data_path:
             mock_data_path = os.path.join(FILE_DIR, "mock_interview_data.json")
@@ -91,14 +201,23 @@ class InterviewSession:
         except Exception as e:
             print(f"모의 면접 데이터 로딩 실패: {str(e)}")
             return ""
-        
-    # RAG 시작부분 -> 벡터 인덱스, 매핑 정보 가져오기    
-    def _load_faiss_index(self):
-        # 벡터 인덱스와 매핑 정보 로드
-        index = faiss.read_index("../faiss_index.jobkorea")
-        with open("../faiss_qa_mapping.pkl", "rb") as f:
-            mapping = pickle.load(f)
-        return index, mapping
+
+    @property
+    def job_posting(self) -> str:
+        """프롬프트에 넣을 채용 공고 (요약이 아직 없으면 URL)"""
+        return self.posting or self.recruit_url[:500]
+
+    async def _resolve_posting(self):
+        """저장된 공고 요약 조회 (가져오는 중이면 기다리지 않고 URL로 진행)"""
+        if not self.posting:
+            self.posting = await posting_ingestor.lookup(self.recruit_url)
+            if not self.posting:
+                logger.info(f"채용 공고 요약이 아직 없어 URL로 질문 생성 - 토큰: {self.token}")
+
+    async def _resolve_resume_digest(self):
+        """이력서 요약 (업로드 때 시작한 작업이 진행 중이면 그 결과를 기다림)"""
+        if not self.resume_digest:
+            self.resume_digest = await resume_digester.digest(self.resume_hash, self.resume)
 
     async def generate_main_questions(self, num_questions: int = 5):
         try:
@@ -106,100 +225,155 @@ class InterviewSession:
                 logger.info("이미 생성된 질문이 있습니다.")
                 return self.main_questions
 
-            logger.info("🎯 [generate_main_questions] 대표 질문 생성 시작")
+            self.main_questions = await self._load_main_questions(num_questions)
+            self.main_questions_complete = True
+            return self.main_questions
+
+        except Exception as e:
+            logger.error(f"❌ 대표질문 생성 중 오류 발생: {str(e)}")
+            raise ValueError("대표질문을 생성할 수 없습니다.")
+
+    async def _load_main_questions(self, num_questions: int):
+        """대표질문 목록을 만들어서 반환 (세션 상태는 바꾸지 않음)"""
+        await self._resolve_posting()
+        await self._resolve_resume_digest()
+        # 같은 이력서(요약) + 같은 채용공고로 이미 만든 대표질문이 있으면 그대로 사용
+        questions = await resume_artifacts.memo(
+            self.resume_hash, f"questions.{short_hash(self.resume_digest + self.job_posting)}",
+            lambda: self._build_main_questions(num_questions))
+        return questions[:num_questions]
+
+    async def _query_embedding(self):
+        """RAG 검색용 이력서 + 공고 임베딩 (이력서 해시별로 저장)"""
+        async def compute():
+            query_text = f"{self.resume[:1000]} {self.job_posting[:500]}"
+            query_embedding = await embedding_registry.encode("jobkorea", [query_text])
+            faiss.normalize_L2(query_embedding)
+            return query_embedding
+
+        model = short_hash(embedding_registry.get("jobkorea").model_name, 8)
+        embedding = await resume_artifacts.memo(
+            self.resume_hash, f"embedding.jobkorea.{model}.{short_hash(self.job_posting)}", compute, kind="npy")
+        return np.ascontiguousarray(embedding, dtype="float32")
+
+    async def _retrieve_questions(self):
+        """FAISS + BM25로 유사 면접 질문 검색 (같은 인덱스 / 검색 설정이면 저장된 결과 재사용)"""
+        # RAG 시작부분 -> 공유 인덱스 핸들에서 검색 (파일이 바뀌면 자동으로 새 인덱스 사용)
+        index = await faiss_indexes.aget("jobkorea")
+        retrieval_key = await asyncio.to_thread(hybrid_retriever.cache_key)
+
+        async def compute():
+            query_embedding = await self._query_embedding()
+            # 키워드 검색은 앞부분만 쓰는 임베딩과 달리 이력서 전체 + 공고 요약에서 idf가 높은 단어를 사용
+            # (FAISS / BM25 검색은 CPU 작업이므로 이벤트 루프 밖에서 실행)
+            questions, diagnostics = await asyncio.to_thread(
+                hybrid_retriever.retrieve, query_embedding, f"{self.resume}\n{self.posting}", 10)
+            logger.info(f"🔎 질문 후보 검색 ({diagnostics['mode']}): FAISS {diagnostics['dense_candidates']}개, "
+                        f"BM25 {diagnostics['lexical_candidates']}개, 키워드로만 찾은 질문 "
+                        f"{diagnostics['from_lexical_only']}개, {diagnostics['total_ms']}ms")
+            return questions
+
+        return await resume_artifacts.memo(
+            self.resume_hash,
+            f"retrieval.jobkorea.{index.fingerprint}.{retrieval_key}.{short_hash(self.job_posting)}",
+            compute)
+
+    async def _build_main_questions(self, num_questions: int):
+        """RAG(실패 시 프롬프트) 방식으로 대표질문 목록 생성"""
+        logger.info("🎯 [generate_main_questions] 대표 질문 생성 시작")
 
         # 1. RAG 기반 우선 시도
-            try:
-                query_text = f"{self.resume[:1000]} {self.recruit_url[:500]}"
-                model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
-                query_embedding = model.encode([query_text])
-                faiss.normalize_L2(query_embedding)
-
-                index = faiss.read_index("../faiss_index.jobkorea")
-                with open("../faiss_qa_mapping.pkl", "rb") as f:
-                    mapping = pickle.load(f)
-
-                top_k = min(10, len(mapping))
-                distances, indices = index.search(np.array(query_embedding), top_k)
-                retrieved_questions = [mapping[i]['question'] for i in indices[0]]
-
-                logger.info(f"📥 유사 질문 {len(retrieved_questions)}개 추출됨")
-
-                # LLM 정제
-                prompt = PromptTemplate(
-                    template=self._get_rag_question_template(),
-                    input_variables=['retrieved_questions', 'resume', 'recruit_url']
-                )
-                chain = LLMChain(prompt=prompt, llm=self.llm)
-                response = await chain.ainvoke({
-                    'retrieved_questions': "\n".join(retrieved_questions),
-                    'resume': self.resume[:1000],
-                    'recruit_url': self.recruit_url[:500]
-                })
-
-                questions = [q.strip() for q in response.get('text', '').split('\n') if q.strip()]
-                if questions:
-                    self.main_questions = questions[:num_questions]
-                    logger.info(f"✅ RAG 기반 대표질문 {len(self.main_questions)}개 생성 완료")
-                    return self.main_questions
-                else:
-                    logger.warning("📭 RAG 기반 질문 생성 실패, 프롬프트 방식으로 대체")
-
-            except Exception as e:
-                logger.warning(f"❗ RAG 실패 → 프롬프트 기반으로 전환: {str(e)}")
-
-            # 2. Fallback: 기존 프롬프트 방식
+        try:
+            retrieved_questions = await self._retrieve_questions()
+
+            logger.info(f"📥 유사 질문 {len(retrieved_questions)}개 추출됨")
+
+            # LLM 정제
             prompt = PromptTemplate(
-                template=self._get_question_template(),
-                input_variables=['resume', 'recruit_url', 'example_questions']
+                template=self._get_rag_question_template(),
+                input_variables=['retrieved_questions', 'resume', 'job_posting']
             )
-            
-            # LLMChain 생성 및 실행
             chain = LLMChain(prompt=prompt, llm=self.llm)
-            response = await chain.ainvoke({
-                'resume': self.resume[:1000],
-                'recruit_url': self.recruit_url,
-                'example_questions': self.example_questions
-            })
-
-            questions_text = response.get('text', '').strip()
-            if not questions_text:
-                logger.error("⚠️ 프롬프트 기반 응답도 실패")
-                raise ValueError("질문 생성 실패")
-
-            questions = [q.strip() for q in questions_text.split('\n') if q.strip()]
-            self.main_questions = questions[:num_questions]
-            logger.info(f"✅ 프롬프트 기반 대표질문 {len(self.main_questions)}개 생성 완료")
-            return self.main_questions
+            inputs = {
+                'retrieved_questions': "\n".join(retrieved_questions),
+                'resume': self.resume_digest,
+                'job_posting': self.job_posting
+            }
+            resume_digester.report("rag_questions", prompt, inputs, self.resume[:1000])
+            response_text = await llm_cache.ainvoke(chain, "rag_questions", inputs)
+
+            questions = [q.strip() for q in response_text.split('\n') if q.strip()]
+            if questions:
+                logger.info(f"✅ RAG 기반 대표질문 {len(questions[:num_questions])}개 생성 완료")
+                return questions[:num_questions]
+            else:
+                logger.warning("📭 RAG 기반 질문 생성 실패, 프롬프트 방식으로 대체")
 
         except Exception as e:
-            logger.error(f"❌ 대표질문 생성 중 오류 발생: {str(e)}")
-            raise ValueError("대표질문을 생성할 수 없습니다.")
-
+            logger.warning(f"❗ RAG 실패 → 프롬프트 기반으로 전환: {str(e)}")
 
-    async def generate_main_question(self):
-        """저장된 대표 질문을 하나씩 반환하는 메서드"""
+        # 2. Fallback: 기존 프롬프트 방식
+        prompt = PromptTemplate(
+            template=self._get_question_template(),
+            input_variables=['resume', 'job_posting', 'example_questions']
+        )
+        
+        # LLMChain 생성 및 실행
+        chain = LLMChain(prompt=prompt, llm=self.llm)
+        inputs = {
+            'resume': self.resume_digest,
+            'job_posting': self.job_posting,
+            'example_questions': self.example_questions
+        }
+        resume_digester.report("questions", prompt, inputs, self.resume[:1000])
+        response_text = await llm_cache.ainvoke(chain, "questions", inputs)
+
+        questions_text = response_text.strip()
+        if not questions_text:
+            logger.error("⚠️ 프롬프트 기반 응답도 실패")
+            raise ValueError("질문 생성 실패")
+
+        questions = [q.strip() for q in questions_text.split('\n') if q.strip()]
+        logger.info(f"✅ 프롬프트 기반 대표질문 {len(questions[:num_questions])}개 생성 완료")
+        return questions[:num_questions]
+
+
+    async def generate_main_question(self, index: Optional[int] = None):
+        """저장된 대표 질문을 하나씩 반환하는 메서드 (index를 주면 current_main 대신 해당 질문)"""
+        if index is None:
+            index = self.current_main
         try:
-            # 질문이 없으면 생성
-            if not self.main_questions:
-                logger.info("대표질문 새로 생성")
-                self.main_questions = await self.generate_main_questions()
-                if not self.main_questions:
-                    logger.error("대표질문 생성 실패")
-                    return None
-            
+            if not self.main_questions or (index >= len(self.main_questions) and not self.main_questions_complete):
+                # 다른 요청이 생성 중이면 끝날 때까지 기다렸다가 그 결과를 사용
+                async with self._main_questions_lock:
+                    # 질문이 없으면 생성
+                    if not self.main_questions:
+                        logger.info("대표질문 새로 생성")
+                        await self.generate_main_questions()
+                        if not self.main_questions:
+                            logger.error("대표질문 생성 실패")
+                            return None
+
+                    # 복원된 세션은 이미 물어본 질문만 갖고 있으므로 나머지를 새로 생성해서 이어 붙임
+                    # (생성하는 동안에도 다른 요청은 지금까지의 질문 목록을 그대로 봄)
+                    if index >= len(self.main_questions) and not self.main_questions_complete:
+                        asked = list(self.main_questions)
+                        generated = await self._load_main_questions(self.question_num)
+                        self.main_questions = asked + [q for q in generated if q not in asked][:self.question_num - len(asked)]
+                        self.main_questions_complete = True
+
             # 현재 대표질문 인덱스 확인
-            if self.current_main >= len(self.main_questions):
+            if index >= len(self.main_questions):
                 logger.info("모든 대표질문이 반환되었습니다.")
                 # 세션 완료 여부 확인
                 await self.check_session_completion()
                 return None
 
             # 현재 질문 반환 (인덱싱 제거)
-            question = self.main_questions[self.current_main]
+            question = self.main_questions[index]
             # 인덱싱 제거 (예: "1. ", "2. " 등)
             question = re.sub(r'^\d+\.\s*', '', question)
-            logger.info(f"대표질문 {self.current_main + 1} 반환: {question}")
+            logger.info(f"대표질문 {index + 1} 반환: {question}")
             
             return question
             
@@ -209,75 +383,71 @@ class InterviewSession:
 
     # 꼬리질문 생성
     async def generate_follow_up(self, last_answer: str):
-        """사용자 답변을 바탕으로 꼬리질문을 생성하는 메서드"""
+        """사용자 답변을 바탕으로 꼬리질문을 생성하는 메서드 (DB 저장은 호출하는 쪽에서 message_log로)
+        꼬리질문 한도에 도달했거나 생성에 실패하면 None (세션에 추가하지 않으므로 저장 / 진행도 하지 않음)"""
         try:
             # 현재 대표질문에 대한 꼬리질문 개수 확인
             if len(self.follow_up_questions[self.current_main]) >= self.answer_per_question - 1:
                 logger.warning(f"더 이상의 꼬리질문이 없습니다. (대표질문 {self.current_main + 1})")
-                return "더 이상의 꼬리질문이 없습니다."
-            
-            # 현재 대표질문 가져오기
-            current_main_question = self.main_questions[self.current_main] if self.main_questions else ""
-            
-            # 프롬프트 준비
-            prompt = PromptTemplate(
-                template=self._get_follow_up_template(),
-                input_variables=['main_question', 'answer', 'previous_follow_ups']
-            )
-            
-            # 이전 꼬리질문들 컨텍스트 구성
-            previous_follow_ups = "\n".join(self.follow_up_questions[self.current_main])
+                return None
             
             # LLMChain 생성 및 실행
-            chain = LLMChain(prompt=prompt, llm=self.llm)
-            response = await chain.ainvoke({
-                'main_question': current_main_question,
-                'answer': last_answer,
-                'previous_follow_ups': previous_follow_ups
-            })
-            
-            if not response or not isinstance(response, dict):
-                logger.error(f"잘못된 응답 형식: {response}")
-                return "꼬리질문을 생성할 수 없습니다."
+            chain, inputs = self._follow_up_chain(last_answer)
+            response_text = await llm_cache.ainvoke(chain, "follow_up", inputs)
             
             # 응답에서 텍스트 추출 및 정제
-            question = response.get('text', '').strip()
+            question = response_text.strip()
             if not question:
                 logger.error("응답에서 텍스트를 찾을 수 없습니다.")
-                return "꼬리질문을 생성할 수 없습니다."
-
-            # DB에 저장
-            db = SessionLocal()
-            try:
-                session = db.query(InterviewSessionDB).filter_by(session_token=self.token).first()
-                if not session:
-                    logger.error(f"세션을 찾을 수 없음: {self.token}")
-                    return "꼬리질문을 생성할 수 없습니다."
-
-                new_follow_up = ChatMessageDB(
-                    session_id=session.id,
-                    message_type="follow_up",
-                    content=question
-                )
-                db.add(new_follow_up)
-                db.commit()
-                db.refresh(new_follow_up)
-                
-                # 꼬리질문 저장
-                self.follow_up_questions[self.current_main].append(question)
-                logger.info(f"꼬리질문 생성 성공 (대표질문 {self.current_main + 1}): {question}")
-                return question
-                
-            except Exception as e:
-                logger.error(f"DB 저장 중 오류: {str(e)}")
-                db.rollback()
-                return "꼬리질문을 생성할 수 없습니다."
-            finally:
-                db.close()
+                return None
+
+            # 꼬리질문 저장
+            self.follow_up_questions[self.current_main].append(question)
+            logger.info(f"꼬리질문 생성 성공 (대표질문 {self.current_main + 1}): {question}")
+            return question
 
         except Exception as e:
             logger.error(f"꼬리질문 생성 중 오류: {str(e)}")
-            return "꼬리질문을 생성할 수 없습니다."
+            return None
+
+    def _follow_up_chain(self, last_answer: str):
+        """꼬리질문 생성용 LLMChain과 입력값 준비"""
+        # 현재 대표질문 가져오기
+        current_main_question = self.main_questions[self.current_main] if self.main_questions else ""
+        
+        # 프롬프트 준비
+        prompt = PromptTemplate(
+            template=self._get_follow_up_template(),
+            input_variables=['main_question', 'answer', 'previous_follow_ups']
+        )
+        
+        # 이전 꼬리질문들 컨텍스트 구성
+        previous_follow_ups = "\n".join(self.follow_up_questions[self.current_main])
+        
+        chain = LLMChain(prompt=prompt, llm=self.llm)
+        return chain, {
+            'main_question': current_main_question,
+            'answer': last_answer,
+            'previous_follow_ups': previous_follow_ups
+        }
+
+    async def stream_follow_up(self, last_answer: str):
+        """꼬리질문을 토큰 단위로 생성하는 async generator (DB 저장은 호출하는 쪽에서)
+        꼬리질문 한도에 도달했으면 아무것도 보내지 않음"""
+        if len(self.follow_up_questions[self.current_main]) >= self.answer_per_question - 1:
+            logger.warning(f"더 이상의 꼬리질문이 없습니다. (대표질문 {self.current_main + 1})")
+            return
+
+        chain, inputs = self._follow_up_chain(last_answer)
+        chunks = []
+        async for chunk in llm_cache.astream(chain, "follow_up", inputs):
+            chunks.append(chunk)
+            yield chunk
+
+        question = "".join(chunks).strip()
+        if question:
+            self.follow_up_questions[self.current_main].append(question)
+            logger.info(f"꼬리질문 스트리밍 완료 (대표질문 {self.current_main + 1}): {question}")
 
     def store_user_answer(self, session_id: int, answer: str):
         """사용자의 답변을 저장합니다."""
@@ -296,8 +466,8 @@ class InterviewSession:
         try:
             print(f"힌트 생성 시작 - 질문 인덱스: {question_index}, 질문: {question}")
             
-            # 이력서 텍스트 길이 제한
-            resume_text = self.resume[:1000] if len(self.resume) > 1000 else self.resume
+            # 이력서 원문 대신 토큰 예산 안의 요약 사용
+            await self._resolve_resume_digest()
             
             prompt = PromptTemplate(
                 template=self._get_hint_template(),
@@ -305,11 +475,13 @@ class InterviewSession:
             )
             chain = LLMChain(prompt=prompt, llm=self.llm)
             
-            hint = chain.run({
-                'resume': resume_text,
+            inputs = {
+                'resume': self.resume_digest,
                 'question': question,
                 'question_index': question_index
-            })
+            }
+            resume_digester.report("hint", prompt, inputs, self.resume)
+            hint = await llm_cache.ainvoke(chain, "hint", inputs)
             
             if not hint:
                 raise ValueError(f"질문 {question_index}에 대한 힌트가 생성되지 않았습니다.")
@@ -328,72 +500,62 @@ class InterviewSession:
             return f"질문 {question_index}에 대한 힌트를 생성할 수 없습니다."
 
     async def generate_feedback(self, last_answer: str):
-        """사용자 답변에 대한 피드백을 생성하는 메서드"""
+        """사용자 답변에 대한 피드백을 생성하는 메서드 (DB 저장은 호출하는 쪽에서 message_log로)"""
         try:
-            # 현재 대표질문 가져오기
-            current_main_question = self.main_questions[self.current_main] if self.main_questions else ""
-            
-            # 이전 피드백들 컨텍스트 구성
-            previous_feedbacks = "\n".join(self.feedbacks[self.current_main])
-            
-            # 프롬프트 준비
-            prompt = PromptTemplate(
-                template=self._get_feedback_template(),
-                input_variables=['main_question', 'answer', 'previous_feedbacks']
-            )
-            
             # LLMChain 생성 및 실행
-            chain = LLMChain(prompt=prompt, llm=self.llm)
-            response = await chain.ainvoke({
-                'main_question': current_main_question,
-                'answer': last_answer,
-                'previous_feedbacks': previous_feedbacks
-            })
-            
-            if not response or not isinstance(response, dict):
-                logger.error(f"잘못된 응답 형식: {response}")
-                return "피드백을 생성할 수 없습니다."
+            chain, inputs = self._feedback_chain(last_answer)
+            response_text = await llm_cache.ainvoke(chain, "feedback", inputs)
             
             # 응답에서 텍스트 추출 및 정제
-            feedback = response.get('text', '').strip()
+            feedback = response_text.strip()
             if not feedback:
                 logger.error("응답에서 텍스트를 찾을 수 없습니다.")
                 return "피드백을 생성할 수 없습니다."
 
-            # DB에 저장
-            db = SessionLocal()
-            try:
-                session = db.query(InterviewSessionDB).filter_by(session_token=self.token).first()
-                if not session:
-                    logger.error(f"세션을 찾을 수 없음: {self.token}")
-                    return "피드백을 생성할 수 없습니다."
-
-                new_feedback = ChatMessageDB(
-                    session_id=session.id,
-                    message_type="feedback",
-                    content=feedback
-                )
-                db.add(new_feedback)
-                db.commit()
-                db.refresh(new_feedback)
-                    
-                # 피드백 저장
-                self.feedbacks[self.current_main].append(feedback)
-                logger.info(f"피드백 생성 성공 (대표질문 {self.current_main + 1}): {feedback}")
-                return feedback
-                
-            except Exception as e:
-                logger.error(f"DB 저장 중 오류: {str(e)}")
-                db.rollback()
-                return "피드백을 생성할 수 없습니다."
-            finally:
-                db.close()
+            # 피드백 저장
+            self.feedbacks[self.current_main].append(feedback)
+            logger.info(f"피드백 생성 성공 (대표질문 {self.current_main + 1}): {feedback}")
+            return feedback
 
         except Exception as e:
             logger.error(f"피드백 생성 중 오류: {str(e)}")
             return "피드백을 생성할 수 없습니다."
 
 
+    def _feedback_chain(self, last_answer: str):
+        """피드백 생성용 LLMChain과 입력값 준비"""
+        # 현재 대표질문 가져오기
+        current_main_question = self.main_questions[self.current_main] if self.main_questions else ""
+        
+        # 이전 피드백들 컨텍스트 구성
+        previous_feedbacks = "\n".join(self.feedbacks[self.current_main])
+        
+        # 프롬프트 준비
+        prompt = PromptTemplate(
+            template=self._get_feedback_template(),
+            input_variables=['main_question', 'answer', 'previous_feedbacks']
+        )
+        
+        chain = LLMChain(prompt=prompt, llm=self.llm)
+        return chain, {
+            'main_question': current_main_question,
+            'answer': last_answer,
+            'previous_feedbacks': previous_feedbacks
+        }
+
+    async def stream_feedback(self, last_answer: str):
+        """피드백을 토큰 단위로 생성하는 async generator (DB 저장은 호출하는 쪽에서)"""
+        chain, inputs = self._feedback_chain(last_answer)
+        chunks = []
+        async for chunk in llm_cache.astream(chain, "feedback", inputs):
+            chunks.append(chunk)
+            yield chunk
+
+        feedback = "".join(chunks).strip()
+        if feedback:
+            self.feedbacks[self.current_main].append(feedback)
+            logger.info(f"피드백 스트리밍 완료 (대표질문 {self.current_main + 1}): {feedback}")
+
     def _get_rag_question_template(self):
         return '''
         You are an expert AI job interviewer. Based on the retrieved similar questions and the candidate's resume, generate interview questions.
@@ -405,7 +567,7 @@ class InterviewSession:
         {resume}
 
         [Job Description]
-        {recruit_url}
+        {job_posting}
 
         Requirements:
         1. Generate questions in Korean.
@@ -418,17 +580,17 @@ class InterviewSession:
         '''
 
     def _get_question_template(self):
-        return f'''
+        return '''
         다음 이력서와 채용 공고를 바탕으로 면접 질문을 생성해주세요.
 
         [이력서]
-        {self.resume[:1000]}  # 이력서 텍스트를 1000자로 제한
+        {resume}
 
         [채용 공고]
-        {self.recruit_url[:500]}  # 채용 공고 URL을 500자로 제한
+        {job_posting}
 
         [예시 질문]
-        {self.example_questions}
+        {example_questions}
 
         요구사항:
         1. Be in Korean.
@@ -467,12 +629,12 @@ class InterviewSession:
         '''
 
     def _get_hint_template(self):       # 힌트 생성 프롬프트 템플릿
-        return f'''
+        return '''
         [Resume Context]
-        {self.resume}
+        {resume}
 
         [Current Question]
-        {{question}}
+        {question}
 
         [Guidelines]
         1. Extract three key technical keywords to emphasize in the response.  
@@ -0,0 +1,190 @@
+# LLM 응답 캐시
+# (템플릿 id, 템플릿 내용, 모델, temperature, 정규화된 입력)을 키로 LLMChain 응답을 SQLite에 저장한다.
+# 재시도 / 새로고침 / 같은 이력서 재업로드처럼 입력이 같은 호출은 OpenAI를 거치지 않고 바로 반환된다.
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+import re
+from collections import defaultdict
+from typing import Optional
+
+from config import (LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES,
+                    LLM_CACHE_MAX_BYTES, LLM_CACHE_DISABLED)
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_input(value) -> str:
+    """유니코드 정규화 + 공백 정리 (공백 차이만 있는 입력은 같은 키가 되도록)"""
+    text = unicodedata.normalize("NFC", str(value))
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class LLMCache:
+    """SQLite 기반 LLM 응답 캐시 (TTL + 개수/크기 상한, 오래 안 쓴 것부터 제거)"""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, max_bytes: int = LLM_CACHE_MAX_BYTES,
+                 enabled: bool = LLM_CACHE_ENABLED, disabled_templates=LLM_CACHE_DISABLED):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.disabled_templates = set(disabled_templates)
+        self._conn = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")  # 여러 uvicorn 워커가 같은 파일을 공유
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    template_id TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def is_enabled(self, template_id: str) -> bool:
+        return self.enabled and template_id not in self.disabled_templates
+
+    @staticmethod
+    def make_key(template_id: str, template: str, model: str, temperature, inputs: dict) -> str:
+        payload = {
+            "template_id": template_id,
+            "template": hashlib.sha256(template.encode("utf-8")).hexdigest(),
+            "model": model,
+            "temperature": temperature,
+            "inputs": {k: normalize_input(v) for k, v in sorted(inputs.items())},
+        }
+        return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return value
+
+    def set(self, key: str, template_id: str, value: str):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, template_id, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, template_id, value, len(value.encode("utf-8")), now, now),
+            )
+            conn.commit()
+            self._writes += 1
+            # 상한 확인은 쓰기 몇 번에 한 번만
+            if self._writes % 50 == 0:
+                self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        if count > self.max_entries or total > self.max_bytes:
+            # 오래 사용하지 않은 항목부터 상한의 90%가 될 때까지 제거
+            rows = conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at ASC").fetchall()
+            doomed = []
+            for key, size in rows:
+                if count <= self.max_entries * 0.9 and total <= self.max_bytes * 0.9:
+                    break
+                doomed.append((key,))
+                count -= 1
+                total -= size
+            conn.executemany("DELETE FROM llm_cache WHERE key = ?", doomed)
+            logger.info(f"LLM 캐시 정리: {len(doomed)}개 제거")
+        conn.commit()
+
+    async def ainvoke(self, chain, template_id: str, inputs: dict) -> str:
+        """캐시를 거쳐 LLMChain을 실행하고 응답 텍스트를 반환"""
+        use_cache = self.is_enabled(template_id)
+        if use_cache:
+            llm = chain.llm
+            key = self.make_key(template_id, chain.prompt.template, getattr(llm, "model_name", ""),
+                                getattr(llm, "temperature", None), inputs)
+            start = time.perf_counter()
+            cached = await asyncio.to_thread(self.get, key)
+            if cached is not None:
+                self.hits[template_id] += 1
+                logger.info(f"⚡ LLM 캐시 적중 - {template_id} ({(time.perf_counter() - start) * 1000:.1f}ms)")
+                return cached
+            self.misses[template_id] += 1
+
+        response = await chain.ainvoke(inputs)
+        text = response.get("text", "") if isinstance(response, dict) else str(response or "")
+
+        if use_cache and text.strip():
+            await asyncio.to_thread(self.set, key, template_id, text)
+        return text
+
+    async def astream(self, chain, template_id: str, inputs: dict):
+        """캐시를 거쳐 LLM 응답을 토큰 단위로 반환하는 async generator (적중 시 전체 텍스트 한 번)"""
+        use_cache = self.is_enabled(template_id)
+        llm = chain.llm
+        if use_cache:
+            key = self.make_key(template_id, chain.prompt.template, getattr(llm, "model_name", ""),
+                                getattr(llm, "temperature", None), inputs)
+            cached = await asyncio.to_thread(self.get, key)
+            if cached is not None:
+                self.hits[template_id] += 1
+                yield cached
+                return
+            self.misses[template_id] += 1
+
+        chunks = []
+        async for chunk in llm.astream(chain.prompt.format(**inputs)):
+            chunks.append(chunk)
+            yield chunk
+
+        text = "".join(chunks)
+        if use_cache and text.strip():
+            await asyncio.to_thread(self.set, key, template_id, text)
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, total = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        templates = set(self.hits) | set(self.misses)
+        return {
+            "enabled": self.enabled,
+            "disabled_templates": sorted(self.disabled_templates),
+            "entries": count,
+            "bytes": total,
+            "ttl": self.ttl,
+            "templates": {t: {"hits": self.hits[t], "misses": self.misses[t]} for t in sorted(templates)},
+        }
+
+
+# 전역 인스턴스 생성
+llm_cache = LLMCache()
@@ -0,0 +1,207 @@
+# 채팅 메시지 기록
+# chat_messages 테이블에 쓰는 곳은 이 모듈 하나뿐이다. 한 턴에 생기는 메시지(답변 / 피드백 / 질문)를 모아 두었다가
+# INSERT 한 번으로 저장하고, 이미 저장된 message_key는 빼고 넣어서 같은 메시지가 두 번 저장되지 않게 한다.
+# ((session_id, message_key) 유니크 키는 마지막 안전장치)
+import logging
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import insert, update, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import ChatMessageDB, InterviewSessionDB
+
+logger = logging.getLogger(__name__)
+
+
+def message_key(message_type: str, main_index: int, ordinal: int = 0) -> str:
+    """세션 안에서 메시지 위치로 정해지는 키 (예: feedback:2:1 = 3번째 대표질문의 2번째 답변에 대한 피드백)"""
+    return f"{message_type}:{main_index}:{ordinal}"
+
+
+class MessageBatch:
+    """한 턴 동안 저장할 메시지 버퍼"""
+
+    def __init__(self, log: "MessageLog", session_id: int):
+        self._log = log
+        self.session_id = session_id
+        self.rows: List[dict] = []
+        self._keys = set()
+
+    def add(self, message_type: str, content: str, main_index: int, ordinal: int = 0) -> "MessageBatch":
+        key = message_key(message_type, main_index, ordinal)
+        if key in self._keys:
+            return self
+        self._keys.add(key)
+        self.rows.append({
+            "session_id": self.session_id,
+            "message_type": message_type,
+            "content": content,
+            "message_key": key,
+        })
+        return self
+
+    async def flush(self, db: AsyncSession) -> int:
+        """버퍼의 메시지를 INSERT 한 번으로 실행 (커밋은 호출하는 쪽에서 스냅샷과 함께)"""
+        if not self.rows:
+            return 0
+        # 세션 행을 먼저 잠가서 같은 세션의 동시 쓰기를 직렬화 (값은 바꾸지 않는 UPDATE)
+        await db.execute(
+            update(InterviewSessionDB)
+            .where(InterviewSessionDB.id == self.session_id)
+            .values(last_message_seq=func.coalesce(InterviewSessionDB.last_message_seq, 0))
+            .execution_options(synchronize_session=False)
+        )
+        # 이미 저장된 키는 건너뜀 (재시도 / 중복 요청) -> seq와 요약 컬럼은 실제로 넣을 메시지로만 계산
+        existing = set((await db.scalars(
+            select(ChatMessageDB.message_key)
+            .where(ChatMessageDB.session_id == self.session_id,
+                   ChatMessageDB.message_key.in_([row["message_key"] for row in self.rows]))
+        )).all())
+        rows = [row for row in self.rows if row["message_key"] not in existing]
+        self.rows = []
+        self._keys.clear()
+        if existing:
+            logger.info(f"이미 저장된 메시지 {len(existing)}개 건너뜀 - 세션: {self.session_id}")
+        if not rows:
+            return 0
+
+        last_seq = await db.scalar(
+            select(InterviewSessionDB.last_message_seq).where(InterviewSessionDB.id == self.session_id))
+        for offset, row in enumerate(rows, start=1):
+            row["seq"] = last_seq + offset
+        await db.execute(insert(ChatMessageDB), rows)
+
+        # 세션 카운터 / 세션 목록 요약 컬럼 갱신
+        last = rows[-1]
+        main_questions = sum(1 for row in rows if row["message_type"] == "main_question")
+        await db.execute(
+            update(InterviewSessionDB)
+            .where(InterviewSessionDB.id == self.session_id)
+            .values(
+                last_message_seq=last["seq"],
+                last_message=last["content"],
+                last_message_type=last["message_type"],
+                main_question_count=func.coalesce(InterviewSessionDB.main_question_count, 0) + main_questions,
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self._log.batches += 1
+        self._log.rows += len(rows)
+        return len(rows)
+
+
+class MessageLog:
+    """세션별 메시지 배치 생성 + 저장 통계"""
+
+    def __init__(self):
+        self.batches = 0
+        self.rows = 0
+
+    def batch(self, session_id: int) -> MessageBatch:
+        return MessageBatch(self, session_id)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "rows_per_batch": round(self.rows / self.batches, 2) if self.batches else 0,
+        }
+
+
+# 전역 인스턴스 생성
+message_log = MessageLog()
+
+
+def _summary(messages) -> dict:
+    """시간순 메시지 목록으로 세션 요약 컬럼 값 계산"""
+    last = messages[-1] if messages else None
+    return {
+        "last_message": last.content if last else None,
+        "last_message_type": last.message_type if last else None,
+        "main_question_count": sum(1 for m in messages if m.message_type == "main_question"),
+        "updated_at": last.created_at if last else None,
+    }
+
+
+def backfill_summaries() -> int:
+    """요약 컬럼이 비어 있는 세션의 마지막 메시지 / 대표질문 수를 메시지로부터 채움"""
+    from db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        session_ids = db.scalars(
+            select(InterviewSessionDB.id).where(InterviewSessionDB.updated_at.is_(None))).all()
+        for session_id in session_ids:
+            messages = db.scalars(
+                select(ChatMessageDB)
+                .where(ChatMessageDB.session_id == session_id)
+                .order_by(ChatMessageDB.seq, ChatMessageDB.created_at, ChatMessageDB.id)
+            ).all()
+            values = _summary(messages)
+            if values["updated_at"] is None:
+                values["updated_at"] = datetime.utcnow()
+            db.execute(update(InterviewSessionDB).where(InterviewSessionDB.id == session_id).values(**values))
+            db.commit()
+        return len(session_ids)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def backfill_seq() -> int:
+    """seq가 없는 메시지가 있는 세션을 (created_at, id) 순서로 다시 번호 매기고 세션 카운터를 맞춤"""
+    from db import SessionLocal
+
+    db = SessionLocal()
+    updated = 0
+    try:
+        session_ids = db.scalars(
+            select(ChatMessageDB.session_id).where(ChatMessageDB.seq.is_(None)).distinct()).all()
+        for session_id in session_ids:
+            messages = db.scalars(
+                select(ChatMessageDB)
+                .where(ChatMessageDB.session_id == session_id)
+                .order_by(ChatMessageDB.created_at, ChatMessageDB.id)
+            ).all()
+            # 유니크 인덱스 충돌을 피하려고 먼저 비운 뒤 세션 전체를 다시 번호 매김
+            for msg in messages:
+                msg.seq = None
+            db.flush()
+            for last_seq, msg in enumerate(messages, start=1):
+                msg.seq = last_seq
+            updated += len(messages)
+            db.execute(update(InterviewSessionDB)
+                       .where(InterviewSessionDB.id == session_id)
+                       .values(last_message_seq=len(messages), **_summary(messages)))
+            db.commit()
+        return updated
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# 실행: python -m utils.message_log backfill-seq | backfill-summary
+#
+# create_all은 이미 있는 테이블에 컬럼을 추가하지 않으므로, 기존 MySQL DB는 backfill-seq 전에 직접 추가한다.
+# 유니크 인덱스는 번호를 다 매긴 뒤에 만든다.
+#   ALTER TABLE chat_messages ADD COLUMN seq INT NULL;
+#   ALTER TABLE interview_sessions ADD COLUMN last_message_seq INT DEFAULT 0;
+#   -- python -m utils.message_log backfill-seq
+#   CREATE UNIQUE INDEX ix_chat_messages_session_seq ON chat_messages (session_id, seq);
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "backfill-seq":
+        print(f"✅ {backfill_seq()}개 메시지에 seq 부여 완료")
+    elif command == "backfill-summary":
+        print(f"✅ {backfill_summaries()}개 세션 요약 갱신 완료")
+    else:
+        print("사용법: python -m utils.message_log backfill-seq | backfill-summary")
+        sys.exit(1)
@@ -0,0 +1,282 @@
+# PDF 텍스트 추출 작업자
+# PyPDF2 파싱은 CPU를 오래 쓰기 때문에 이벤트 루프가 아니라 별도 작업자 프로세스에서 실행한다.
+# 페이지를 몇 장씩 묶어서 여러 작업자에게 나눠 주고, 결과는 순서대로 한 번에 합친다.
+# 같은 파일(SHA-256이 같은 파일)을 다시 올리면 이력서 산출물에 저장해 둔 텍스트를 바로 반환한다.
+# 동시에 처리하는 파일 수와 파일 당 시간을 제한한다.
+# 작업자 프로세스는 PDF_EXTRACT_WORKERS개를 서버 시작 시 미리 띄워 두고 재사용하며,
+# 시간을 넘긴 파일의 작업을 맡고 있던 작업자만 종료하고 새로 띄운다 (다른 파일의 추출에는 영향 없음).
+# uvicorn 프로세스는 스레드를 쓰므로 fork 대신 forkserver(없으면 spawn)로 작업자를 만들고,
+# 결과는 전용 스레드에서 파이프를 읽어서 기다린다 (add_reader를 지원하지 않는 Windows 이벤트 루프 포함).
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple
+
+from PyPDF2 import PdfReader
+
+from config import PDF_EXTRACT_WORKERS, PDF_EXTRACT_TIMEOUT, PDF_EXTRACT_CONCURRENCY, PDF_EXTRACT_PAGES_PER_TASK
+from utils.resume_artifacts import resume_artifacts, ArtifactTextCache
+
+logger = logging.getLogger(__name__)
+
+
+class PDFExtractTimeout(Exception):
+    """파일 하나의 텍스트 추출이 제한 시간을 넘김"""
+
+
+def page_count(pdf_path: str) -> int:
+    return len(PdfReader(pdf_path).pages)
+
+
+def extract_pages(pdf_path: str, start: int = 0, end: Optional[int] = None) -> List[str]:
+    """[start, end) 페이지의 텍스트 목록 (작업자 프로세스에서 실행)"""
+    return _extract_range(PdfReader(pdf_path).pages, start, end)
+
+
+def extract_head(pdf_path: str, end: int) -> Tuple[int, List[str]]:
+    """전체 페이지 수와 앞쪽 [0, end) 페이지 텍스트 (작은 파일은 이 작업 하나로 끝남)"""
+    pages = PdfReader(pdf_path).pages
+    return len(pages), _extract_range(pages, 0, end)
+
+
+def _extract_range(pages, start: int, end: Optional[int]) -> List[str]:
+    end = len(pages) if end is None else min(end, len(pages))
+    return [pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def extract_text(pdf_path: str) -> str:
+    """한 프로세스에서 모든 페이지를 순서대로 추출 (utils.common.load_pdf_to_text와 같은 결과)"""
+    return "".join(extract_pages(pdf_path))
+
+
+def _worker_main(conn):
+    """작업자 프로세스 진입점: (함수, 인자)를 받을 때마다 결과(또는 예외)를 파이프로 돌려줌"""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        func, args = task
+        try:
+            conn.send((True, func(*args)))
+        except Exception as e:
+            try:
+                conn.send((False, e))
+            except Exception:
+                # pickle할 수 없는 예외는 메시지만 전달
+                conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+    conn.close()
+
+
+def _start_method() -> str:
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class _Worker:
+    """작업자 프로세스 하나와 연결된 파이프"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1)
+        if not self.conn.closed:
+            self.conn.close()
+
+
+class WorkerPool:
+    """미리 띄워 둔 작업자 프로세스 풀 (취소된 작업을 맡고 있던 작업자만 새로 교체)"""
+
+    def __init__(self, size: int, start_method: Optional[str] = None):
+        self.size = max(1, size)
+        self.start_method = start_method or _start_method()
+        self._context = multiprocessing.get_context(self.start_method)
+        if self.start_method == "forkserver":
+            # utils 패키지 import가 무거우므로 forkserver에서 한 번만 import하고 작업자는 거기서 fork
+            self._context.set_forkserver_preload([__name__])
+        self._workers: Set[_Worker] = set()
+        self._busy: Set[_Worker] = set()
+        self._idle: Optional[asyncio.Queue] = None
+        self._loop = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.replaced = 0
+
+    def start(self):
+        """작업자 프로세스를 미리 띄움 (서버 시작 시 호출, 호출하지 않으면 첫 작업에서 띄움)"""
+        if self._executor is None:
+            # 작업자마다 결과를 기다리는 스레드 하나 (기본 executor의 to_thread 작업과 섞이지 않게 따로 둠)
+            self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="pdf-extract")
+        while len(self._workers) < self.size:
+            self._workers.add(_Worker(self._context))
+
+    def _idle_queue(self) -> asyncio.Queue:
+        # 이벤트 루프가 바뀌면 (벤치마크 / 테스트의 asyncio.run) 쉬고 있는 작업자로 대기열을 다시 만듦
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self.start()
+            self._loop = loop
+            self._idle = asyncio.Queue()
+            for worker in self._workers:
+                self._idle.put_nowait(worker)
+        return self._idle
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        worker.kill()
+        self._workers.discard(worker)
+        replacement = _Worker(self._context)
+        self._workers.add(replacement)
+        self.replaced += 1
+        return replacement
+
+    async def run(self, func, *args):
+        """쉬는 작업자에게 func(*args)를 맡기고 결과를 기다림 (func / args / 결과는 pickle 가능해야 함)"""
+        idle = self._idle_queue()
+        worker = await idle.get()
+        self._busy.add(worker)
+        try:
+            if not worker.process.is_alive():
+                worker = self._replace(worker)
+            worker.conn.send((func, args))
+            ok, value = await asyncio.get_running_loop().run_in_executor(self._executor, worker.conn.recv)
+        except asyncio.CancelledError:
+            # 시간 초과로 취소됨 -> 아직 계산 중인 이 작업자만 종료 (결과를 기다리던 스레드는 EOF로 풀림)
+            self._busy.discard(worker)
+            worker = self._replace(worker)
+            raise
+        except (EOFError, OSError):
+            self._busy.discard(worker)
+            worker.process.join(1)
+            exitcode = worker.process.exitcode
+            worker = self._replace(worker)
+            raise RuntimeError(f"PDF 추출 작업자가 비정상 종료되었습니다. (exit code {exitcode})")
+        finally:
+            self._busy.discard(worker)
+            idle.put_nowait(worker)
+        if not ok:
+            raise value
+        return value
+
+    def busy(self) -> int:
+        return len(self._busy)
+
+    def shutdown(self):
+        for worker in list(self._workers):
+            worker.kill()
+        self._workers.clear()
+        self._busy.clear()
+        self._loop = None
+        self._idle = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def file_sha256(pdf_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PDFExtractor:
+    """작업자 프로세스 풀 기반 PDF 텍스트 추출기"""
+
+    def __init__(self, workers: int = PDF_EXTRACT_WORKERS, timeout: float = PDF_EXTRACT_TIMEOUT,
+                 concurrency: int = PDF_EXTRACT_CONCURRENCY, pages_per_task: int = PDF_EXTRACT_PAGES_PER_TASK,
+                 cache: Optional[ArtifactTextCache] = None):
+        self.workers = workers
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.pages_per_task = pages_per_task
+        self.cache = cache
+        self.pool = WorkerPool(workers)
+        self._semaphore = None
+        self.extracted = 0
+        self.pages = 0
+        self.timeouts = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+
+    def start(self):
+        """작업자 프로세스 미리 띄우기"""
+        self.pool.start()
+
+    async def _extract_parallel(self, pdf_path: str) -> str:
+        # 첫 작업이 페이지 수를 알려주면서 앞쪽 페이지도 같이 추출
+        total, head = await self.pool.run(extract_head, pdf_path, self.pages_per_task)
+        # 나머지 페이지는 작업자 수만큼만 나눔 (작업마다 PDF를 다시 여는 비용이 있으므로)
+        remaining = total - len(head)
+        size = max(self.pages_per_task, -(-remaining // self.workers)) if remaining > 0 else 0
+        ranges = [(start, min(start + size, total)) for start in range(len(head), total, size or 1)]
+        parts = await asyncio.gather(*(self.pool.run(extract_pages, pdf_path, start, end) for start, end in ranges))
+        self.pages += total
+        # 페이지 순서대로 한 번에 합침 (문자열을 반복해서 이어 붙이지 않음)
+        return "".join(text for part in [head, *parts] for text in part)
+
+    async def extract(self, pdf_path: str, digest: Optional[str] = None) -> str:
+        """PDF 텍스트 추출 (digest: 파일 SHA-256, 있으면 캐시 조회)"""
+        if self.cache is not None:
+            if digest is None:
+                digest = await asyncio.to_thread(file_sha256, pdf_path)
+            cached = await asyncio.to_thread(self.cache.get, digest)
+            if cached is not None:
+                logger.info(f"⚡ PDF 텍스트 캐시 적중 ({digest[:12]}): {pdf_path}")
+                return cached
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                # 시간을 넘기면 남은 작업이 취소되고, 그 작업을 맡은 작업자만 풀에서 교체됨
+                text = await asyncio.wait_for(self._extract_parallel(pdf_path), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                logger.warning(f"PDF 텍스트 추출 시간 초과 ({self.timeout}s): {pdf_path}")
+                raise PDFExtractTimeout(f"PDF 텍스트 추출이 {self.timeout:.0f}초를 넘었습니다.")
+            except Exception:
+                self.failed += 1
+                raise
+            elapsed = time.perf_counter() - start
+            self.extracted += 1
+            self.total_seconds += elapsed
+            logger.info(f"PDF 텍스트 추출 완료 ({len(text)}자, {elapsed:.2f}s): {pdf_path}")
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.set, digest, text)
+        return text
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "timeout": self.timeout,
+            "concurrency": self.concurrency,
+            "pages_per_task": self.pages_per_task,
+            "start_method": self.pool.start_method,
+            "busy_workers": self.pool.busy(),
+            "replaced_workers": self.pool.replaced,
+            "extracted": self.extracted,
+            "pages": self.pages,
+            "timeouts": self.timeouts,
+            "failed": self.failed,
+            "avg_seconds": round(self.total_seconds / self.extracted, 3) if self.extracted else 0,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+
+# 전역 인스턴스 생성
+pdf_extractor = PDFExtractor(cache=ArtifactTextCache(resume_artifacts))
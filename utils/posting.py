@@ -0,0 +1,233 @@
+# 채용 공고 요약
+# 이력서 업로드 시 채용 공고 URL을 백그라운드에서 가져와서 (utils.http_fetch) 메뉴 / 약관 같은 잡음을 빼고
+# 주요업무 / 자격요건 / 우대사항 위주로 POSTING_SUMMARY_CHARS 이내의 요약을 만든다.
+# 요약은 URL별로 SQLite에 저장해서 같은 공고를 올린 다른 사용자도 그대로 사용하고,
+# 면접 질문을 만들 때는 저장된 요약만 조회한다. (요청 처리 중에 네트워크를 기다리지 않음)
+# URL이 아니라 공고 내용을 직접 붙여넣은 경우에는 그 텍스트를 같은 방식으로 요약한다.
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from config import (POSTING_SUMMARY_CHARS, POSTING_CACHE_PATH, POSTING_TTL, POSTING_RETRY_AFTER,
+                    POSTING_CACHE_MAX_ENTRIES)
+from utils.http_fetch import FetchError, PageFetcher, normalize_url, page_fetcher
+
+logger = logging.getLogger(__name__)
+
+# 공고 본문이 시작되는 소제목
+_SECTION_PATTERN = re.compile(
+    r"주요\s*업무|담당\s*업무|업무\s*내용|자격\s*요건|지원\s*자격|필수\s*요건|우대\s*사항|기술\s*스택|개발\s*환경|"
+    r"모집\s*부문|모집\s*요강|근무\s*조건|responsibilit|requirements?|qualifications?|preferred|what you.?ll do",
+    re.IGNORECASE)
+# 공고 내용과 관계없는 짧은 문구 (메뉴 / 버튼 / 약관)
+_BOILERPLATE_PATTERN = re.compile(
+    r"로그인|회원가입|고객센터|개인정보|이용약관|공유하기|스크랩|목록으로|바로가기|copyright|©|all rights reserved",
+    re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+def summarize_posting(title: str, text: str, max_chars: int = POSTING_SUMMARY_CHARS) -> str:
+    """제목 + 공고 본문 줄들을 max_chars 이내로 (중복 / 잡음 줄 제거, 소제목 이전 머리말은 몇 줄만)"""
+    lines, seen = [], set()
+    for line in text.splitlines():
+        line = _SPACES.sub(" ", line).strip()
+        if len(line) < 2 or (len(line) < 40 and _BOILERPLATE_PATTERN.search(line)):
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+
+    start = next((i for i, line in enumerate(lines) if len(line) <= 30 and _SECTION_PATTERN.search(line)), None)
+    if start is not None:
+        # 소제목 바로 앞의 회사 / 포지션 소개 몇 줄만 남김
+        lines = lines[max(start - 5, 0):]
+    title = _SPACES.sub(" ", title or "").strip()
+    if title and title.lower() not in seen:
+        lines.insert(0, title)
+
+    summary, length = [], 0
+    for line in lines:
+        if length + len(line) + 1 > max_chars:
+            if not summary:
+                summary.append(line[:max_chars])
+            break
+        summary.append(line)
+        length += len(line) + 1
+    return "\n".join(summary)
+
+
+class PostingStore:
+    """URL -> 공고 요약 SQLite 저장소 (실패도 POSTING_RETRY_AFTER 동안 기록해서 반복 요청 방지)"""
+
+    def __init__(self, path: str = POSTING_CACHE_PATH, ttl: float = POSTING_TTL,
+                 retry_after: float = POSTING_RETRY_AFTER, max_entries: int = POSTING_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.max_entries = max_entries
+        self._conn = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")  # 여러 uvicorn 워커가 같은 파일을 공유
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS postings (
+                    url TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_postings_accessed ON postings (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, url: str) -> Optional[dict]:
+        """{"status": "ready" | "failed", ...} (만료됐으면 None)"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT status, value, expires_at FROM postings WHERE url = ?", (url,)).fetchone()
+            if row is None or row[2] < now:
+                return None
+            conn.execute("UPDATE postings SET accessed_at = ? WHERE url = ?", (now, url))
+            conn.commit()
+        return {"status": row[0], **json.loads(row[1])}
+
+    def set(self, url: str, status: str, value: dict):
+        now = time.time()
+        expires_at = now + (self.ttl if status == "ready" else self.retry_after)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO postings (url, status, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (url, status, json.dumps(value, ensure_ascii=False), expires_at, now),
+            )
+            conn.commit()
+            self._writes += 1
+            if self._writes % 50 == 0:
+                self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM postings WHERE expires_at < ?", (now,))
+        count = conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute("DELETE FROM postings WHERE url IN "
+                         "(SELECT url FROM postings ORDER BY accessed_at ASC LIMIT ?)",
+                         (count - self.max_entries,))
+        conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+
+class PostingIngestor:
+    """채용 공고 가져오기 + 요약 백그라운드 작업 관리 (같은 URL은 한 번만)"""
+
+    def __init__(self, fetcher: PageFetcher, store: PostingStore, max_chars: int = POSTING_SUMMARY_CHARS):
+        self.fetcher = fetcher
+        self.store = store
+        self.max_chars = max_chars
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.ready = 0
+        self.failed = 0
+        self.lookups = {"ready": 0, "pending": 0, "missing": 0, "text": 0}
+
+    @staticmethod
+    def _key(recruit_url: str) -> Optional[str]:
+        try:
+            return normalize_url(recruit_url)
+        except FetchError:
+            return None
+
+    def start(self, recruit_url: str) -> Optional[asyncio.Task]:
+        """공고 요약 작업 시작 (URL이 아니거나 이미 진행 중이면 기존 작업 / None)"""
+        url = self._key(recruit_url)
+        if url is None:
+            return None
+        task = self._tasks.get(url)
+        if task is not None and not task.done():
+            return task
+        task = self._tasks[url] = asyncio.get_running_loop().create_task(self._ingest(url))
+        task.add_done_callback(lambda done: self._tasks.pop(url, None) if self._tasks.get(url) is done else None)
+        return task
+
+    async def _ingest(self, url: str) -> Optional[dict]:
+        entry = await asyncio.to_thread(self.store.get, url)
+        if entry is not None:
+            return entry
+        self.started += 1
+        start = time.perf_counter()
+        try:
+            page = await self.fetcher.fetch(url)
+            summary = await asyncio.to_thread(summarize_posting, page["title"], page["text"], self.max_chars)
+            entry = {"title": page["title"], "summary": summary, "chars": page["chars"]}
+            status = "ready" if summary else "failed"
+        except FetchError as e:
+            entry, status = {"error": str(e)}, "failed"
+        except Exception as e:
+            logger.warning(f"채용 공고 요약 실패 ({url[:200]}): {str(e)}")
+            self.failed += 1
+            return None
+        await asyncio.to_thread(self.store.set, url, status, entry)
+        if status == "ready":
+            self.ready += 1
+            logger.info(f"✅ 채용 공고 요약 완료 ({len(entry['summary'])}자, "
+                        f"{time.perf_counter() - start:.2f}s): {url[:200]}")
+        else:
+            self.failed += 1
+            logger.warning(f"채용 공고를 가져오지 못했습니다 ({url[:200]}): {entry.get('error', '본문 없음')}")
+        return {"status": status, **entry}
+
+    async def lookup(self, recruit_url: str) -> str:
+        """준비된 공고 요약 (아직 없으면 빈 문자열, 네트워크 요청은 기다리지 않음)"""
+        url = self._key(recruit_url)
+        if url is None:
+            # URL 대신 공고 내용을 직접 입력한 경우
+            self.lookups["text"] += 1
+            return summarize_posting("", recruit_url, self.max_chars)
+        entry = await asyncio.to_thread(self.store.get, url)
+        if entry is not None and entry["status"] == "ready":
+            self.lookups["ready"] += 1
+            return entry["summary"]
+        if entry is None:
+            # 다른 워커에서 업로드됐거나 만료된 경우 -> 다음 단계부터 쓸 수 있도록 시작만 해 둠
+            self.start(url)
+        self.lookups["pending" if url in self._tasks else "missing"] += 1
+        return ""
+
+    async def aclose(self):
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "summary_chars": self.max_chars,
+            "stored": self.store.size(),
+            "running": sum(1 for task in self._tasks.values() if not task.done()),
+            "started": self.started,
+            "ready": self.ready,
+            "failed": self.failed,
+            # 질문 생성 시점에 요약이 준비돼 있었는지 (pending: 아직 가져오는 중, missing: 실패 / 없음)
+            "lookups": dict(self.lookups),
+        }
+
+
+# 전역 인스턴스 생성
+posting_ingestor = PostingIngestor(page_fetcher, PostingStore())
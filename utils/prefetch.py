@@ -0,0 +1,102 @@
+# 백그라운드 선행 생성 스케줄러
+# 면접 시작 후 다음 대표질문 / 힌트 / 추천 영상을 미리 만들어 둔다.
+# 사용자 요청이 처리되는 동안에는 다음 단계로 넘어가지 않아서 실제 요청보다 우선순위가 낮다.
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Iterable
+
+from config import PREFETCH_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchScheduler:
+    """토큰별 선행 생성 작업 관리"""
+
+    def __init__(self, max_concurrency: int = PREFETCH_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._interactive = 0
+        self._idle = None
+        self._semaphore = None
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.steps = 0
+
+    def _ensure_primitives(self):
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            self._idle.set()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    @asynccontextmanager
+    async def interactive(self):
+        """사용자 요청 처리 구간 표시 (이 구간 동안 선행 생성은 대기)"""
+        self._ensure_primitives()
+        self._interactive += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._interactive -= 1
+            if self._interactive == 0:
+                self._idle.set()
+
+    async def _wait_for_idle(self):
+        while self._interactive > 0:
+            await self._idle.wait()
+
+    def schedule(self, token: str, steps: Iterable[Callable[[], Awaitable]]):
+        """선행 생성 단계들을 순서대로 실행하는 작업 등록 (이미 실행 중이면 무시)"""
+        self._ensure_primitives()
+        task = self._tasks.get(token)
+        if task is not None and not task.done():
+            return
+        self._tasks[token] = asyncio.get_running_loop().create_task(self._run(token, list(steps)))
+
+    async def _run(self, token: str, steps):
+        start = time.perf_counter()
+        try:
+            for step in steps:
+                # 단계마다 사용자 요청이 없을 때까지 양보
+                await self._wait_for_idle()
+                async with self._semaphore:
+                    await self._wait_for_idle()
+                    await step()
+                    self.steps += 1
+            self.completed += 1
+            logger.info(f"선행 생성 완료 - 토큰: {token} ({time.perf_counter() - start:.2f}s)")
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            logger.info(f"선행 생성 취소 - 토큰: {token}")
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"선행 생성 실패 - 토큰: {token}: {str(e)}")
+        finally:
+            if self._tasks.get(token) is asyncio.current_task():
+                del self._tasks[token]
+
+    def cancel(self, token: str):
+        """세션이 버려지거나 끝나면 남은 선행 생성 취소"""
+        task = self._tasks.pop(token, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "running": sum(1 for task in self._tasks.values() if not task.done()),
+            "interactive_requests": self._interactive,
+            "max_concurrency": self.max_concurrency,
+            "steps": self.steps,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+        }
+
+
+# 전역 인스턴스 생성
+prefetcher = PrefetchScheduler()
@@ -0,0 +1,163 @@
+# FAISS id -> 질문/답변 매핑 저장소
+# 피클 리스트 대신 "오프셋 배열 + UTF-8 blob" 형식으로 저장하고 mmap으로 열어서,
+# 검색 결과로 나온 몇 개의 id만 그때그때 디코딩한다. (전체 역직렬화 없음)
+#
+# 파일 구조 (little-endian)
+#   magic(8) | count(uint64) | offsets(uint64, [2, count + 1]) | blob(UTF-8)
+#   offsets[0] = 질문 오프셋, offsets[1] = 답변 오프셋 (blob 시작 기준)
+import mmap
+import os
+import pickle
+import shutil
+import sys
+import logging
+import tempfile
+from array import array
+from typing import Iterable, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"JOBSQA01"
+FIELDS = ("question", "answer")
+_HEADER_SIZE = len(MAGIC) + 8
+
+
+class QARecord:
+    """필요한 필드만 디코딩하는 레코드 (mapping[i]['question'] 형태로 사용 가능)"""
+    __slots__ = ("_store", "_id")
+
+    def __init__(self, store: "QAMappingStore", id: int):
+        self._store = store
+        self._id = id
+
+    def __getitem__(self, field: str) -> str:
+        return self._store.get(self._id, field)
+
+    def get(self, field: str, default=None):
+        if field not in FIELDS:
+            return default
+        return self._store.get(self._id, field)
+
+
+class QAMappingStore:
+    """mmap으로 연 QA 매핑 파일"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"QA 매핑 파일 형식이 아닙니다: {path}")
+
+        count = int(np.frombuffer(self._mm, dtype="<u8", count=1, offset=len(MAGIC))[0])
+        self._count = count
+        # 오프셋 배열도 복사 없이 mmap 위에서 바로 읽음
+        self._offsets = np.frombuffer(self._mm, dtype="<u8", count=len(FIELDS) * (count + 1),
+                                      offset=_HEADER_SIZE).reshape(len(FIELDS), count + 1)
+        self._blob_start = _HEADER_SIZE + self._offsets.nbytes
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, id: int) -> QARecord:
+        id = int(id)
+        if not 0 <= id < self._count:
+            raise IndexError(f"QA 매핑 범위를 벗어난 id: {id}")
+        return QARecord(self, id)
+
+    def raw(self, id: int, field: str = "question") -> memoryview:
+        """UTF-8 바이트를 복사 없이 반환"""
+        row = FIELDS.index(field)
+        start = self._blob_start + int(self._offsets[row, id])
+        end = self._blob_start + int(self._offsets[row, id + 1])
+        return memoryview(self._mm)[start:end]
+
+    def get(self, id: int, field: str = "question") -> str:
+        return str(self.raw(id, field), "utf-8")
+
+    def questions(self, ids: Iterable[int]) -> List[str]:
+        return [self.get(int(i), "question") for i in ids if 0 <= int(i) < self._count]
+
+
+class QAMappingWriter:
+    """레코드를 하나씩 받아서 QA 매핑 파일을 만드는 작성기
+    필드별 blob은 임시 파일에 바로 쓰고 길이만 메모리에 들고 있어서, 레코드 수가 많아도 메모리 사용이 작다.
+    """
+
+    def __init__(self, out_path: str):
+        self.out_path = out_path
+        directory = os.path.dirname(os.path.abspath(out_path))
+        self._blobs = {field: tempfile.TemporaryFile(dir=directory) for field in FIELDS}
+        self._lengths = {field: array("Q") for field in FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._lengths[FIELDS[0]])
+
+    def add(self, record: dict):
+        for field in FIELDS:
+            value = record.get(field)
+            data = ("" if value is None else str(value)).encode("utf-8")
+            self._blobs[field].write(data)
+            self._lengths[field].append(len(data))
+
+    def close(self) -> int:
+        """오프셋을 계산해서 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        count = len(self)
+        offsets = np.zeros((len(FIELDS), count + 1), dtype="<u8")
+        position = 0
+        for row, field in enumerate(FIELDS):
+            # 다음 필드는 이전 필드 blob 바로 뒤에서 시작
+            offsets[row, 0] = position
+            offsets[row, 1:] = position + np.cumsum(np.frombuffer(self._lengths[field], dtype=np.uint64))
+            position = int(offsets[row, -1])
+
+        tmp_path = f"{self.out_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(np.uint64(count).astype("<u8").tobytes())
+            f.write(offsets.tobytes())
+            for field in FIELDS:
+                blob = self._blobs[field]
+                blob.seek(0)
+                shutil.copyfileobj(blob, f)
+                blob.close()
+        os.replace(tmp_path, self.out_path)
+        return count
+
+
+def write_qa_mapping(records: Iterable[dict], out_path: str) -> int:
+    """{'question', 'answer'} 레코드들을 QA 매핑 파일로 저장"""
+    writer = QAMappingWriter(out_path)
+    for record in records:
+        writer.add(record)
+    return writer.close()
+
+
+def convert_pickle(pkl_path: str, out_path: str) -> int:
+    """기존 faiss_qa_mapping.pkl (list of dict)을 QA 매핑 파일로 변환"""
+    with open(pkl_path, "rb") as f:
+        records = pickle.load(f)
+    count = write_qa_mapping(records, out_path)
+    logger.info(f"✅ QA 매핑 변환 완료: {pkl_path} -> {out_path} ({count}개)")
+    return count
+
+
+def load_mapping(path: str):
+    """확장자에 따라 QA 매핑 로드 (.pkl은 이전 형식 호환용)"""
+    if path.endswith(".pkl"):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    return QAMappingStore(path)
+
+
+# 실행: python -m utils.qa_store <faiss_qa_mapping.pkl> [출력 경로]
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python -m utils.qa_store <faiss_qa_mapping.pkl> [출력 경로]")
+        sys.exit(1)
+    src = sys.argv[1]
+    dst = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(src)[0] + ".qa"
+    total = convert_pickle(src, dst)
+    print(f"✅ {total}개 QA 변환 완료: {dst}")
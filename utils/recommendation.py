@@ -1,43 +1,222 @@
+# 영상 추천 서비스
+# 영상 메타데이터(youtube_data.json)는 서버 전체에서 한 번만 NumPy 배열로 만들어 두고,
+# 이력서별 추천 결과는 이력서 해시 단위로 캐시한다. (FAISS 인덱스가 다시 만들어지면 캐시 무효화)
+# 여러 이력서를 한 번에 추천할 때는 임베딩도 FAISS 검색도 행렬 한 번으로 처리한다.
+import os
+import json
+import asyncio
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
 import numpy as np
-import pandas as pd
-from sentence_transformers import SentenceTransformer
-import faiss 
+from utils.embedding import embedding_registry
+from utils.faiss_store import faiss_indexes
+from utils.resume_artifacts import resume_artifacts, short_hash
 # from pymongo import MongoClient
 from routers.pdf_storage import pdf_storage
 from langchain_community.llms import OpenAI  # 새로운 방식
+from config import RECOMMEND_TOP_N, RECOMMEND_CACHE_MAX_ENTRIES
 
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+YOUTUBE_DATA_PATH = os.path.join(BASE_DIR, "youtube_data.json")
+
+
+class VideoCatalog:
+    """FAISS id 순서의 영상 메타데이터 배열 (id / 제목 / 썸네일 / URL)"""
+
+    def __init__(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            videos = json.load(f)
+        self.path = path
+        self.signature = _file_signature(path)
+        self.video_ids = np.array([str(v["video_id"]) for v in videos], dtype=np.str_)
+        self.titles = np.array([str(v["title"]) for v in videos], dtype=np.str_)
+        # 응답에 들어갈 문자열은 미리 만들어 둠
+        self.thumbnails = np.char.add(np.char.add("https://img.youtube.com/vi/", self.video_ids), "/maxresdefault.jpg")
+        self.urls = np.char.add("https://www.youtube.com/watch?v=", self.video_ids)
+
+    def __len__(self) -> int:
+        return len(self.video_ids)
+
+    def rows(self, ids: np.ndarray) -> List[dict]:
+        """검색 결과 id 배열 -> 응답 목록 (범위를 벗어난 id(-1 등)는 제외)"""
+        ids = ids[(ids >= 0) & (ids < len(self.video_ids))]
+        return [
+            {"id": video_id, "title": title, "thumbnail": thumbnail, "url": url}
+            for video_id, title, thumbnail, url in zip(
+                self.video_ids[ids].tolist(), self.titles[ids].tolist(),
+                self.thumbnails[ids].tolist(), self.urls[ids].tolist())
+        ]
+
+
+def _file_signature(path: str):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class RecommendationService:
+    """프로세스 전역 영상 추천 서비스"""
+
+    def __init__(self, data_path: str = YOUTUBE_DATA_PATH, top_n: int = RECOMMEND_TOP_N,
+                 max_entries: int = RECOMMEND_CACHE_MAX_ENTRIES):
+        self.data_path = data_path
+        self.top_n = top_n
+        self.max_entries = max_entries
+        self._catalog: Optional[VideoCatalog] = None
+        self._fingerprint = None
+        self._cache: "OrderedDict[Tuple[str, int], list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.batches = 0
+
+    def _prepare(self):
+        """현재 인덱스 핸들과 메타데이터 반환 (인덱스나 메타데이터 파일이 바뀌었으면 캐시 비움)"""
+        index = faiss_indexes.get("youtube")
+        with self._lock:
+            catalog = self._catalog
+            if catalog is None or _file_signature(self.data_path) != catalog.signature:
+                catalog = self._catalog = VideoCatalog(self.data_path)
+                logger.info(f"✅ 영상 메타데이터 로드 완료 ({len(catalog)}개)")
+                self._invalidate()
+            if index.fingerprint != self._fingerprint:
+                self._fingerprint = index.fingerprint
+                self._invalidate()
+            if len(catalog) != index.ntotal:
+                logger.warning(f"영상 메타데이터 수({len(catalog)})와 인덱스 벡터 수({index.ntotal})가 다릅니다.")
+        return index, catalog
+
+    def _invalidate(self):
+        if self._cache:
+            self.invalidations += 1
+        self._cache.clear()
+
+    @staticmethod
+    def _resume_key(resume_text: str, resume_hash: Optional[str]) -> str:
+        return resume_hash or short_hash(resume_text, 64)
+
+    def _cache_get(self, key) -> Optional[list]:
+        with self._lock:
+            value = self._cache.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _cache_put(self, key, value: list):
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    async def _vectors(self, items: Sequence[Tuple[str, Optional[str]]]) -> np.ndarray:
+        """이력서별 임베딩 (저장된 것은 재사용, 나머지는 한 번에 인코딩)"""
+        model = short_hash(embedding_registry.get("youtube").model_name, 8)
+        name = f"embedding.youtube.{model}"
+        vectors: List[Optional[np.ndarray]] = [None] * len(items)
+        missing = []
+        for i, (text, resume_hash) in enumerate(items):
+            stored = await asyncio.to_thread(resume_artifacts.get, resume_hash, name, "npy") if resume_hash else None
+            if stored is not None:
+                vectors[i] = np.asarray(stored, dtype="float32").reshape(-1)
+            else:
+                missing.append(i)
+        if missing:
+            encoded = await embedding_registry.encode("youtube", [items[i][0] for i in missing])
+            for row, i in enumerate(missing):
+                vectors[i] = encoded[row]
+                resume_hash = items[i][1]
+                if resume_hash:
+                    await asyncio.to_thread(resume_artifacts.put, resume_hash, name, encoded[row:row + 1], "npy")
+        return np.ascontiguousarray(np.vstack(vectors), dtype="float32")
+
+    async def recommend_many(self, items: Sequence[Tuple[str, Optional[str]]],
+                             top_n: Optional[int] = None) -> List[list]:
+        """(이력서 텍스트, 이력서 해시) 목록의 추천 결과 (캐시에 없는 것만 행렬 한 번으로 검색)"""
+        top_n = top_n or self.top_n
+        # 인덱스 / 메타데이터 파일 확인과 다시 읽기는 이벤트 루프 밖에서
+        index, catalog = await asyncio.to_thread(self._prepare)
+        results: List[Optional[list]] = [None] * len(items)
+        pending: Dict[str, List[int]] = {}
+        for i, (text, resume_hash) in enumerate(items):
+            if not text:
+                results[i] = []
+                continue
+            key = self._resume_key(text, resume_hash)
+            cached = self._cache_get((key, top_n))
+            if cached is None and resume_hash:
+                cached = await asyncio.to_thread(
+                    resume_artifacts.get, resume_hash, f"recommendations.youtube.{index.fingerprint}.{top_n}")
+                if cached is not None:
+                    self._cache_put((key, top_n), cached)
+            if cached is not None:
+                results[i] = cached
+            else:
+                # 같은 이력서가 여러 번 들어오면 한 번만 검색
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            first = [positions[0] for positions in pending.values()]
+            vectors = await self._vectors([items[i] for i in first])
+            distances, ids = index.search(vectors, top_n)
+            self.batches += 1
+            for row, (key, positions) in enumerate(pending.items()):
+                rows = catalog.rows(ids[row])
+                self._cache_put((key, top_n), rows)
+                resume_hash = items[positions[0]][1]
+                if resume_hash:
+                    await asyncio.to_thread(
+                        resume_artifacts.put, resume_hash, f"recommendations.youtube.{index.fingerprint}.{top_n}", rows)
+                for i in positions:
+                    results[i] = rows
+        return results
+
+    async def recommend(self, resume_text: str, resume_hash: Optional[str] = None,
+                        top_n: Optional[int] = None) -> list:
+        return (await self.recommend_many([(resume_text, resume_hash)], top_n))[0]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "videos": len(self._catalog) if self._catalog else None,
+            "index_fingerprint": self._fingerprint,
+            "cached_resumes": len(self._cache),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+            "invalidations": self.invalidations,
+            "search_batches": self.batches,
+        }
+
+
+# 전역 인스턴스 생성
+recommendation_service = RecommendationService()
 
-def load_faiss_index(faiss_path):
-    try:
-        index = faiss.read_index(faiss_path)
-        print(f"✅ FAISS 인덱스 로드 완료: {faiss_path}")
-        return index
-    except Exception as e:
-        print(f"❌ FAISS 인덱스 로드 실패: {str(e)}")
-        return None
 
 class RecommendVideo:
-    def __init__(self, token: str, video_database: pd.DataFrame, top_n=6):
+    def __init__(self, token: str, top_n=RECOMMEND_TOP_N):
         self.token = token 
-        self.video_database = video_database
         self.top_n = top_n
         
         # pdf_storage에서 이력서 텍스트 가져오기
-        pdf_data = pdf_storage.get_pdf(token)
+        pdf_data = pdf_storage.get_pdf(token) or {}
         self.resume_text = pdf_data.get("resume_text", "")
+        # 같은 이력서면 다른 토큰에서 계산한 임베딩 / 추천 결과를 재사용
+        self.resume_hash = pdf_data.get("resume_hash")
         
         if not self.resume_text:
             print(f"❌ 이력서 텍스트를 찾을 수 없음 (토큰: {token})")
         else:
             print(f"✅ 이력서 텍스트 로드 완료 (길이: {len(self.resume_text)})")
-        
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        # 이력서 텍스트 벡터화
-        self.resume_vector = self.model.encode([self.resume_text], convert_to_numpy=True)
-        
-        # FAISS 인덱스 로드
-        self.index = load_faiss_index("utils/youtube.faiss")
     
     async def recommend_videos(self):
         if not self.resume_text:
@@ -45,19 +224,8 @@ class RecommendVideo:
             return []
 
         try:
-            # FAISS 인덱스를 이용한 검색
-            D, I = self.index.search(self.resume_vector, self.top_n)
-            
-            recommendations = []
-            for idx in I[0]:
-                video_info = self.video_database.iloc[idx]
-                recommendations.append({
-                    "id": video_info["video_id"],  # YouTube 비디오 ID
-                    "title": video_info["title"],
-                    "thumbnail": f"https://img.youtube.com/vi/{video_info['video_id']}/maxresdefault.jpg",
-                    "url": f"https://www.youtube.com/watch?v={video_info['video_id']}"
-                })
-            
+            # 모델 / 인덱스 / 메타데이터는 서버 전체에서 공유하는 추천 서비스가 보관
+            recommendations = await recommendation_service.recommend(self.resume_text, self.resume_hash, self.top_n)
             print(f"✅ 추천 완료: {len(recommendations)}개 영상")
             return recommendations
 
@@ -0,0 +1,137 @@
+# 이력서 내용 기준 산출물 저장소
+# 업로드 토큰이 아니라 이력서 파일의 SHA-256으로 산출물(추출 텍스트, 임베딩, 검색 결과, 추천 영상, 대표질문)을
+# 한 벌만 저장하고, 같은 이력서를 가리키는 여러 토큰이 이를 공유한다.
+#
+# 디렉토리 구조: RESUME_ARTIFACT_DIR/<sha256>/
+#   text.txt                  추출 텍스트
+#   <이름>.npy                 임베딩 (예: embedding.jobkorea.<모델>.<공고>)
+#   <이름>.json                검색 결과 / 추천 영상 / 대표질문 / 이력서 요약 (digest.<버전>)
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import defaultdict
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+
+from config import RESUME_ARTIFACT_DIR, RESUME_ARTIFACT_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS = {"text": ".txt", "json": ".json", "npy": ".npy"}
+
+
+def short_hash(value: str, length: int = 16) -> str:
+    """공고 URL / 모델 이름처럼 산출물 이름에 들어가는 값을 짧은 해시로"""
+    return hashlib.sha256(str(value).encode("utf-8")).hexdigest()[:length]
+
+
+class ResumeArtifactStore:
+    """이력서 해시별 산출물 파일 저장소 (여러 워커가 같은 디렉토리를 공유)"""
+
+    def __init__(self, directory: str = RESUME_ARTIFACT_DIR, max_entries: int = RESUME_ARTIFACT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+    def _path(self, resume_hash: str, name: str, kind: str) -> str:
+        return os.path.join(self.directory, resume_hash, name + _EXTENSIONS[kind])
+
+    def get(self, resume_hash: str, name: str, kind: str = "json"):
+        path = self._path(resume_hash, name, kind)
+        category = name.split(".", 1)[0]
+        try:
+            if kind == "npy":
+                value = np.load(path)
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    value = f.read() if kind == "text" else json.load(f)
+        except FileNotFoundError:
+            self.misses[category] += 1
+            return None
+        except Exception as e:
+            # 깨진 파일은 없는 것으로 보고 다시 계산
+            logger.warning(f"이력서 산출물 읽기 실패 ({resume_hash[:12]}/{name}): {str(e)}")
+            self.misses[category] += 1
+            return None
+        os.utime(os.path.dirname(path))  # 최근 사용 시각 갱신 (정리할 때 기준)
+        self.hits[category] += 1
+        return value
+
+    def put(self, resume_hash: str, name: str, value, kind: str = "json"):
+        path = self._path(resume_hash, name, kind)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 임시 파일에 쓴 뒤 교체 -> 다른 워커는 완성된 파일만 봄
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if kind == "npy":
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.asarray(value))
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                if kind == "text":
+                    f.write(value)
+                else:
+                    json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._evict()
+
+    async def memo(self, resume_hash: Optional[str], name: str, compute: Callable[[], Awaitable],
+                   kind: str = "json"):
+        """저장된 산출물이 있으면 반환하고, 없으면 compute()로 만들어서 저장 (해시가 없으면 항상 계산)"""
+        if not resume_hash:
+            return await compute()
+        value = await asyncio.to_thread(self.get, resume_hash, name, kind)
+        if value is not None:
+            return value
+        value = await compute()
+        if value is not None and (kind == "npy" or value):
+            await asyncio.to_thread(self.put, resume_hash, name, value, kind)
+        return value
+
+    def _evict(self):
+        entries = [e for e in os.scandir(self.directory) if e.is_dir()]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+        logger.info(f"이력서 산출물 정리: {len(entries) - self.max_entries}개 제거")
+
+    def stats(self) -> dict:
+        categories = set(self.hits) | set(self.misses)
+        return {
+            "directory": self.directory,
+            "max_entries": self.max_entries,
+            "artifacts": {c: {"hits": self.hits[c], "misses": self.misses[c]} for c in sorted(categories)},
+        }
+
+
+class ArtifactTextCache:
+    """PDFExtractor용 텍스트 캐시 (이력서 산출물의 text 항목)"""
+
+    def __init__(self, store: ResumeArtifactStore):
+        self.store = store
+
+    def get(self, digest: str) -> Optional[str]:
+        return self.store.get(digest, "text", "text")
+
+    def set(self, digest: str, text: str):
+        self.store.put(digest, "text", text, "text")
+
+    def stats(self) -> dict:
+        return {"hits": self.store.hits["text"], "misses": self.store.misses["text"]}
+
+
+# 전역 인스턴스 생성
+resume_artifacts = ResumeArtifactStore()
@@ -0,0 +1,204 @@
+# 이력서 요약(digest)
+# 프롬프트마다 이력서 원문을 잘라 넣는 대신 (resume[:1000], 힌트는 전체) 이력서 해시별로 한 번만
+# RESUME_DIGEST_TOKENS 이내의 항목별 요약을 만들어 이력서 산출물(digest.<버전>.json)로 저장하고 모든 템플릿에 넣는다.
+# 예산 이하인 이력서는 요약하지 않고 원문을 그대로 쓰고, 요약 호출이 실패하면 예산만큼 자른 원문을 쓴다. (저장하지 않음)
+# 토큰 수는 tiktoken이 있으면 모델 토크나이저로, 없으면 글자 수로 추정하고 템플릿별 절감량(원문 대비)을 집계한다.
+import asyncio
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, Optional
+
+from langchain.prompts import PromptTemplate
+from langchain.chains import LLMChain
+from langchain_openai import OpenAI
+
+from config import (API_KEY, RESUME_DIGEST_ENABLED, RESUME_DIGEST_TOKENS, RESUME_DIGEST_INPUT_TOKENS,
+                    RESUME_DIGEST_MODEL)
+from utils.llm_cache import llm_cache
+from utils.resume_artifacts import resume_artifacts, short_hash
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+_HANGUL = re.compile(r"[가-힣]")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+_encodings: Dict[str, object] = {}
+
+DIGEST_TEMPLATE = '''
+        You are an expert technical recruiter. Summarize the resume below for an interviewer in Korean.
+
+        [Resume]
+        {resume}
+
+        Requirements:
+        1. Use exactly these sections, one per line group, and omit a section if the resume has nothing for it:
+           [기본 정보] desired role, years of experience
+           [기술 스택] languages, frameworks, tools
+           [경력] company, period, role, key achievements with numbers
+           [프로젝트] name, stack, what the candidate did, results
+           [학력 / 자격] degree, certificates, awards
+        2. Keep concrete facts (names, numbers, technologies). Do not invent anything.
+        3. Use short bullet lines starting with "- ".
+        4. Stay under {budget} tokens.
+        '''
+
+
+def _encoding(model: str):
+    if model not in _encodings:
+        try:
+            _encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encodings[model] = tiktoken.get_encoding("cl100k_base")
+    return _encodings[model]
+
+
+def count_tokens(text: str, model: str = RESUME_DIGEST_MODEL) -> int:
+    """프롬프트 토큰 수 (tiktoken이 없으면 한글 1자 = 1토큰, 나머지 4자 = 1토큰으로 추정)"""
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(_encoding(model).encode(text, disallowed_special=()))
+    hangul = len(_HANGUL.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def truncate_tokens(text: str, budget: int, model: str = RESUME_DIGEST_MODEL) -> str:
+    """앞에서부터 budget 토큰까지만"""
+    if tiktoken is not None:
+        tokens = _encoding(model).encode(text, disallowed_special=())
+        return text if len(tokens) <= budget else _encoding(model).decode(tokens[:budget])
+    while text and count_tokens(text, model) > budget:
+        text = text[:int(len(text) * budget / count_tokens(text, model) * 0.95)]
+    return text
+
+
+def clean_resume(text: str) -> str:
+    """PDF 추출 텍스트의 연속 공백 / 빈 줄 정리"""
+    lines = (_SPACES.sub(" ", line).strip() for line in text.splitlines())
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+class ResumeDigester:
+    """이력서 해시별 토큰 예산 요약 (같은 이력서는 동시에 요청해도 한 번만 생성)"""
+
+    def __init__(self, budget: int = RESUME_DIGEST_TOKENS, input_budget: int = RESUME_DIGEST_INPUT_TOKENS,
+                 model: str = RESUME_DIGEST_MODEL, enabled: bool = RESUME_DIGEST_ENABLED):
+        self.budget = budget
+        self.input_budget = input_budget
+        self.model = model
+        self.enabled = enabled
+        self._llm = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.generated = 0
+        self.passthrough = 0
+        self.failed = 0
+        # 템플릿별 프롬프트 토큰 (before: 기존 방식대로 원문을 넣었을 때, after: 요약을 넣었을 때)
+        self.usage = defaultdict(lambda: {"calls": 0, "before": 0, "after": 0})
+
+    @property
+    def artifact_name(self) -> str:
+        """요약 방식(템플릿 / 모델 / 예산)이 바뀌면 다시 만들도록 이름에 버전 포함"""
+        return f"digest.{short_hash(f'{DIGEST_TEMPLATE}|{self.model}|{self.budget}|{self.input_budget}', 8)}"
+
+    def _chain(self) -> LLMChain:
+        if self._llm is None:
+            self._llm = OpenAI(api_key=API_KEY, model_name=self.model, temperature=0, max_tokens=self.budget)
+        prompt = PromptTemplate(template=DIGEST_TEMPLATE, input_variables=['resume', 'budget'])
+        return LLMChain(prompt=prompt, llm=self._llm)
+
+    def start(self, resume_hash: Optional[str], resume: str) -> Optional[asyncio.Task]:
+        """요약 작업 시작 (이미 진행 중이면 기존 작업)"""
+        if not self.enabled or not resume:
+            return None
+        key = resume_hash or short_hash(resume)
+        task = self._tasks.get(key)
+        if task is None or task.done():
+            task = self._tasks[key] = asyncio.get_running_loop().create_task(self._digest(resume_hash, resume))
+            task.add_done_callback(lambda done: self._tasks.pop(key, None) if self._tasks.get(key) is done else None)
+        return task
+
+    async def digest(self, resume_hash: Optional[str], resume: str) -> str:
+        """프롬프트에 넣을 이력서 (요약을 끄면 기존처럼 앞 1000자)"""
+        if not self.enabled or not resume:
+            return resume[:1000]
+        return await asyncio.shield(self.start(resume_hash, resume))
+
+    async def _digest(self, resume_hash: Optional[str], resume: str) -> str:
+        if resume_hash:
+            stored = await asyncio.to_thread(resume_artifacts.get, resume_hash, self.artifact_name)
+            if stored:
+                return stored["text"]
+
+        text = clean_resume(resume)
+        tokens = count_tokens(text, self.model)
+        if tokens <= self.budget:
+            self.passthrough += 1
+            digest = {"text": text, "source_tokens": tokens, "tokens": tokens, "summarized": False}
+        else:
+            try:
+                response = await llm_cache.ainvoke(self._chain(), "resume_digest", {
+                    'resume': truncate_tokens(text, self.input_budget, self.model),
+                    'budget': self.budget,
+                })
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"이력서 요약 실패, 앞부분 {self.budget}토큰 사용: {str(e)}")
+                return truncate_tokens(text, self.budget, self.model)
+            summary = truncate_tokens(response.strip(), self.budget, self.model)
+            if not summary:
+                self.failed += 1
+                return truncate_tokens(text, self.budget, self.model)
+            self.generated += 1
+            digest = {"text": summary, "source_tokens": tokens, "tokens": count_tokens(summary, self.model),
+                      "summarized": True}
+            logger.info(f"✅ 이력서 요약 완료 ({tokens} → {digest['tokens']} 토큰)")
+
+        if resume_hash:
+            await asyncio.to_thread(resume_artifacts.put, resume_hash, self.artifact_name, digest)
+        return digest["text"]
+
+    def report(self, template_id: str, prompt: PromptTemplate, inputs: dict, baseline_resume: str):
+        """호출 한 번의 프롬프트 토큰 수를 기존 이력서 입력과 비교해서 기록"""
+        after = count_tokens(prompt.format(**inputs), self.model)
+        before = count_tokens(prompt.format(**{**inputs, 'resume': baseline_resume}), self.model)
+        usage = self.usage[template_id]
+        usage["calls"] += 1
+        usage["before"] += before
+        usage["after"] += after
+        logger.info(f"🧮 {template_id} 프롬프트 토큰: {before} → {after}")
+
+    async def aclose(self):
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "budget_tokens": self.budget,
+            "tokenizer": "tiktoken" if tiktoken is not None else "estimate",
+            "running": sum(1 for task in self._tasks.values() if not task.done()),
+            "generated": self.generated,
+            "passthrough": self.passthrough,
+            "failed": self.failed,
+            "prompt_tokens": {
+                template_id: {
+                    **usage,
+                    "avg_before": round(usage["before"] / usage["calls"], 1),
+                    "avg_after": round(usage["after"] / usage["calls"], 1),
+                    "saved_ratio": round(1 - usage["after"] / usage["before"], 4) if usage["before"] else 0,
+                }
+                for template_id, usage in sorted(self.usage.items())
+            },
+        }
+
+
+# 전역 인스턴스 생성
+resume_digester = ResumeDigester()
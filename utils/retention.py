@@ -0,0 +1,136 @@
+# 오래된 면접 세션 정리 작업
+# 정해진 간격마다 보관 기간이 지난 세션을 작은 묶음으로 나눠서
+# DELETE ... WHERE session_id IN (...) 한 번씩으로 지운다. 묶음마다 커밋해서 잠금을 짧게 유지하고,
+# 한 번 실행할 때 쓸 수 있는 시간이 정해져 있어서 남은 세션은 다음 실행에서 이어서 지운다.
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, delete, or_
+
+from config import (RETENTION_ENABLED, RETENTION_INTERVAL, RETENTION_MAX_AGE_HOURS, RETENTION_CHUNK_SIZE,
+                    RETENTION_TIME_BUDGET)
+from db import AsyncSessionLocal, InterviewSessionDB, ChatMessageDB
+from utils.session_cache import session_store
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionWorker:
+    """주기적으로 오래된 세션과 메시지를 묶음 단위로 삭제"""
+
+    def __init__(self, interval: float = RETENTION_INTERVAL, max_age_hours: float = RETENTION_MAX_AGE_HOURS,
+                 chunk_size: int = RETENTION_CHUNK_SIZE, time_budget: float = RETENTION_TIME_BUDGET,
+                 enabled: bool = RETENTION_ENABLED):
+        self.interval = interval
+        self.max_age_hours = max_age_hours
+        self.chunk_size = chunk_size
+        self.time_budget = time_budget
+        self.enabled = enabled
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.runs = 0
+        self.sessions_removed = 0
+        self.messages_removed = 0
+        self.last_run = None
+
+    async def run_once(self, include_completed: bool = False) -> dict:
+        """보관 기간이 지난 세션 정리 (include_completed면 완료된 세션도 함께)"""
+        async with self._lock:
+            start = time.perf_counter()
+            cutoff = datetime.utcnow() - timedelta(hours=self.max_age_hours)
+            condition = InterviewSessionDB.created_at < cutoff
+            if include_completed:
+                condition = or_(condition, InterviewSessionDB.status == "completed")
+
+            sessions = messages = chunks = 0
+            finished = False
+            while time.perf_counter() - start < self.time_budget:
+                async with AsyncSessionLocal() as db:
+                    rows = (await db.execute(
+                        select(InterviewSessionDB.id, InterviewSessionDB.session_token)
+                        .where(condition)
+                        .order_by(InterviewSessionDB.id)
+                        .limit(self.chunk_size)
+                    )).all()
+                    if not rows:
+                        finished = True
+                        break
+                    ids = [row.id for row in rows]
+                    try:
+                        result = await db.execute(
+                            delete(ChatMessageDB).where(ChatMessageDB.session_id.in_(ids)))
+                        messages += max(result.rowcount, 0)
+                        result = await db.execute(
+                            delete(InterviewSessionDB).where(InterviewSessionDB.id.in_(ids)))
+                        sessions += max(result.rowcount, 0)
+                        await db.commit()
+                    except Exception:
+                        await db.rollback()
+                        raise
+                chunks += 1
+                for row in rows:
+                    session_store.pop(row.session_token)
+                # 묶음 사이에 다른 요청이 DB / 이벤트 루프를 쓸 수 있도록 양보
+                await asyncio.sleep(0)
+
+            elapsed = time.perf_counter() - start
+            self.runs += 1
+            self.sessions_removed += sessions
+            self.messages_removed += messages
+            self.last_run = {
+                "at": datetime.utcnow().isoformat(),
+                "sessions": sessions,
+                "messages": messages,
+                "chunks": chunks,
+                "elapsed_s": round(elapsed, 3),
+                "finished": finished,
+            }
+            logger.info(f"세션 정리 완료 - 세션 {sessions}개, 메시지 {messages}개 "
+                        f"({chunks}묶음, {elapsed:.2f}s{'' if finished else ', 시간 초과로 다음 실행에서 계속'})")
+            return self.last_run
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"세션 정리 중 오류 발생: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """서버 시작 시 정리 작업 예약"""
+        if not self.enabled or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None and not self._task.done(),
+            "interval": self.interval,
+            "max_age_hours": self.max_age_hours,
+            "chunk_size": self.chunk_size,
+            "time_budget": self.time_budget,
+            "runs": self.runs,
+            "sessions_removed": self.sessions_removed,
+            "messages_removed": self.messages_removed,
+            "last_run": self.last_run,
+        }
+
+
+# 전역 인스턴스 생성
+retention_worker = RetentionWorker()
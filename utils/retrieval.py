@@ -0,0 +1,168 @@
+# 면접 질문 후보 하이브리드 검색
+# FAISS(의미 유사도)와 BM25(키워드 일치) 결과를 각각 RETRIEVAL_CANDIDATES개씩 가져와서 합친다.
+#   rrf: 두 목록의 순위만 사용 (1 / (rrf_k + 순위)의 합)
+#   linear: 목록별로 점수를 0~1로 정규화한 뒤 alpha * FAISS + (1 - alpha) * BM25
+# BM25 색인을 쓸 수 없으면 FAISS 결과만 사용한다. 최근 검색의 진단 정보(후보 수, 겹침, 단계별 시간)는 stats로 조회한다.
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from config import (RETRIEVAL_MODE, RETRIEVAL_FUSION, RETRIEVAL_ALPHA, RETRIEVAL_RRF_K, RETRIEVAL_CANDIDATES)
+from utils.bm25 import BM25Store
+from utils.faiss_store import JOBKOREA_BM25_PATH, faiss_indexes
+from utils.resume_artifacts import short_hash
+
+logger = logging.getLogger(__name__)
+
+FUSION_METHODS = ("rrf", "linear")
+
+
+def _minmax(scores: np.ndarray) -> np.ndarray:
+    if len(scores) == 0:
+        return scores
+    low, high = float(scores.min()), float(scores.max())
+    if high - low < 1e-9:
+        return np.ones_like(scores)
+    return (scores - low) / (high - low)
+
+
+def fuse(dense_ids: np.ndarray, dense_scores: np.ndarray, lexical_ids: np.ndarray, lexical_scores: np.ndarray,
+         k: int, method: str = "rrf", alpha: float = 0.5, rrf_k: int = 60) -> List[Tuple[int, float]]:
+    """두 검색 결과(점수 내림차순)를 합쳐서 상위 k개 (id, 점수) 반환"""
+    fused: Dict[int, float] = {}
+    if method == "rrf":
+        for ids in (dense_ids, lexical_ids):
+            for rank, doc_id in enumerate(ids.tolist(), start=1):
+                fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (rrf_k + rank)
+    elif method == "linear":
+        for ids, scores, weight in ((dense_ids, dense_scores, alpha), (lexical_ids, lexical_scores, 1 - alpha)):
+            for doc_id, score in zip(ids.tolist(), _minmax(scores).tolist()):
+                fused[doc_id] = fused.get(doc_id, 0.0) + weight * score
+    else:
+        raise ValueError(f"지원하지 않는 결합 방식입니다: {method}")
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+class HybridRetriever:
+    """jobkorea QA 질문 검색기 (FAISS + BM25)"""
+
+    def __init__(self, name: str = "jobkorea", bm25_path: str = JOBKOREA_BM25_PATH, mode: str = RETRIEVAL_MODE,
+                 fusion: str = RETRIEVAL_FUSION, alpha: float = RETRIEVAL_ALPHA, rrf_k: int = RETRIEVAL_RRF_K,
+                 candidates: int = RETRIEVAL_CANDIDATES):
+        if fusion not in FUSION_METHODS:
+            raise ValueError(f"지원하지 않는 결합 방식입니다: {fusion}")
+        self.name = name
+        self.bm25 = BM25Store(bm25_path)
+        self.mode = mode
+        self.fusion = fusion
+        self.alpha = alpha
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+        self.queries = 0
+        self.dense_only = 0
+        self._recent = deque(maxlen=200)
+
+    def load(self):
+        """서버 시작 시 BM25 색인 로드 (없으면 QA 매핑으로 생성)"""
+        if self.mode == "hybrid":
+            self.bm25.get(faiss_indexes.get(self.name).mapping)
+
+    def _lexical_index(self, handle):
+        return self.bm25.get(handle.mapping) if self.mode == "hybrid" else None
+
+    def cache_key(self) -> str:
+        """검색 결과 캐시 키에 넣을 설정 / BM25 색인 버전"""
+        handle = faiss_indexes.get(self.name)
+        lexical = self._lexical_index(handle)
+        parts = (self.mode, self.fusion, self.alpha, self.rrf_k, self.candidates,
+                 self.bm25.signature if lexical is not None else None)
+        return short_hash(repr(parts), 8)
+
+    def retrieve(self, query_vector: np.ndarray, query_text: str, k: int = 10) -> Tuple[List[str], dict]:
+        """(질문 목록, 진단 정보)"""
+        start = time.perf_counter()
+        handle = faiss_indexes.get(self.name)
+        mapping = handle.mapping
+        n = min(max(self.candidates, k), len(mapping))
+
+        distances, ids = handle.search(query_vector, n)
+        keep = ids[0] >= 0
+        dense_ids = ids[0][keep]
+        # L2 거리는 작을수록 가까우므로 부호를 바꿔서 점수로 사용
+        dense_scores = -distances[0][keep] if handle.metric_type == faiss.METRIC_L2 else distances[0][keep]
+        dense_done = time.perf_counter()
+
+        lexical = self._lexical_index(handle)
+        terms: List[str] = []
+        if lexical is not None:
+            lexical_ids, lexical_scores, terms = lexical.search(query_text, n)
+        else:
+            lexical_ids, lexical_scores = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        lexical_done = time.perf_counter()
+
+        if lexical is None or len(lexical_ids) == 0:
+            top = [(int(i), float(s)) for i, s in zip(dense_ids[:k], dense_scores[:k])]
+        else:
+            top = fuse(dense_ids, dense_scores, lexical_ids, lexical_scores, k, self.fusion, self.alpha, self.rrf_k)
+        questions = mapping.questions([doc_id for doc_id, _ in top])
+        end = time.perf_counter()
+
+        dense_set, lexical_set = set(dense_ids.tolist()), set(lexical_ids.tolist())
+        top_ids = [doc_id for doc_id, _ in top]
+        diagnostics = {
+            "mode": self.mode if lexical is not None else "dense",
+            "fusion": self.fusion if lexical is not None else None,
+            "dense_candidates": len(dense_set),
+            "lexical_candidates": len(lexical_set),
+            "overlap": len(dense_set & lexical_set),
+            "from_dense_only": sum(1 for i in top_ids if i in dense_set and i not in lexical_set),
+            "from_lexical_only": sum(1 for i in top_ids if i in lexical_set and i not in dense_set),
+            "from_both": sum(1 for i in top_ids if i in dense_set and i in lexical_set),
+            "query_terms": terms[:10],
+            "dense_ms": round((dense_done - start) * 1000, 3),
+            "lexical_ms": round((lexical_done - dense_done) * 1000, 3),
+            "fusion_ms": round((end - lexical_done) * 1000, 3),
+            "total_ms": round((end - start) * 1000, 3),
+        }
+        self.queries += 1
+        if lexical is None:
+            self.dense_only += 1
+        self._recent.append(diagnostics)
+        return questions, diagnostics
+
+    def stats(self) -> dict:
+        recent = list(self._recent)
+
+        def percentile(key: str, q: float) -> Optional[float]:
+            return round(float(np.percentile([d[key] for d in recent], q)), 3) if recent else None
+
+        returned = sum(d["from_dense_only"] + d["from_lexical_only"] + d["from_both"] for d in recent)
+        return {
+            "mode": self.mode,
+            "fusion": self.fusion,
+            "alpha": self.alpha,
+            "rrf_k": self.rrf_k,
+            "candidates": self.candidates,
+            "queries": self.queries,
+            "dense_only_queries": self.dense_only,
+            "bm25": self.bm25.stats(),
+            "recent": {
+                "count": len(recent),
+                "total_ms_p50": percentile("total_ms", 50),
+                "total_ms_p99": percentile("total_ms", 99),
+                "lexical_ms_p99": percentile("lexical_ms", 99),
+                "avg_overlap": round(sum(d["overlap"] for d in recent) / len(recent), 2) if recent else None,
+                # 최종 결과 중 BM25에서만 찾은 질문 비율 (FAISS만 썼으면 놓쳤을 후보)
+                "lexical_only_share": round(sum(d["from_lexical_only"] for d in recent) / returned, 4)
+                if returned else None,
+                "last": recent[-1] if recent else None,
+            },
+        }
+
+
+# 전역 인스턴스 생성
+hybrid_retriever = HybridRetriever()
@@ -0,0 +1,119 @@
+# 진행 중인 InterviewSession 객체 캐시
+# 요청마다 세션을 새로 만들지 않고 LRU + 유휴 TTL + 메모리 상한으로 관리한다.
+import time
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from config import SESSION_CACHE_MAX_ENTRIES, SESSION_CACHE_TTL, SESSION_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+class _CacheEntry:
+    __slots__ = ("value", "size", "last_access")
+
+    def __init__(self, value, size: int):
+        self.value = value
+        self.size = size
+        self.last_access = time.monotonic()
+
+
+class SessionCache:
+    """토큰 -> InterviewSession LRU 캐시"""
+
+    def __init__(self, max_entries: int = SESSION_CACHE_MAX_ENTRIES, ttl: float = SESSION_CACHE_TTL,
+                 max_bytes: int = SESSION_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._listeners = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, token: str) -> Optional[object]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        if time.monotonic() - entry.last_access > self.ttl:
+            self._remove(token, notify=True)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        entry.last_access = time.monotonic()
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry.value
+
+    def put(self, token: str, session):
+        """세션 저장 (이미 있으면 크기만 다시 계산)"""
+        if token in self._entries:
+            self._remove(token, notify=False)
+        size = session.approx_size() if hasattr(session, "approx_size") else 0
+        self._entries[token] = _CacheEntry(session, size)
+        self._bytes += size
+        self._evict()
+
+    def pop(self, token: str):
+        entry = self._remove(token, notify=True)
+        return entry.value if entry else None
+
+    def on_remove(self, listener):
+        """세션이 만료 / 제거 / pop 될 때 토큰으로 호출할 콜백 등록"""
+        self._listeners.append(listener)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, token: str, notify: bool) -> Optional[_CacheEntry]:
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            if notify:
+                for listener in self._listeners:
+                    listener(token)
+        return entry
+
+    def _evict(self):
+        # 만료된 세션 먼저 정리 (가장 오래 사용하지 않은 것부터)
+        now = time.monotonic()
+        while self._entries:
+            token, entry = next(iter(self._entries.items()))
+            if now - entry.last_access <= self.ttl:
+                break
+            self._remove(token, notify=True)
+            self.expirations += 1
+
+        # 개수 / 메모리 상한을 넘으면 LRU 순서로 제거 (방금 넣은 세션 하나는 남김)
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            token = next(iter(self._entries))
+            self._remove(token, notify=True)
+            self.evictions += 1
+            logger.info(f"세션 캐시에서 제거됨 - 토큰: {token}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+        }
+
+
+# 전역 인스턴스 생성
+session_store = SessionCache()